@@ -34,18 +34,24 @@ from dateutil.relativedelta import relativedelta
 
 from storage.local_handlers import LocalJsonCacheHandler, LocalJsonSettingsHandler
 from storage.settings_handler import AlexaSettingsHandler
+from utils import metrics
 from utils.config import Config
 from utils.constants import (
     DAYS,
+    FORECAST_LAYERS,
     METRICS,
     MONTH_DAYS,
     MONTH_DAYS_XLATE,
     MONTH_NAMES,
+    OBSERVATION_FIELDS,
+    RANGE_DAYS,
+    RANGE_WHEN,
     SETTINGS,
     SLOTS,
     get_default_metrics,
 )
-from utils.factories import get_cache_handler
+from utils.deadline import Deadline, reset_deadline, set_deadline
+from utils.factories import get_cache_handler, warm_up
 from utils.notify import notify
 from weather.alerts import Alerts
 from weather.base import WeatherBase
@@ -100,6 +106,7 @@ class Skill(WeatherBase):
         self.settings_handler = settings_handler
         self.loc = None
         self.end = True
+        self.days = None
 
     @property
     def user_location(self) -> Optional[Any]:
@@ -493,7 +500,7 @@ class Skill(WeatherBase):
             # data = self.https("gridpoints/%s/%s" % (self.loc.cwa, self.loc.grid_point))
             text += "At %s, %s reported %s, " % (
                 obs.time_reported.astimezone(self.loc.tz).strftime("%I:%M%p"),
-                obs.station_name,
+                obs.reported_by("textDescription") or obs.station_name,
                 obs.description,
             )
 
@@ -536,6 +543,9 @@ class Skill(WeatherBase):
                 elif metric == "relative humidity":
                     if obs.humidity is not None:
                         text += "The relative humidity is %s percent" % obs.humidity
+                other = obs.reported_by(OBSERVATION_FIELDS.get(metric, ""))
+                if other:
+                    text += ", as reported by %s" % other
                 text += ". "
         else:
             text += "Observation information is currently unavailable."
@@ -577,11 +587,11 @@ class Skill(WeatherBase):
 
         return self.normalize(header + text)
     def get_forecast(self, metrics: List[str]) -> Any:
-        text = ""
+        if self.days:
+            return self.get_range_forecast(metrics)
 
         stime = self.stime
         etime = self.etime
-        fulltext = ""
         gp = GridPoints(
             self.event,
             self.loc.tz,
@@ -590,19 +600,40 @@ class Skill(WeatherBase):
             self.cache_handler,
         )
         # print("METRICS", metrics)
-        for metric in metrics:
-            # print("FORECAST METRIC", metric, "STIME", stime, "ETIME", etime)
-            metric = METRICS[metric][0]
-            # print("FORECAST METRIC", metric, "STIME", stime, "ETIME", etime)
-            if not gp.set_interval(stime, etime):
-                text = "Forecast information is unavailable for %s %s" % (
-                    MONTH_NAMES[self.stime.month - 1],
-                    MONTH_DAYS[self.stime.day - 1],
-                )
-                return text
+        metrics = [METRICS[metric][0] for metric in metrics]
+        if metrics and not gp.set_interval(stime, etime):
+            text = "Forecast information is unavailable for %s %s" % (
+                MONTH_NAMES[self.stime.month - 1],
+                MONTH_DAYS[self.stime.day - 1],
+            )
+            return text
 
-            isday = self.is_day(stime)
+        # Summarize every layer the metrics need in one pass
+        gp.query([(stime, etime)], self.forecast_layers(metrics))
 
+        fulltext = self.forecast_text(gp, metrics, self.is_day(stime))
+
+        if fulltext != "":
+            fulltext = "%s in %s, %s" % (self.sname, self.loc.city, fulltext)
+        else:
+            fulltext = "Forecast information is unavailable for %s in %s" % (
+                self.sname,
+                self.loc.city,
+            )
+
+        return fulltext
+    def forecast_layers(self, metrics: List[str]) -> List[str]:
+        layers = [
+            layer for metric in metrics for layer in FORECAST_LAYERS.get(metric, [])
+        ]
+        return list(dict.fromkeys(layers))
+    def forecast_text(
+        self, gp: GridPoints, metrics: List[str], isday: bool, daily: bool = False
+    ) -> str:
+        # Describe the metrics over the interval gp is set to; a daily
+        # interval gets both its high and low temperatures
+        fulltext = ""
+        for metric in metrics:
             text = ""
             if metric == "wind":
                 wsh = gp.wind_speed_high
@@ -633,10 +664,16 @@ class Skill(WeatherBase):
             elif metric == "temperature":
                 t = gp.temp_high if isday else gp.temp_low
                 if t is not None:
-                    text = "the %s temperature will be %s degrees" % (
-                        "high" if isday else "low",
-                        t,
-                    )
+                    if daily and gp.temp_low is not None:
+                        text = "the high temperature will be %s degrees and the low %s" % (
+                            t,
+                            gp.temp_low,
+                        )
+                    else:
+                        text = "the %s temperature will be %s degrees" % (
+                            "high" if isday else "low",
+                            t,
+                        )
 
                     wcl = gp.wind_chill_low
                     wch = gp.wind_chill_high
@@ -729,8 +766,37 @@ class Skill(WeatherBase):
             if text:
                 fulltext += text + ". "
 
+        return fulltext
+    def get_range_forecast(self, metrics: List[str]) -> Any:
+        gp = GridPoints(
+            self.event,
+            self.loc.tz,
+            self.loc.cwa,
+            self.loc.grid_point,
+            self.cache_handler,
+        )
+        metrics = [METRICS[metric][0] for metric in metrics]
+
+        # Summarize every day of the range in one pass
+        gp.query(self.days, self.forecast_layers(metrics))
+
+        fulltext = ""
+        for stime, etime in self.days:
+            if not gp.set_interval(stime, etime):
+                continue
+
+            if stime + relativedelta(days=+1) == etime:
+                name = DAYS[stime.weekday()]
+                text = self.forecast_text(gp, metrics, True, daily=True)
+            else:
+                # A first day that starts late is only the rest of today
+                name = "today" if self.is_day(stime) else "tonight"
+                text = self.forecast_text(gp, metrics, self.is_day(stime))
+            if text:
+                fulltext += "%s, %s" % (name, text)
+
         if fulltext != "":
-            fulltext = "%s in %s, %s" % (self.sname, self.loc.city, fulltext)
+            fulltext = "%s in %s. %s" % (self.sname, self.loc.city, fulltext)
         else:
             fulltext = "Forecast information is unavailable for %s in %s" % (
                 self.sname,
@@ -774,8 +840,44 @@ class Skill(WeatherBase):
         hours = 12
         sname = ""
 
-        # Handle the days like Monday or Today.
+        # Handle ranges of days like "this weekend" or "the next three days".
+        # Each day runs from 6am to 6am so it's made of whole quarters.
         day = self.slots.when_abs or self.slots.when_any or self.slots.when_pos
+        match = re.match(RANGE_WHEN, day) if day else None
+        if match:
+            if match.group(1) is None:
+                stime += relativedelta(days=+max(5 - stime.weekday(), 0))
+                count = 7 - stime.weekday()
+                sname = "this weekend"
+            elif match.group(1) == "few" or not (
+                match.group(1).isdigit() or match.group(1) in RANGE_DAYS
+            ):
+                # Words like "couple" or "several" don't say how many days
+                count = RANGE_DAYS["few"]
+                sname = "the next few days"
+            else:
+                word = match.group(1)
+                count = int(word) if word.isdigit() else RANGE_DAYS[word]
+                count = min(max(count, 1), 7)
+                sname = "the next %d days" % count if count > 1 else "the next day"
+
+            self.days = [
+                (stime + relativedelta(days=+i), stime + relativedelta(days=+i + 1))
+                for i in range(count)
+            ]
+
+            # Start the first day at the current quarter rather than at 6am
+            # when that's already past, so late in the day it covers tonight
+            if stime < now:
+                start = now + relativedelta(hour=now.hour - now.hour % 6)
+                self.days[0] = (start, self.days[0][1])
+            self.stime = self.days[0][0]
+            self.etime = self.days[-1][1]
+            self.sname = sname
+            hours = int((self.etime - self.stime).total_seconds()) // (60 * 60)
+            self.quarters = hours // 6
+            return
+
         if day:
             # Remove possessive/plural suffixes.  Also, sometimes we will get
             # "over night" instead of "overnight" so fix it.
@@ -1091,6 +1193,7 @@ class ResponseLogger(AbstractResponseInterceptor):
 
     def process(self, handler_input: Any, response: Any) -> None:
         logger.info("Response: %s", response)
+        metrics.log()
 
 
 # ============================================================================
@@ -1177,6 +1280,27 @@ sb.add_global_response_interceptor(ResponseLogger())
 # Create the skill instance
 skill_instance = sb.create()
 
+# Open connections during Lambda init, which doesn't count against the
+# first request's latency
+if Config.WARM_UP_ON_INIT:
+    warm_up()
+
+
+def is_warm_up_event(event: Dict[str, Any]) -> bool:
+    """
+    Check for a warm-up ping (scheduled event or {"warmup": true}).
+
+    Args:
+        event: Lambda event
+
+    Returns:
+        True if the event only asks the container to warm up
+    """
+    return bool(event.get("warmup")) or event.get("source") in (
+        "aws.events",
+        "serverless-plugin-warmup",
+    )
+
 
 # ============================================================================
 # Lambda Handler
@@ -1186,8 +1310,16 @@ skill_instance = sb.create()
 def lambda_handler(event: Dict[str, Any], context: Optional[Any] = None) -> Dict[str, Any]:
     """
     Lambda handler for Alexa skill using ASK SDK.
+
+    All I/O made while handling the event shares one time budget so the
+    skill can still answer before Alexa gives up on it.
     """
     # print(json.dumps(event, indent=4))
+    if is_warm_up_event(event):
+        warm_up()
+        return {"warmup": True}
+
+    token = set_deadline(Deadline.for_invocation(context))
     try:
         from ask_sdk_model import RequestEnvelope
 
@@ -1233,6 +1365,8 @@ def lambda_handler(event: Dict[str, Any], context: Optional[Any] = None) -> Dict
                 "shouldEndSession": True,
             },
         }
+    finally:
+        reset_deadline(token)
 
 
 def build_test_event(intent_name: str, slots: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
@@ -5,7 +5,11 @@ This package contains cache and settings handlers for persistent storage.
 """
 
 from .cache_handler import CacheHandler
+from .grid_cache import GridCache
+from .http_cache import HttpCache
 from .local_handlers import LocalJsonCacheHandler, LocalJsonSettingsHandler
+from .observation_cache import ObservationCache
+from .response_cache import ResponseCache
 from .settings_handler import AlexaSettingsHandler, SettingsHandler
 
 __all__ = [
@@ -14,4 +18,8 @@ __all__ = [
     "AlexaSettingsHandler",
     "LocalJsonCacheHandler",
     "LocalJsonSettingsHandler",
+    "HttpCache",
+    "ResponseCache",
+    "GridCache",
+    "ObservationCache",
 ]
@@ -20,6 +20,10 @@ from time import time
 from typing import Any, Dict, Optional
 
 from boto3 import resource as resource
+from botocore.config import Config as BotoConfig
+
+from utils.config import Config
+from utils.deadline import is_expired
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -29,7 +33,8 @@ class CacheHandler(object):
     """
     Handles all cache operations using a single DynamoDB table.
     The table uses a composite key structure:
-    - pk (partition key): cache type (e.g., 'location#<location>', 'station#<id>', 'zone#<id>')
+    - pk (partition key): cache type (e.g., 'location#<location>', 'station#<id>', 'zone#<id>',
+      'response#<url>', 'gridpoint#<cwa>/<x>,<y>', 'observation#<id>')
     - sk (sort key): always 'data' for cache items
 
     The cache data is stored as a dict in the 'cache_data' attribute.
@@ -40,6 +45,9 @@ class CacheHandler(object):
     LOCATION_PREFIX = "location#"
     STATION_PREFIX = "station#"
     ZONE_PREFIX = "zone#"
+    RESPONSE_PREFIX = "response#"
+    GRIDPOINT_PREFIX = "gridpoint#"
+    OBSERVATION_PREFIX = "observation#"
 
     def __init__(self, table_name: str, region: str = "us-east-1") -> None:
         """
@@ -49,7 +57,13 @@ class CacheHandler(object):
             table_name: Name of the DynamoDB table to use
             region: AWS region name
         """
-        self.ddb = resource("dynamodb", region_name=region)
+        # Keep DynamoDB calls well inside the request budget
+        boto_config = BotoConfig(
+            connect_timeout=Config.DYNAMODB_CONNECT_TIMEOUT,
+            read_timeout=Config.DYNAMODB_READ_TIMEOUT,
+            retries={"max_attempts": 2},
+        )
+        self.ddb = resource("dynamodb", region_name=region, config=boto_config)
         self.table = self.ddb.Table(table_name)
 
     def _make_key(self, cache_type: str, cache_id: str) -> Dict[str, str]:
@@ -76,6 +90,11 @@ class CacheHandler(object):
         Returns:
             Dict containing the cached data, or None if not found
         """
+        # Treat as a miss once the request is out of time
+        if is_expired():
+            logger.warning(f"Deadline exceeded, skipping cache get {cache_type}{cache_id}")
+            return None
+
         try:
             key = self._make_key(cache_type, cache_id)
             response = self.table.get_item(Key=key)
@@ -84,6 +103,11 @@ class CacheHandler(object):
                 return None
 
             item = response["Item"]
+
+            # DynamoDB deletes expired items lazily, so check the TTL here too
+            if item.get("ttl", 0) > 0 and time() > item["ttl"]:
+                return None
+
             # Return the cache_data dict
             return item.get("cache_data", {})
         except Exception as e:
@@ -96,6 +120,7 @@ class CacheHandler(object):
         cache_id: str,
         cache_data: Dict[str, Any],
         ttl_days: int = 35,
+        expires_at: Optional[int] = None,
     ) -> None:
         """
         Store an item in the cache.
@@ -105,12 +130,19 @@ class CacheHandler(object):
             cache_id: Unique identifier for the cache item
             cache_data: Dict containing the data to cache
             ttl_days: Time to live in days (0 = no expiration)
+            expires_at: Exact expiration in epoch seconds, overrides ttl_days
         """
+        if is_expired():
+            logger.warning(f"Deadline exceeded, skipping cache put {cache_type}{cache_id}")
+            return
+
         try:
             key = self._make_key(cache_type, cache_id)
             item = {**key, "cache_data": cache_data}
 
-            if ttl_days > 0:
+            if expires_at is not None:
+                item["ttl"] = int(expires_at)
+            elif ttl_days > 0:
                 item["ttl"] = int(time()) + (ttl_days * 24 * 60 * 60)
 
             self.table.put_item(Item=item)
@@ -191,3 +223,80 @@ class CacheHandler(object):
             ttl_days: Time to live in days
         """
         self.put(self.ZONE_PREFIX, zone_id, zone_data, ttl_days)
+
+    def get_response(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached NWS response data.
+
+        Args:
+            url: Normalized request URL
+
+        Returns:
+            Cached response data or None
+        """
+        return self.get(self.RESPONSE_PREFIX, url)
+
+    def put_response(
+        self, url: str, response_data: Dict[str, Any], ttl_days: int = 1
+    ) -> None:
+        """
+        Store NWS response data.
+
+        Args:
+            url: Normalized request URL
+            response_data: Response data to cache
+            ttl_days: Time to live in days
+        """
+        self.put(self.RESPONSE_PREFIX, url, response_data, ttl_days)
+
+    def get_gridpoint(self, cell_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached gridpoint data for a grid cell.
+
+        Args:
+            cell_id: Grid cell identifier ("<cwa>/<x>,<y>")
+
+        Returns:
+            Cached gridpoint data or None
+        """
+        return self.get(self.GRIDPOINT_PREFIX, cell_id)
+
+    def put_gridpoint(
+        self, cell_id: str, gridpoint_data: Dict[str, Any], expires_at: int
+    ) -> None:
+        """
+        Store gridpoint data for a grid cell.
+
+        Args:
+            cell_id: Grid cell identifier ("<cwa>/<x>,<y>")
+            gridpoint_data: Gridpoint data to cache
+            expires_at: Expiration time in epoch seconds
+        """
+        self.put(self.GRIDPOINT_PREFIX, cell_id, gridpoint_data, expires_at=expires_at)
+
+    def get_observation(self, station_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached latest observation for a station.
+
+        Args:
+            station_id: Station identifier
+
+        Returns:
+            Cached observation data or None
+        """
+        return self.get(self.OBSERVATION_PREFIX, station_id)
+
+    def put_observation(
+        self, station_id: str, observation_data: Dict[str, Any], expires_at: int
+    ) -> None:
+        """
+        Store the latest observation for a station.
+
+        Args:
+            station_id: Station identifier
+            observation_data: Observation data to cache
+            expires_at: Expiration time in epoch seconds
+        """
+        self.put(
+            self.OBSERVATION_PREFIX, station_id, observation_data, expires_at=expires_at
+        )
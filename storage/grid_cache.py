@@ -0,0 +1,155 @@
+#!/usr/bin/python3
+
+# =============================================================================
+#
+# Copyright 2017 by Leland Lucius
+#
+# Released under the GNU Affero GPL
+# See: https://github.com/lllucius/climacast/blob/master/LICENSE
+#
+# =============================================================================
+
+"""
+Grid cell cache for Clima Cast.
+
+NWS gridpoint data depends only on the grid cell, not on the user, so it
+is cached per "<cwa>/<x>,<y>" and shared by everyone in the cell.  The
+body is the packed encoding from weather.grid_data, and entries expire
+when NWS is expected to issue the next update.
+"""
+
+import logging
+from time import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from storage.http_cache import HttpCache, validators
+from utils.config import Config
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Format of the stored body; entries in any other format are ignored
+BODY_FORMAT = "packed"
+
+
+class GridCache(HttpCache):
+    """
+    Caches packed gridpoint data per grid cell.
+    """
+
+    name = "grid_cache"
+
+    def __init__(self, cache_handler: Any) -> None:
+        """
+        Initialize the grid cell cache.
+
+        Args:
+            cache_handler: CacheHandler or LocalJsonCacheHandler instance
+        """
+        super().__init__(cache_handler, cache_handler.GRIDPOINT_PREFIX)
+
+    @staticmethod
+    def cell_id(cwa: str, gridpoint: str) -> str:
+        """
+        Build the identifier of a grid cell.
+
+        Args:
+            cwa: County Warning Area (e.g., "MPX")
+            gridpoint: Grid coordinates (e.g., "107,71")
+
+        Returns:
+            Cell identifier such as "MPX/107,71"
+        """
+        return "%s/%s" % (cwa.upper(), gridpoint.replace(" ", ""))
+
+    def read(self, cell_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the entry for a grid cell from storage.
+
+        Args:
+            cell_id: Grid cell identifier from cell_id()
+
+        Returns:
+            Cache entry or None if not cached or in another format
+        """
+        entry = self.cache_handler.get_gridpoint(cell_id)
+        if entry is None or entry.get("format") != BODY_FORMAT:
+            return None
+        return entry
+
+    def store(self, cell_id: str, entry: Dict[str, Any]) -> None:
+        """
+        Write the entry for a grid cell, keeping it past expiry so it can
+        be revalidated.
+
+        Args:
+            cell_id: Grid cell identifier from cell_id()
+            entry: Grid cell cache entry
+        """
+        self.cache_handler.put_gridpoint(
+            cell_id,
+            entry,
+            int(entry["expires"]) + Config.GRIDPOINT_CACHE_RETAIN_DAYS * 24 * 60 * 60,
+        )
+
+    def load(self, entry: Dict[str, Any]) -> Optional[Any]:
+        """
+        Return the gridpoint data stored in a cache entry.
+
+        Args:
+            entry: Grid cell cache entry
+
+        Returns:
+            GridData, or None if the body can't be decoded
+        """
+        # Imported here as the weather package imports this module
+        from weather.grid_data import GridData
+
+        try:
+            return GridData.unpack(entry["body"])
+        except ValueError as e:
+            logger.warning(f"Ignoring cached grid cell: {e}")
+            return None
+
+    def put(
+        self,
+        cell_id: str,
+        response: httpx.Response,
+        grid: Any,
+        projected: bool = False,
+    ) -> None:
+        """
+        Store gridpoint data and its validators for a grid cell.
+
+        Args:
+            cell_id: Grid cell identifier from cell_id()
+            response: Successful HTTP response
+            grid: GridData built from the response
+            projected: Unused; the packed grid is stored either way
+        """
+        expires = self.policy.expires_at(
+            data=grid.meta, default=Config.GRIDPOINT_UPDATE_SECONDS
+        )
+        entry = {
+            "format": BODY_FORMAT,
+            "body": grid.pack(),
+            "fetched": int(time()),
+            "expires": expires,
+            **validators(response),
+        }
+        self.store(cell_id, entry)
+
+    def grace(self, cell_id: str) -> int:
+        """
+        Return how long past expiry a grid cell may be served while it is
+        refreshed.
+
+        Args:
+            cell_id: Grid cell identifier from cell_id()
+
+        Returns:
+            Grace window in seconds
+        """
+        return Config.RESPONSE_CACHE_STALE_GRACE.get("gridpoint", 0)
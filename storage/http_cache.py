@@ -0,0 +1,234 @@
+#!/usr/bin/python3
+
+# =============================================================================
+#
+# Copyright 2017 by Leland Lucius
+#
+# Released under the GNU Affero GPL
+# See: https://github.com/lllucius/climacast/blob/master/LICENSE
+#
+# =============================================================================
+
+"""
+Common behavior of the NWS caches for Clima Cast.
+
+ResponseCache, GridCache and ObservationCache all keep entries with their
+expiration time and the ETag/Last-Modified validators of the response
+they came from.  Entries stay in storage past expiry, so a recently
+expired entry can be served while it is refreshed and an older one can be
+revalidated with a conditional request.  WeatherBase.https() drives all
+three through the HttpCache interface.
+"""
+
+from time import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from utils import metrics
+from utils.expiry import ExpiryPolicy
+
+
+class HttpCache(object):
+    """
+    Base class for caches of NWS responses.
+
+    Subclasses say how entries are read, stored and decoded, how long a
+    revalidated entry stays fresh, and how long an expired one may be
+    served while it is refreshed.
+    """
+
+    # Prefix of the cache's metrics
+    name = "http_cache"
+
+    def __init__(self, cache_handler: Any, prefix: str) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            cache_handler: CacheHandler or LocalJsonCacheHandler instance
+            prefix: Cache handler prefix of the entries, for expiry bounds
+        """
+        self.cache_handler = cache_handler
+        self.policy = ExpiryPolicy(prefix)
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cache entry for a key, whether or not it is still fresh.
+
+        Args:
+            key: Identifier of the entry
+
+        Returns:
+            Cache entry or None if not cached
+        """
+        entry = self.read(key)
+        if entry is None:
+            metrics.incr(self.name + ".miss")
+        elif self.is_fresh(entry):
+            metrics.incr(self.name + ".hit")
+        else:
+            metrics.incr(self.name + ".stale")
+        return entry
+
+    def read(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Read an entry from storage.
+
+        Args:
+            key: Identifier of the entry
+
+        Returns:
+            Cache entry or None if not cached
+        """
+        raise NotImplementedError
+
+    def store(self, key: str, entry: Dict[str, Any]) -> None:
+        """
+        Write an entry to storage, keeping it past expiry for revalidation.
+
+        Args:
+            key: Identifier of the entry
+            entry: Cache entry
+        """
+        raise NotImplementedError
+
+    def load(self, entry: Dict[str, Any]) -> Optional[Any]:
+        """
+        Return the data held by a cache entry.
+
+        Args:
+            entry: Cache entry
+
+        Returns:
+            Cached data, or None if the entry can't be decoded
+        """
+        raise NotImplementedError
+
+    def put(
+        self,
+        key: str,
+        response: httpx.Response,
+        value: Any,
+        projected: bool = False,
+    ) -> None:
+        """
+        Store data and the validators of the response it came from.
+
+        Args:
+            key: Identifier of the entry
+            response: Successful HTTP response
+            value: Data to cache, built from the response JSON
+            projected: The body was streamed and only some of its members
+                were parsed
+        """
+        raise NotImplementedError
+
+    def revalidated_expiry(
+        self, key: str, entry: Dict[str, Any], response: httpx.Response
+    ) -> int:
+        """
+        Compute when a revalidated entry stops being fresh.
+
+        Args:
+            key: Identifier of the entry
+            entry: Cache entry that was revalidated
+            response: The 304 response carrying updated caching headers
+
+        Returns:
+            Expiration time in epoch seconds (0 = immutable)
+        """
+        return self.policy.expires_at(response.headers, default=0)
+
+    def grace(self, key: str) -> int:
+        """
+        Return how long past expiry an entry may be served while it is
+        refreshed.
+
+        Args:
+            key: Identifier of the entry
+
+        Returns:
+            Grace window in seconds (0 = never stale)
+        """
+        return 0
+
+    def revalidate(
+        self, key: str, entry: Dict[str, Any], response: httpx.Response
+    ) -> None:
+        """
+        Renew the freshness of an entry after a 304 Not Modified response.
+
+        Args:
+            key: Identifier of the entry
+            entry: Cache entry that was revalidated
+            response: The 304 response carrying updated caching headers
+        """
+        entry["fetched"] = int(time())
+        entry["expires"] = self.revalidated_expiry(key, entry, response)
+        self.store(key, entry)
+        metrics.incr(self.name + ".revalidated")
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """
+        Determine whether an entry may be served without refetching.
+
+        Args:
+            entry: Cache entry
+
+        Returns:
+            True if the entry is immutable or has not expired
+        """
+        expires = int(entry.get("expires", 0))
+        return expires == 0 or time() < expires
+
+    def is_servable_stale(self, key: str, entry: Dict[str, Any]) -> bool:
+        """
+        Determine whether an expired entry is within its stale grace window.
+
+        Args:
+            key: Identifier of the entry
+            entry: Cache entry
+
+        Returns:
+            True if the entry may be served while it is refreshed
+        """
+        grace = self.grace(key)
+        return grace > 0 and time() < int(entry.get("expires", 0)) + grace
+
+
+def validators(response: httpx.Response) -> Dict[str, str]:
+    """
+    Return the validators of a response, to be stored in a cache entry.
+
+    Args:
+        response: HTTP response
+
+    Returns:
+        Dict with "etag" and/or "last_modified", possibly empty
+    """
+    found = {}
+    if "ETag" in response.headers:
+        found["etag"] = response.headers["ETag"]
+    if "Last-Modified" in response.headers:
+        found["last_modified"] = response.headers["Last-Modified"]
+    return found
+
+
+def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Return the revalidation headers for a cache entry holding validators.
+
+    Args:
+        entry: Cache entry, if any
+
+    Returns:
+        Dict with If-None-Match and/or If-Modified-Since, possibly empty
+    """
+    headers = {}
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
@@ -20,6 +20,7 @@ import json
 import logging
 import os
 import re
+import threading
 from time import time
 from typing import Any, Dict, Optional
 
@@ -42,11 +43,20 @@ class LocalJsonCacheHandler(object):
         - <station_id>.json
       - zone/
         - <zone_id>.json
+      - response/
+        - <url>.json
+      - gridpoint/
+        - <cell_id>.json
+      - observation/
+        - <station_id>.json
     """
 
     LOCATION_PREFIX = "location#"
     STATION_PREFIX = "station#"
     ZONE_PREFIX = "zone#"
+    RESPONSE_PREFIX = "response#"
+    GRIDPOINT_PREFIX = "gridpoint#"
+    OBSERVATION_PREFIX = "observation#"
 
     def __init__(self, cache_dir: str = ".test_cache") -> None:
         """
@@ -58,7 +68,14 @@ class LocalJsonCacheHandler(object):
         self.cache_dir = cache_dir
 
         # Create cache directories if they don't exist
-        for cache_type in ["location", "station", "zone"]:
+        for cache_type in [
+            "location",
+            "station",
+            "zone",
+            "response",
+            "gridpoint",
+            "observation",
+        ]:
             os.makedirs(os.path.join(cache_dir, cache_type), exist_ok=True)
 
     def _get_file_path(self, cache_type: str, cache_id: str) -> str:
@@ -115,6 +132,7 @@ class LocalJsonCacheHandler(object):
         cache_id: str,
         cache_data: Dict[str, Any],
         ttl_days: int = 35,
+        expires_at: Optional[int] = None,
     ) -> None:
         """
         Store an item in the cache.
@@ -124,16 +142,22 @@ class LocalJsonCacheHandler(object):
             cache_id: Unique identifier for the cache item
             cache_data: Dict containing the data to cache
             ttl_days: Time to live in days (0 = no expiration)
+            expires_at: Exact expiration in epoch seconds, overrides ttl_days
         """
         try:
             file_path = self._get_file_path(cache_type, cache_id)
 
             data = {"cache_data": cache_data}
-            if ttl_days > 0:
+            if expires_at is not None:
+                data["ttl"] = int(expires_at)
+            elif ttl_days > 0:
                 data["ttl"] = int(time()) + (ttl_days * 24 * 60 * 60)
 
-            with open(file_path, "w", encoding="utf-8") as f:
+            # Write then rename so concurrent readers never see a partial file
+            temp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=2)
+            os.replace(temp_path, file_path)
         except Exception as e:
             logger.error(f"Error putting cache item {cache_type}{cache_id}: {e}")
 
@@ -212,6 +236,83 @@ class LocalJsonCacheHandler(object):
         """
         self.put(self.ZONE_PREFIX, zone_id, zone_data, ttl_days)
 
+    def get_response(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached NWS response data.
+
+        Args:
+            url: Normalized request URL
+
+        Returns:
+            Cached response data or None
+        """
+        return self.get(self.RESPONSE_PREFIX, url)
+
+    def put_response(
+        self, url: str, response_data: Dict[str, Any], ttl_days: int = 1
+    ) -> None:
+        """
+        Store NWS response data.
+
+        Args:
+            url: Normalized request URL
+            response_data: Response data to cache
+            ttl_days: Time to live in days
+        """
+        self.put(self.RESPONSE_PREFIX, url, response_data, ttl_days)
+
+    def get_gridpoint(self, cell_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached gridpoint data for a grid cell.
+
+        Args:
+            cell_id: Grid cell identifier ("<cwa>/<x>,<y>")
+
+        Returns:
+            Cached gridpoint data or None
+        """
+        return self.get(self.GRIDPOINT_PREFIX, cell_id)
+
+    def put_gridpoint(
+        self, cell_id: str, gridpoint_data: Dict[str, Any], expires_at: int
+    ) -> None:
+        """
+        Store gridpoint data for a grid cell.
+
+        Args:
+            cell_id: Grid cell identifier ("<cwa>/<x>,<y>")
+            gridpoint_data: Gridpoint data to cache
+            expires_at: Expiration time in epoch seconds
+        """
+        self.put(self.GRIDPOINT_PREFIX, cell_id, gridpoint_data, expires_at=expires_at)
+
+    def get_observation(self, station_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached latest observation for a station.
+
+        Args:
+            station_id: Station identifier
+
+        Returns:
+            Cached observation data or None
+        """
+        return self.get(self.OBSERVATION_PREFIX, station_id)
+
+    def put_observation(
+        self, station_id: str, observation_data: Dict[str, Any], expires_at: int
+    ) -> None:
+        """
+        Store the latest observation for a station.
+
+        Args:
+            station_id: Station identifier
+            observation_data: Observation data to cache
+            expires_at: Expiration time in epoch seconds
+        """
+        self.put(
+            self.OBSERVATION_PREFIX, station_id, observation_data, expires_at=expires_at
+        )
+
 
 class LocalJsonSettingsHandler:
     """
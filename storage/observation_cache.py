@@ -0,0 +1,242 @@
+#!/usr/bin/python3
+
+# =============================================================================
+#
+# Copyright 2017 by Leland Lucius
+#
+# Released under the GNU Affero GPL
+# See: https://github.com/lllucius/climacast/blob/master/LICENSE
+#
+# =============================================================================
+
+"""
+Station observation cache for Clima Cast.
+
+A station's latest observation is the same for everyone near it and only
+changes when the station reports, usually about hourly, so it is cached
+per station id and shared.  Entries expire when the station's next report
+is expected, from its last report time plus the interval seen between
+its reports.  A warm container also keeps recent entries in memory, in
+front of the cache handler.
+"""
+
+import json
+import threading
+from time import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from storage.http_cache import HttpCache, validators
+from utils import metrics
+from utils.config import Config
+from utils.expiry import parse_time
+
+# In-memory entries by station id, shared by every cache in the container
+_memory: Dict[str, Dict[str, Any]] = {}
+_memory_lock = threading.Lock()
+
+
+class ObservationCache(HttpCache):
+    """
+    Caches the latest observation per station.
+    """
+
+    name = "observation_cache"
+
+    def __init__(self, cache_handler: Any) -> None:
+        """
+        Initialize the observation cache.
+
+        Args:
+            cache_handler: CacheHandler or LocalJsonCacheHandler instance
+        """
+        super().__init__(cache_handler, cache_handler.OBSERVATION_PREFIX)
+
+    def lookup(self, station_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cache entry for a station, fresh or not, from memory if
+        it's fresh there.
+
+        Args:
+            station_id: Station identifier
+
+        Returns:
+            Cache entry with its parsed "data", or None if not cached
+        """
+        entry = _memory.get(station_id)
+        if entry is not None and self.is_fresh(entry):
+            metrics.incr("observation_cache.memory_hit")
+            return entry
+
+        entry = super().lookup(station_id)
+        if entry is not None:
+            remember(station_id, entry)
+        return entry
+
+    def read(self, station_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the entry for a station from storage.
+
+        Args:
+            station_id: Station identifier
+
+        Returns:
+            Cache entry with its parsed "data", or None if not cached
+        """
+        stored = self.cache_handler.get_observation(station_id)
+        if stored is None:
+            return None
+        return dict(stored, data=json.loads(stored["body"]))
+
+    def store(self, station_id: str, entry: Dict[str, Any]) -> None:
+        """
+        Write the entry for a station and keep it in memory, keeping it in
+        storage past expiry so it can be revalidated.
+
+        Args:
+            station_id: Station identifier
+            entry: Cache entry with its parsed "data"
+        """
+        stored = {key: value for key, value in entry.items() if key != "data"}
+        self.cache_handler.put_observation(
+            station_id,
+            stored,
+            int(stored["expires"]) + Config.OBSERVATION_CACHE_RETAIN_DAYS * 24 * 60 * 60,
+        )
+        remember(station_id, entry)
+
+    def load(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the observation held by a cache entry.
+
+        Args:
+            entry: Cache entry from lookup()
+
+        Returns:
+            Observation data
+        """
+        return entry["data"]
+
+    def put(
+        self,
+        station_id: str,
+        response: httpx.Response,
+        data: Dict[str, Any],
+        projected: bool = False,
+    ) -> None:
+        """
+        Store the latest observation for a station and its validators.
+
+        Args:
+            station_id: Station identifier
+            response: Successful HTTP response
+            data: Observation data from NWS API
+            projected: Unused; observations aren't streamed
+        """
+        # Problem details aren't observations
+        if data.get("status", 0) != 0:
+            return
+
+        now = time()
+        reported = parse_time(data.get("timestamp"))
+
+        # Learn the station's report interval from the previous report, if
+        # it's still in storage
+        interval = Config.OBSERVATION_REPORT_SECONDS
+        previous = self.cache_handler.get_observation(station_id)
+        if previous is not None:
+            interval = int(previous.get("interval", interval))
+            last = previous.get("reported")
+            if reported is not None and last is not None and reported > float(last):
+                interval = int(reported - float(last))
+
+        entry = {
+            "body": json.dumps(data),
+            "reported": int(reported) if reported is not None else None,
+            "interval": interval,
+            "fetched": int(now),
+            "expires": self.expires_at(reported, interval, now),
+            "data": data,
+            **validators(response),
+        }
+        self.store(station_id, entry)
+
+    def revalidated_expiry(
+        self, station_id: str, entry: Dict[str, Any], response: httpx.Response
+    ) -> int:
+        """
+        Compute when a revalidated observation stops being fresh.
+
+        The station hasn't reported again, so a late station is checked
+        again after the minimum lifetime for the prefix.
+
+        Args:
+            station_id: Station identifier
+            entry: Cache entry that was revalidated
+            response: The 304 response
+
+        Returns:
+            Expiration time in epoch seconds
+        """
+        reported = entry.get("reported")
+        return self.expires_at(
+            float(reported) if reported is not None else None,
+            int(entry["interval"]),
+            time(),
+        )
+
+    def grace(self, station_id: str) -> int:
+        """
+        Return how long past expiry an observation may be served while it
+        is refreshed.
+
+        Args:
+            station_id: Station identifier
+
+        Returns:
+            Grace window in seconds
+        """
+        return Config.RESPONSE_CACHE_STALE_GRACE.get("observations", 0)
+
+    def expires_at(self, reported: Optional[float], interval: int, now: float) -> int:
+        """
+        Compute when the station's next report is expected.
+
+        A station that's late is checked again after the minimum lifetime
+        for the prefix.
+
+        Args:
+            reported: Time of the cached report in epoch seconds, if known
+            interval: Seconds between the station's reports
+            now: Current epoch time
+
+        Returns:
+            Expiration time in epoch seconds
+        """
+        if reported is None:
+            return int(self.policy.clamp(now + interval, now))
+
+        expected = reported + interval + Config.OBSERVATION_REPORT_DELAY_SECONDS
+        return int(self.policy.clamp(expected, now))
+
+
+def remember(station_id: str, entry: Dict[str, Any]) -> None:
+    """
+    Keep an entry in memory, dropping the oldest once there are too many.
+
+    Args:
+        station_id: Station identifier
+        entry: Observation cache entry with its parsed "data"
+    """
+    with _memory_lock:
+        _memory.pop(station_id, None)
+        _memory[station_id] = entry
+        while len(_memory) > Config.OBSERVATION_MEMORY_ENTRIES:
+            del _memory[next(iter(_memory))]
+
+
+def forget() -> None:
+    """Drop the in-memory entries."""
+    with _memory_lock:
+        _memory.clear()
@@ -0,0 +1,238 @@
+#!/usr/bin/python3
+
+# =============================================================================
+#
+# Copyright 2017 by Leland Lucius
+#
+# Released under the GNU Affero GPL
+# See: https://github.com/lllucius/climacast/blob/master/LICENSE
+#
+# =============================================================================
+
+"""
+Response cache for Clima Cast.
+
+This module caches raw NWS API response bodies, keyed by normalized URL,
+through any cache handler that provides get_response()/put_response().
+Gridpoint data and observations are cached by GridCache and
+ObservationCache instead.
+"""
+
+import json
+import re
+from time import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from storage.http_cache import HttpCache, validators
+from utils.config import Config
+
+# Endpoint classes by URL path, checked in order
+ENDPOINT_CLASSES = [
+    ("forecast", re.compile(r"^/gridpoints/[^/]+/[^/]+/forecast(/hourly)?$")),
+    ("gridpoint", re.compile(r"^/gridpoints/[^/]+/\d+,\d+$")),
+    ("alerts", re.compile(r"^/alerts/")),
+    ("product_list", re.compile(r"^/products/types/")),
+    ("product", re.compile(r"^/products/[^/]+$")),
+    ("observations", re.compile(r"^/stations/[^/]+/observations")),
+]
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent requests share a cache key.
+
+    Args:
+        url: Request URL
+
+    Returns:
+        URL with lowercased scheme/host, no trailing slash and sorted query
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+def endpoint_class(url: str) -> Optional[str]:
+    """
+    Determine the endpoint class of a URL.
+
+    Args:
+        url: Request URL
+
+    Returns:
+        Endpoint class name or None if the URL isn't recognized
+    """
+    path = urlsplit(url).path.rstrip("/")
+    for name, pattern in ENDPOINT_CLASSES:
+        if pattern.match(path):
+            return name
+    return None
+
+
+class ResponseCache(HttpCache):
+    """
+    Caches NWS response bodies with a freshness lifetime per endpoint class.
+
+    Lifetimes come from the upstream Cache-Control/Expires headers (or the
+    gridpoint updateTime) via ExpiryPolicy, falling back to the endpoint
+    class default.  Immutable endpoint classes never expire.
+
+    Entries record their own expiration time and are kept in storage for
+    Config.RESPONSE_CACHE_RETAIN_DAYS, so an expired entry can still be
+    revalidated with its ETag/Last-Modified validators.
+    """
+
+    name = "response_cache"
+
+    def __init__(self, cache_handler: Any) -> None:
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_handler: CacheHandler or LocalJsonCacheHandler instance
+        """
+        super().__init__(cache_handler, cache_handler.RESPONSE_PREFIX)
+
+    def ttl(self, url: str) -> Optional[int]:
+        """
+        Return the default freshness lifetime for a URL, used when the
+        response carries no caching headers.
+
+        Args:
+            url: Request URL
+
+        Returns:
+            Lifetime in seconds (0 = immutable), or None if not cacheable
+        """
+        return Config.RESPONSE_CACHE_TTLS.get(endpoint_class(url))
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cache entry for a URL, whether or not it is still fresh.
+
+        Args:
+            url: Request URL
+
+        Returns:
+            Cached response entry or None
+        """
+        if self.ttl(url) is None:
+            return None
+
+        return super().lookup(url)
+
+    def read(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the entry for a URL from storage.
+
+        Args:
+            url: Request URL
+
+        Returns:
+            Cached response entry or None
+        """
+        return self.cache_handler.get_response(normalize_url(url))
+
+    def store(self, url: str, entry: Dict[str, Any]) -> None:
+        """
+        Write the entry for a URL to storage.
+
+        Args:
+            url: Request URL
+            entry: Cached response entry
+        """
+        self.cache_handler.put_response(
+            normalize_url(url), entry, Config.RESPONSE_CACHE_RETAIN_DAYS
+        )
+
+    def load(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the JSON data stored in a cache entry.
+
+        Args:
+            entry: Cached response entry
+
+        Returns:
+            Dict containing the cached JSON response
+        """
+        return json.loads(entry["body"])
+
+    def expires_at(
+        self, url: str, response: httpx.Response, data: Optional[Any] = None
+    ) -> int:
+        """
+        Compute when a response stops being fresh.
+
+        Args:
+            url: Request URL
+            response: HTTP response carrying Cache-Control/Expires headers
+            data: Parsed response body, if any
+
+        Returns:
+            Expiration time in epoch seconds (0 = immutable)
+        """
+        ttl = self.ttl(url)
+        if not ttl:
+            return 0
+
+        return self.policy.expires_at(response.headers, data, ttl)
+
+    def put(
+        self,
+        url: str,
+        response: httpx.Response,
+        data: Dict[str, Any],
+        projected: bool = False,
+    ) -> None:
+        """
+        Store a response body and its validators for a URL.
+
+        Args:
+            url: Request URL
+            response: Successful HTTP response
+            data: Parsed response body
+            projected: The body was streamed and data holds only some of its
+                members, so store data instead of the body
+        """
+        if self.ttl(url) is None:
+            return
+
+        entry = {
+            "body": json.dumps(data) if projected else response.text,
+            "fetched": int(time()),
+            "expires": self.expires_at(url, response, data),
+            **validators(response),
+        }
+        self.store(url, entry)
+
+    def revalidated_expiry(
+        self, url: str, entry: Dict[str, Any], response: httpx.Response
+    ) -> int:
+        """
+        Compute when a revalidated response stops being fresh.
+
+        Args:
+            url: Request URL
+            entry: Cached response entry that was revalidated
+            response: The 304 response carrying updated caching headers
+
+        Returns:
+            Expiration time in epoch seconds (0 = immutable)
+        """
+        return self.expires_at(url, response)
+
+    def grace(self, url: str) -> int:
+        """
+        Return the stale grace window of a URL's endpoint class.
+
+        Args:
+            url: Request URL
+
+        Returns:
+            Grace window in seconds (0 = never stale)
+        """
+        return Config.RESPONSE_CACHE_STALE_GRACE.get(endpoint_class(url), 0)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the per-request deadline budget.
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from unittest import mock
+
+# Set required environment variables before importing
+os.environ["app_id"] = "amzn1.ask.skill.test"
+os.environ["here_api_key"] = "test"
+os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import httpx  # noqa: E402
+
+from utils import metrics  # noqa: E402
+from utils.config import Config  # noqa: E402
+from utils.deadline import (  # noqa: E402
+    Deadline,
+    DeadlineExceeded,
+    detached,
+    get_deadline,
+    get_timeout,
+    reset_deadline,
+    set_deadline,
+)
+from utils.factories import get_executor  # noqa: E402
+from utils.singleflight import SingleFlight  # noqa: E402
+from weather.base import WeatherBase  # noqa: E402
+
+
+class FakeContext:
+    """Lambda context with a fixed amount of time left"""
+
+    def __init__(self, millis):
+        self.millis = millis
+
+    def get_remaining_time_in_millis(self):
+        return self.millis
+
+
+def test_deadline_budget():
+    """Test remaining time, timeouts and the Lambda-derived budget"""
+    print("Testing Deadline budget...")
+
+    deadline = Deadline(5)
+    assert 4 < deadline.remaining() <= 5
+    assert deadline.timeout(1) == 1
+    assert not deadline.expired
+    deadline.check()
+
+    expired = Deadline(-1)
+    assert expired.expired
+    assert expired.remaining() == 0
+    assert expired.timeout(30) == 0
+    try:
+        expired.check()
+        assert False, "DeadlineExceeded not raised"
+    except DeadlineExceeded:
+        pass
+
+    # The Lambda's remaining time caps the configured budget
+    deadline = Deadline.for_invocation(FakeContext(3000))
+    assert deadline.remaining() <= 3 - Config.REQUEST_BUDGET_RESERVE_SECONDS
+    deadline = Deadline.for_invocation(FakeContext(900000))
+    assert deadline.remaining() <= Config.REQUEST_BUDGET_SECONDS
+    assert Deadline.for_invocation(None).remaining() <= Config.REQUEST_BUDGET_SECONDS
+
+    print("✓ Budget computed")
+    print()
+
+
+def test_deadline_context():
+    """Test that the deadline follows work onto the shared executor"""
+    print("Testing deadline propagation...")
+
+    assert get_deadline() is None
+    assert get_timeout(30) == 30
+
+    deadline = Deadline(5)
+    token = set_deadline(deadline)
+    try:
+        assert get_timeout(30) <= 5
+        assert get_executor().submit(get_deadline).result(timeout=5) is deadline
+        assert detached(get_deadline)() is None
+        assert get_deadline() is deadline
+    finally:
+        reset_deadline(token)
+
+    assert get_deadline() is None
+
+    print("✓ Deadline propagated to worker threads")
+    print()
+
+
+def test_singleflight_wait():
+    """Test that a coalesced caller stops waiting at its deadline"""
+    print("Testing single-flight deadline...")
+
+    group = SingleFlight("test_deadline")
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(timeout=5)
+        return "done"
+
+    leader = get_executor().submit(group.do, "k", slow)
+    started.wait(timeout=5)
+
+    token = set_deadline(Deadline(0.05))
+    try:
+        group.do("k", slow)
+        assert False, "DeadlineExceeded not raised"
+    except DeadlineExceeded:
+        pass
+    finally:
+        reset_deadline(token)
+
+    release.set()
+    assert leader.result(timeout=5) == "done"
+
+    print("✓ Follower gave up at its deadline")
+    print()
+
+
+def test_https_deadline():
+    """Test that NWS requests are skipped once the budget is used up"""
+    print("Testing WeatherBase deadline...")
+
+    metrics.reset()
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, text=json.dumps({"ok": True}))
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with mock.patch("weather.base.get_https_client", return_value=client), \
+            mock.patch("weather.base.get_async_https_client", return_value=async_client):
+        base = WeatherBase({}, None)
+
+        token = set_deadline(Deadline(5))
+        try:
+            assert base.https("zones/forecast/MNZ060") == {"ok": True}
+        finally:
+            reset_deadline(token)
+
+        token = set_deadline(Deadline(-1))
+        try:
+            assert base.https("zones/forecast/MNZ061") is None
+            assert asyncio.run(base.https_async("zones/forecast/MNZ062")) is None
+        finally:
+            reset_deadline(token)
+
+    assert len(requests) == 1
+    assert metrics.get("deadline.exceeded") == 2
+
+    print("✓ Expired requests return None without I/O")
+    print()
+
+
+class SlowTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Transport that answers after a delay, honoring the read timeout"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.requests = []
+        self.started = threading.Event()
+
+    def wait(self, request):
+        self.requests.append(request)
+        self.started.set()
+        timeout = request.extensions["timeout"]["read"]
+        return min(self.delay, timeout), timeout is not None and timeout < self.delay
+
+    def respond(self, request, timed_out):
+        if timed_out:
+            raise httpx.ReadTimeout("timed out", request=request)
+        return httpx.Response(200, text=json.dumps({"ok": True}), request=request)
+
+    def handle_request(self, request):
+        delay, timed_out = self.wait(request)
+        time.sleep(delay)
+        return self.respond(request, timed_out)
+
+    async def handle_async_request(self, request):
+        delay, timed_out = self.wait(request)
+        await asyncio.sleep(delay)
+        return self.respond(request, timed_out)
+
+
+def test_coalesced_budgets():
+    """Test that a follower isn't held to the leader's deadline"""
+    print("Testing coalesced callers with different budgets...")
+
+    def call(base, seconds):
+        token = set_deadline(Deadline(seconds))
+        try:
+            return base.https("zones/forecast/MNZ060")
+        finally:
+            reset_deadline(token)
+
+    metrics.reset()
+    transport = SlowTransport(0.6)
+    client = httpx.Client(transport=transport)
+    with mock.patch("weather.base.get_https_client", return_value=client):
+        base = WeatherBase({}, None)
+        leader = get_executor().submit(call, base, 0.3)
+        transport.started.wait(timeout=5)
+        assert call(base, 7) == {"ok": True}
+        assert leader.result(timeout=5) is None
+
+    assert len(transport.requests) == 2
+    assert metrics.get("deadline.exceeded") == 1
+    assert metrics.get("single_flight.retried") == 1
+
+    async def call_async(base, seconds):
+        token = set_deadline(Deadline(seconds))
+        try:
+            return await base.https_async("zones/forecast/MNZ060")
+        finally:
+            reset_deadline(token)
+
+    async def run(base):
+        return await asyncio.gather(call_async(base, 0.3), call_async(base, 7))
+
+    metrics.reset()
+    transport = SlowTransport(0.6)
+    async_client = httpx.AsyncClient(transport=transport)
+    with mock.patch("weather.base.get_async_https_client", return_value=async_client):
+        assert asyncio.run(run(WeatherBase({}, None))) == [None, {"ok": True}]
+
+    assert len(transport.requests) == 2
+    assert metrics.get("deadline.exceeded") == 1
+
+    print("✓ Followers with time left retried the call")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Running Deadline Tests")
+    print("=" * 60)
+    print()
+
+    test_deadline_budget()
+    test_deadline_context()
+    test_singleflight_wait()
+    test_https_deadline()
+    test_coalesced_budgets()
+
+    print("=" * 60)
+    print("✅ ALL DEADLINE TESTS PASSED")
+    print("=" * 60)
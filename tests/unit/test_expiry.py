@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the cache expiry policy.
+"""
+import os
+import sys
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from utils.config import Config  # noqa: E402
+from utils.expiry import ExpiryPolicy, parse_time  # noqa: E402
+
+NOW = parse_time("2024-01-01T12:00:00+00:00")
+
+
+def test_header_expiry():
+    """Test expiry from Cache-Control and Expires headers"""
+    print("Testing header expiry...")
+
+    policy = ExpiryPolicy("response#")
+
+    headers = {"Cache-Control": "public, max-age=600, s-maxage=900"}
+    assert policy.expires_at(headers, now=NOW) == NOW + 600
+
+    headers = {"Cache-Control": "public, max-age=600", "Age": "100"}
+    assert policy.expires_at(headers, now=NOW) == NOW + 500
+
+    headers = {"Expires": "Mon, 01 Jan 2024 12:05:00 GMT"}
+    assert policy.expires_at(headers, now=NOW) == NOW + 300
+
+    # Expires is relative to the server's clock, not ours
+    headers = {
+        "Expires": "Mon, 01 Jan 2024 12:05:00 GMT",
+        "Date": "Mon, 01 Jan 2024 11:59:00 GMT",
+    }
+    assert policy.expires_at(headers, now=NOW) == NOW + 360
+
+    # No usable headers falls back to the default lifetime
+    assert policy.expires_at({}, default=120, now=NOW) == NOW + 120
+
+    print("✓ Header expiry computed")
+    print()
+
+
+def test_gridpoint_expiry():
+    """Test expiry from gridpoint updateTime and validTimes"""
+    print("Testing gridpoint expiry...")
+
+    policy = ExpiryPolicy("response#")
+    data = {
+        "updateTime": "2024-01-01T11:50:00+00:00",
+        "validTimes": "2024-01-01T06:00:00+00:00/P7DT19H",
+    }
+    assert policy.expires_at(data=data, now=NOW) == (
+        parse_time(data["updateTime"]) + Config.GRIDPOINT_UPDATE_SECONDS
+    )
+
+    # Never past the end of the valid period
+    data["validTimes"] = "2024-01-01T06:00:00+00:00/PT6H15M"
+    assert policy.expires_at(data=data, now=NOW) == NOW + 15 * 60
+
+    print("✓ Gridpoint expiry computed")
+    print()
+
+
+def test_bounds():
+    """Test that expiry is clamped to the per-prefix bounds"""
+    print("Testing expiry bounds...")
+
+    low, high = Config.CACHE_EXPIRY_BOUNDS["response#"]
+    policy = ExpiryPolicy("response#")
+
+    assert policy.expires_at({"Cache-Control": "no-cache"}, now=NOW) == NOW + low
+    assert policy.expires_at({"Cache-Control": "max-age=0"}, now=NOW) == NOW + low
+    assert (
+        policy.expires_at({"Cache-Control": "max-age=99999999"}, now=NOW)
+        == NOW + high
+    )
+
+    # Prefixes without bounds are not clamped
+    assert ExpiryPolicy("unbounded#").expires_at(default=5, now=NOW) == NOW + 5
+
+    print("✓ Expiry clamped to bounds")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Running Expiry Policy Tests")
+    print("=" * 60)
+    print()
+
+    test_header_expiry()
+    test_gridpoint_expiry()
+    test_bounds()
+
+    print("=" * 60)
+    print("✅ ALL EXPIRY POLICY TESTS PASSED")
+    print("=" * 60)
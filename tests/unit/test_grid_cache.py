@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared grid cell cache.
+Uses the local JSON cache handler and an httpx mock transport.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+# Set required environment variables before importing
+os.environ["app_id"] = "amzn1.ask.skill.test"
+os.environ["here_api_key"] = "test"
+os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import httpx  # noqa: E402
+
+import numpy as np  # noqa: E402
+
+from storage.grid_cache import GridCache  # noqa: E402
+from storage.local_handlers import LocalJsonCacheHandler  # noqa: E402
+from utils import metrics  # noqa: E402
+from utils.config import Config  # noqa: E402
+from weather.grid_data import GridData  # noqa: E402
+from weather.grid_points import GridPoints  # noqa: E402
+
+UTC = timezone.utc
+RAIN = {"coverage": "chance", "weather": "rain", "intensity": None,
+        "visibility": {"unitCode": "wmoUnit:km", "value": None}, "attributes": []}
+
+
+def make_payload():
+    """Gridpoint payload updated just now, with layers we never read"""
+    now = datetime.now(UTC).replace(microsecond=0)
+    return {
+        "@context": ["https://geojson.org/geojson-ld/geojson-context.jsonld"],
+        "geometry": "POLYGON((-93.2 44.9, -93.2 45.0, -93.1 45.0, -93.2 44.9))",
+        "updateTime": now.isoformat(),
+        "validTimes": "%s/P7D" % (now - timedelta(hours=6)).isoformat(),
+        "temperature": {
+            "uom": "wmoUnit:degC",
+            "values": [
+                {"validTime": "%s/PT6H" % now.isoformat(), "value": 5.555555555555557},
+                {"validTime": "%s/P1DT2H" % (now + timedelta(hours=6)).isoformat(), "value": None},
+                {"validTime": "%s/PT1H" % (now + timedelta(hours=32)).isoformat(), "value": -12.2},
+            ],
+        },
+        "weather": {"values": [
+            {"validTime": "%s/PT6H" % now.isoformat(), "value": [RAIN]},
+            {"validTime": "%s/PT6H" % (now + timedelta(hours=6)).isoformat(), "value": []},
+            {"validTime": "%s/PT6H" % (now + timedelta(hours=12)).isoformat(), "value": [RAIN]},
+        ]},
+        "hainesIndex": {"values": [{"validTime": "%s/PT6H" % now.isoformat(), "value": 4}]},
+    }
+
+
+class GridpointHandler(object):
+    """Fake api.weather.gov gridpoint endpoint that counts requests"""
+
+    def __init__(self):
+        self.requests = []
+        self.payload = make_payload()
+        self.etag = '"v1"'
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(
+            200, text=json.dumps(self.payload), headers={"ETag": self.etag}
+        )
+
+
+def test_pack_round_trip():
+    """Test that packed grid data decodes to the same arrays and values"""
+    print("Testing packed grid data...")
+
+    payload = make_payload()
+    grid = GridData.from_json(payload)
+    assert set(grid.series) == {"temperature"}
+    assert set(grid.tables) == {"weather"}
+
+    packed = grid.pack()
+    assert len(packed) < len(json.dumps(payload))
+    unpacked = GridData.unpack(packed)
+    assert unpacked.meta == grid.meta
+
+    assert unpacked.series == {} and unpacked.layers == ["temperature"]
+    series, original = unpacked.get_series("temperature"), grid.series["temperature"]
+    assert np.array_equal(series.starts, original.starts)
+    assert np.array_equal(series.ends, original.ends)
+    assert np.array_equal(series.values, original.values, equal_nan=True)
+
+    summaries, original = unpacked.summaries, grid.summaries
+    assert original is None and summaries is None
+    grid.summarize(UTC)
+    summaries, original = GridData.unpack(grid.pack()).summaries, grid.summaries
+    assert len(summaries) in (28, 29)
+    assert np.array_equal(summaries.starts, original.starts)
+    assert np.array_equal(summaries.layers["temperature"], original.layers["temperature"], equal_nan=True)
+    assert summaries.phrases == original.phrases
+    assert ["a chance of rain"] in summaries.phrases
+
+    index, values = unpacked.get_table("weather")
+    assert values == [value["value"] for value in payload["weather"]["values"]]
+    assert index.starts == list(grid.tables["weather"][0])
+
+    try:
+        GridData.unpack("bm90IGdyaWQgZGF0YQ==")
+        assert False, "ValueError not raised"
+    except ValueError:
+        pass
+    assert GridCache.cell_id("mpx", "107, 71") == "MPX/107,71"
+
+    print("✓ Grid data round-trips")
+    print()
+
+
+def test_shared_cell():
+    """Test that users in the same grid cell share one fetch"""
+    print("Testing grid cell cache...")
+
+    metrics.reset()
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cache_handler = LocalJsonCacheHandler(cache_dir)
+        handler = GridpointHandler()
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with mock.patch("weather.base.get_https_client", return_value=client), \
+                mock.patch.object(GridData, "unpack", wraps=GridData.unpack) as unpack:
+            # A miss uses the grid it built; only a hit unpacks the stored one
+            first = GridPoints({}, UTC, "MPX", "107,71", cache_handler)
+            assert unpack.call_count == 0 and first.data.summaries is not None
+            second = GridPoints({}, UTC, "MPX", "107,71", cache_handler)
+            assert unpack.call_count == 1
+            assert len(handler.requests) == 1
+            assert metrics.get("grid_cache.hit") == 1
+            assert "hainesIndex" not in second.data.layers
+            assert second.data.series == {}
+            first.set_interval(datetime.now(UTC), datetime.now(UTC) + timedelta(hours=48))
+            second.set_interval(first.stime, first.etime)
+            assert second.temp_high == first.temp_high
+            assert second.temp_low == first.temp_low
+            # Only the layers read are decoded
+            assert list(second.data.series) == ["temperature"]
+            assert second.weather_text == first.weather_text != ""
+
+            # Not also kept in the response cache
+            assert os.listdir(os.path.join(cache_dir, "response")) == []
+
+            # Expires an hour after updateTime
+            entry = cache_handler.get_gridpoint("MPX/107,71")
+            updated = datetime.fromisoformat(handler.payload["updateTime"]).timestamp()
+            assert entry["expires"] == updated + Config.GRIDPOINT_UPDATE_SECONDS
+
+            # Other cells are fetched separately
+            GridPoints({}, UTC, "MPX", "108,71", cache_handler)
+            assert len(handler.requests) == 2
+
+            # Expired cells are fetched again
+            cache_handler.put_gridpoint("MPX/107,71", entry, int(time.time()) - 1)
+            GridPoints({}, UTC, "MPX", "107,71", cache_handler)
+            assert len(handler.requests) == 3
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print("✓ Grid cells shared")
+    print()
+
+
+def test_revalidation():
+    """Test that expired cells are kept and revalidated with conditional requests"""
+    print("Testing grid cell revalidation...")
+
+    metrics.reset()
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cache_handler = LocalJsonCacheHandler(cache_dir)
+        handler = GridpointHandler()
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        cache = GridCache(cache_handler)
+        with mock.patch("weather.base.get_https_client", return_value=client):
+            first = GridPoints({}, UTC, "MPX", "107,71", cache_handler)
+            entry = cache_handler.get_gridpoint("MPX/107,71")
+            assert entry["etag"] == handler.etag
+
+            # Kept in storage past expiry for the retention window
+            path = cache_handler._get_file_path(cache_handler.GRIDPOINT_PREFIX, "MPX/107,71")
+            with open(path) as f:
+                ttl = json.load(f)["ttl"]
+            assert ttl == entry["expires"] + Config.GRIDPOINT_CACHE_RETAIN_DAYS * 24 * 60 * 60
+
+            # Long expired: the refetch is conditional and the 304 renews it
+            entry["expires"] = int(time.time()) - 2 * 60 * 60
+            cache.store("MPX/107,71", entry)
+            second = GridPoints({}, UTC, "MPX", "107,71", cache_handler)
+            assert len(handler.requests) == 2
+            assert handler.requests[1].headers["If-None-Match"] == handler.etag
+            assert second.data.meta == first.data.meta
+            assert cache.is_fresh(cache_handler.get_gridpoint("MPX/107,71"))
+            assert metrics.get("grid_cache.revalidated") == 1
+
+            GridPoints({}, UTC, "MPX", "107,71", cache_handler)
+            assert len(handler.requests) == 2
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print("✓ Grid cells revalidated")
+    print()
+
+
+def test_stale_cell():
+    """Test that recently expired cells are served while refreshing"""
+    print("Testing stale grid cells...")
+
+    metrics.reset()
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cache_handler = LocalJsonCacheHandler(cache_dir)
+        handler = GridpointHandler()
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        cache = GridCache(cache_handler)
+        with mock.patch("weather.base.get_https_client", return_value=client):
+            first = GridPoints({}, UTC, "MPX", "107,71", cache_handler)
+
+            # NWS has since updated the cell
+            handler.etag = '"v2"'
+            handler.payload["updateTime"] = (
+                datetime.now(UTC).replace(microsecond=0) + timedelta(minutes=1)
+            ).isoformat()
+
+            # Just expired: served from cache, refreshed in the background
+            entry = cache_handler.get_gridpoint("MPX/107,71")
+            entry["expires"] = int(time.time()) - 5
+            cache.store("MPX/107,71", entry)
+            stale = GridPoints({}, UTC, "MPX", "107,71", cache_handler)
+            assert stale.data.meta == first.data.meta
+            assert metrics.get("grid_cache.stale_served") == 1
+
+            deadline = time.time() + 5
+            while (
+                cache_handler.get_gridpoint("MPX/107,71")["etag"] != handler.etag
+                and time.time() < deadline
+            ):
+                time.sleep(0.01)
+            assert len(handler.requests) == 2
+            assert handler.requests[1].headers["If-None-Match"] == '"v1"'
+            fresh = GridPoints({}, UTC, "MPX", "107,71", cache_handler)
+            assert fresh.data.meta["updateTime"] == handler.payload["updateTime"]
+            assert len(handler.requests) == 2
+
+            # Long expired: beyond the grace window, so fetched inline
+            entry = cache_handler.get_gridpoint("MPX/107,71")
+            entry["expires"] = int(time.time()) - 2 * 60 * 60
+            cache.store("MPX/107,71", entry)
+            GridPoints({}, UTC, "MPX", "107,71", cache_handler)
+            assert len(handler.requests) == 3
+            assert metrics.get("grid_cache.stale_served") == 1
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print("✓ Stale grid cells served within the grace window")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Running Grid Cache Tests")
+    print("=" * 60)
+    print()
+
+    test_pack_round_trip()
+    test_shared_cell()
+    test_revalidation()
+    test_stale_cell()
+
+    print("=" * 60)
+    print("✅ ALL GRID CACHE TESTS PASSED")
+    print("=" * 60)
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Unit tests for GridPoints window queries.
+Compares the columnar engine with a straightforward hourly expansion.
+"""
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from dateutil import tz
+
+# Set required environment variables before importing
+os.environ["app_id"] = "amzn1.ask.skill.test"
+os.environ["here_api_key"] = "test"
+os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from weather.grid_points import GridPoints  # noqa: E402
+from weather.phrases import compile_phrase, weather_phrases  # noqa: E402
+from weather.series import COMPARISONS, Series  # noqa: E402
+from weather.summaries import quarter_bounds  # noqa: E402
+
+UTC = timezone.utc
+BASE = datetime(2024, 1, 1, 6, tzinfo=UTC)
+
+
+def layer(*runs):
+    """Build a layer from (hours, value) runs starting at BASE"""
+    values = []
+    start = BASE
+    for hours, value in runs:
+        values.append({
+            "validTime": "%s/PT%dH" % (start.isoformat(), hours),
+            "value": value,
+        })
+        start += timedelta(hours=hours)
+    return {"values": values}
+
+
+DATA = {
+    "validTimes": "2024-01-01T06:00:00+00:00/P2D",
+    "temperature": layer((3, -2.0), (1, 0.5), (4, 3.0), (16, 1.0), (24, -5.0)),
+    "quantitativePrecipitation": layer((6, 0.0), (6, 2.5), (6, None), (30, 1.0)),
+    "probabilityOfPrecipitation": layer((12, 20), (36, 60)),
+    "weather": layer(
+        (6, [{"coverage": "chance", "weather": "rain_showers", "intensity": None, "attributes": []}]),
+        (6, [{"coverage": "likely", "weather": "snow", "intensity": None, "attributes": []}]),
+        (36, [{"coverage": "chance", "weather": "rain_showers", "intensity": None, "attributes": []}]),
+    ),
+}
+
+
+def make_grid_points():
+    with mock.patch.object(
+        GridPoints, "https", side_effect=lambda *args, build, **kwargs: build(DATA)
+    ):
+        return GridPoints({}, UTC, "MPX", "107,71")
+
+
+def expand(data, metric, stime, etime):
+    """Hourly expansion of a contiguous layer, as GridPoints used to do"""
+    times, values = [], []
+    for entry in data[metric]["values"]:
+        start, _, duration = entry["validTime"].partition("/")
+        dts = datetime.fromisoformat(start)
+        dte = dts + timedelta(hours=int(duration[2:-1]))
+        while stime < etime and dts <= stime < dte:
+            times.append(stime)
+            values.append(entry["value"])
+            stime += timedelta(hours=1)
+    return times, values
+
+
+def test_series_sampling():
+    """Test sampling of a parsed layer"""
+    print("Testing Series sampling...")
+
+    series = Series.from_layer(DATA["quantitativePrecipitation"])
+    assert len(series) == 4
+
+    start = BASE.timestamp()
+    times, values = series.sample(start + 5 * 3600, start + 8 * 3600)
+    assert times.tolist() == [start + h * 3600 for h in (5, 6, 7)]
+    assert values.tolist() == [0.0, 2.5, 2.5]
+
+    # Windows outside the data are empty
+    times, values = series.sample(start - 5 * 3600, start - 3600)
+    assert len(times) == 0 and len(values) == 0
+    assert len(Series.from_layer(None)) == 0
+
+    print("✓ Layers sampled hourly")
+    print()
+
+
+def test_window_queries():
+    """Test that window queries match the hourly expansion"""
+    print("Testing GridPoints window queries...")
+
+    gp = make_grid_points()
+    windows = [(0, 6), (2, 5), (3, 30), (12, 48), (30, 31), (47, 60)]
+    for metric in ("temperature", "quantitativePrecipitation", "probabilityOfPrecipitation"):
+        for first, last in windows:
+            stime = BASE + timedelta(hours=first)
+            etime = BASE + timedelta(hours=last)
+            assert gp.set_interval(stime, etime)
+
+            times, values = expand(DATA, metric, stime, etime)
+            present = [value for value in values if value is not None]
+            assert gp.get_values(metric) == values
+            assert gp.get_times(metric) == times
+            assert gp.get_low(metric) == (min(present) if present else None)
+            assert gp.get_high(metric) == (max(present) if present else None)
+            assert gp.get_initial(metric) == (values[0] if values else None)
+            assert gp.get_final(metric) == (values[-1] if values else None)
+
+    print("✓ Window queries match")
+    print()
+
+
+def test_unaligned_window():
+    """Test aggregates over a window that doesn't start on the hour"""
+    print("Testing GridPoints unaligned window...")
+
+    gp = make_grid_points()
+    gp.set_interval(BASE + timedelta(hours=2, minutes=30), BASE + timedelta(hours=3, minutes=30))
+    # Overlaps the -2.0 run and the 0.5 run
+    assert gp.get_low("temperature") == -2.0
+    assert gp.get_high("temperature") == 0.5
+    assert gp.get_initial("temperature") == -2.0
+    assert gp.get_final("temperature") == 0.5
+    # Only one hourly sample falls inside
+    assert gp.get_values("temperature") == [-2.0]
+
+    print("✓ Aggregates cover every overlapping run")
+    print()
+
+
+def test_totals():
+    """Test precipitation totals over a window"""
+    print("Testing GridPoints totals...")
+
+    gp = make_grid_points()
+    gp.set_interval(BASE, BASE + timedelta(hours=24))
+    # 2.5mm over 6 hours, 6 missing, then 6 of the 30 hours with 1mm
+    assert abs(gp.get_total("quantitativePrecipitation") - 2.7) < 1e-9
+    assert gp.precip_total == gp.mm_to_in(2.7)
+
+    # Runs partly inside the window count in proportion
+    gp.set_interval(BASE + timedelta(hours=9), BASE + timedelta(hours=10))
+    assert abs(gp.get_total("quantitativePrecipitation") - 2.5 / 6) < 1e-9
+
+    gp.set_interval(BASE, BASE + timedelta(hours=6))
+    assert gp.precip_text == ""
+    assert gp.get_total("snowfallAmount") is None
+    assert gp.snow_total is None
+
+    print("✓ Totals computed")
+    print()
+
+
+def test_query():
+    """Test that a batch query matches one window at a time"""
+    print("Testing GridPoints.query...")
+
+    metrics = ["temperature", "quantitativePrecipitation", "probabilityOfPrecipitation", "windGust"]
+    windows = [
+        (BASE + timedelta(hours=first), BASE + timedelta(hours=last))
+        for first, last in [(0, 6), (6, 12), (12, 18), (18, 24), (0, 48), (2.5, 3.5)]
+    ]
+
+    gp = make_grid_points()
+    results = gp.query(windows, metrics)
+    assert len(results) == len(windows)
+
+    single = make_grid_points()
+    for (stime, etime), result in zip(windows, results):
+        single.set_interval(stime, etime)
+        for metric in metrics:
+            aggregate = result[metric]
+            assert aggregate.low == single.get_low(metric)
+            assert aggregate.high == single.get_high(metric)
+            assert aggregate.initial == single.get_initial(metric)
+            assert aggregate.final == single.get_final(metric)
+            assert aggregate.total == single.get_total(metric)
+
+        # Queried windows are answered without recomputing
+        gp.set_interval(stime, etime)
+        with mock.patch.object(gp, "get_series", side_effect=AssertionError):
+            assert gp.temp_high == single.temp_high
+            assert gp.precip_total == single.precip_total
+
+    print("✓ Batch query matches")
+    print()
+
+
+def test_weather_text():
+    """Test that every weather period overlapping the window is described"""
+    print("Testing GridPoints weather_text...")
+
+    gp = make_grid_points()
+    gp.set_interval(BASE + timedelta(hours=3), BASE + timedelta(hours=15))
+    text = gp.weather_text
+    assert text.count(", then ") == 1
+    assert "snow" in text
+
+    gp.set_interval(BASE + timedelta(hours=6), BASE + timedelta(hours=12))
+    assert gp.weather_text.count(", then ") == 0
+
+    print("✓ Weather described")
+    print()
+
+
+def test_thresholds():
+    """Test threshold and next-occurrence queries"""
+    print("Testing GridPoints threshold queries...")
+
+    gp = make_grid_points()
+    hour = timedelta(hours=1)
+    assert gp.first_time("temperature", "<", 0, BASE) == BASE
+    assert gp.next_crossing("temperature", "<", 0, BASE) == BASE + 24 * hour
+    assert gp.next_crossing("temperature", ">", 0, BASE) == BASE + 3 * hour
+    assert gp.first_time("quantitativePrecipitation", ">", 0, BASE) == BASE + 6 * hour
+    assert gp.first_time("temperature", ">", 5, BASE) is None
+    assert gp.first_time("windGust", ">", 0, BASE) is None
+
+    assert gp.get_spans("temperature", ">", 0, BASE + hour, BASE + 30 * hour) == [
+        (BASE + 3 * hour, BASE + 24 * hour)
+    ]
+    # The missing run splits the stretches of precipitation
+    assert gp.get_spans("quantitativePrecipitation", ">", 0, BASE) == [
+        (BASE + 6 * hour, BASE + 12 * hour),
+        (BASE + 18 * hour, BASE + 48 * hour),
+    ]
+    assert gp.get_duration("temperature", "<", 0, BASE + hour, BASE + 30 * hour) == 8 * hour
+
+    # Durations agree with counting hourly samples
+    for op, value in (("<", 0), (">=", 1.0), (">", 0.5), ("<=", -5.0)):
+        for first, last in ((0, 48), (2, 5), (3, 30), (20, 26)):
+            stime, etime = BASE + first * hour, BASE + last * hour
+            gp.set_interval(stime, etime)
+            count = sum(
+                1 for v in gp.get_values("temperature")
+                if v is not None and COMPARISONS[op](v, value)
+            )
+            assert gp.get_duration("temperature", op, value, stime, etime) == count * hour
+
+    # Each threshold is indexed once
+    series = gp.get_series("temperature")
+    assert series.threshold("<", 0) is series.threshold("<", 0)
+
+    print("✓ Threshold queries answered")
+    print()
+
+
+def test_phrases():
+    """Test the memoized weather phrases"""
+    print("Testing weather phrases...")
+
+    gusty = {"coverage": "likely", "weather": "snow", "intensity": "heavy",
+             "attributes": ["gusty_wind"]}
+    quiet = {"coverage": "chance", "weather": "rain", "intensity": "very_light",
+             "attributes": []}
+    unknown = {"coverage": None, "weather": None, "intensity": None, "attributes": None}
+
+    compile_phrase.cache_clear()
+    phrases = weather_phrases([[gusty, quiet], None, [], [unknown, quiet], [gusty]])
+    assert phrases == ["likely heavy snow gusty winds", "a chance of rain"]
+    assert compile_phrase.cache_info().hits == 2
+
+    print("✓ Phrases rendered once")
+    print()
+
+
+def test_quarter_summaries():
+    """Test that windows of whole quarters come from the ingest summaries"""
+    print("Testing GridPoints quarter summaries...")
+
+    gp = make_grid_points()
+    summaries = gp.data.summaries
+    assert len(summaries) == 8
+    assert summaries.starts[0] == BASE.timestamp()
+
+    metrics = ["temperature", "quantitativePrecipitation", "probabilityOfPrecipitation"]
+    index, values = gp.data.get_table("weather")
+    for first, last in [(0, 6), (6, 18), (12, 24), (0, 48), (42, 48)]:
+        start = (BASE + timedelta(hours=first)).timestamp()
+        end = (BASE + timedelta(hours=last)).timestamp()
+        aggregates, phrases = summaries.get(start, end)
+        for metric in metrics:
+            expected = gp.get_series(metric).aggregate([start], [end])[0]
+            aggregate = aggregates[metric]
+            assert aggregate[:4] == expected[:4]
+            assert (aggregate.total is None) == (expected.total is None)
+            assert aggregate.total is None or abs(aggregate.total - expected.total) < 1e-9
+        assert phrases == weather_phrases([values[i] for i in index.overlapping(start, end)])
+
+    # Only whole quarters are summarized
+    start = BASE.timestamp()
+    assert summaries.get(start + 3600, start + 6 * 3600) is None
+    assert summaries.get(start, start + 60 * 3600) is None
+
+    # Forecast windows are answered without reading the series
+    with mock.patch.object(gp, "get_series", side_effect=AssertionError):
+        with mock.patch.object(gp, "get_table", side_effect=AssertionError):
+            gp.set_interval(BASE + timedelta(hours=6), BASE + timedelta(hours=18))
+            assert gp.temp_high == gp.c_to_f(3.0)
+            assert gp.precip_total == gp.mm_to_in(2.5)
+            assert "snow" in gp.weather_text
+            gp.query([(BASE, BASE + timedelta(hours=12))], metrics)
+
+    # Quarters follow the local clock across daylight saving changes
+    chicago = tz.gettz("America/Chicago")
+    start = datetime(2024, 3, 9, 20, tzinfo=chicago).timestamp()
+    starts, ends = quarter_bounds(start, start + 24 * 3600, chicago)
+    assert [datetime.fromtimestamp(t, chicago).hour for t in starts] == [18, 0, 6, 12, 18]
+    assert (ends - starts).tolist() == [21600, 18000, 21600, 21600, 21600]
+
+    print("✓ Quarter summaries match")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Running GridPoints Tests")
+    print("=" * 60)
+    print()
+
+    test_series_sampling()
+    test_window_queries()
+    test_unaligned_window()
+    test_totals()
+    test_query()
+    test_weather_text()
+    test_thresholds()
+    test_phrases()
+    test_quarter_summaries()
+
+    print("=" * 60)
+    print("✅ ALL GRIDPOINTS TESTS PASSED")
+    print("=" * 60)
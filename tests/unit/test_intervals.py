@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ISO 8601 interval parsing and the interval index.
+"""
+import os
+import sys
+from datetime import datetime, timezone
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from aniso8601.duration import parse_duration  # noqa: E402
+from dateutil import parser  # noqa: E402
+
+from weather.intervals import (  # noqa: E402
+    IntervalIndex,
+    duration_seconds,
+    parse_interval,
+    parse_timestamp,
+)
+
+HOUR = 3600
+
+
+def test_parsing():
+    """Test the fast paths against dateutil and aniso8601"""
+    print("Testing interval parsing...")
+
+    for value in ("2024-01-01T06:00:00+00:00", "2024-07-04T18:00:00-05:00", "2024-01-01T06:00:00Z"):
+        assert parse_timestamp(value) == parser.parse(value).timestamp()
+
+    for value in ("PT1H", "PT6H", "P1D", "P2DT12H", "PT30M", "PT1H30M15S", "P7DT19H", "P1W"):
+        assert duration_seconds(value) == parse_duration(value).total_seconds()
+
+    start, end = parse_interval("2024-01-01T06:00:00+00:00/P1DT3H")
+    assert start == datetime(2024, 1, 1, 6, tzinfo=timezone.utc).timestamp()
+    assert end - start == 27 * HOUR
+
+    print("✓ Timestamps and durations parsed")
+    print()
+
+
+def test_index():
+    """Test overlap and containment lookups"""
+    print("Testing IntervalIndex...")
+
+    # Given out of order, with a gap between 6 and 8
+    index = IntervalIndex([(3 * HOUR, 6 * HOUR), (0, 3 * HOUR), (8 * HOUR, 12 * HOUR)])
+    assert len(index) == 3
+
+    assert index.overlapping(0, 1) == [1]
+    assert index.overlapping(2 * HOUR, 4 * HOUR) == [1, 0]
+    assert index.overlapping(3 * HOUR, 3 * HOUR + 1) == [0]
+    assert index.overlapping(6 * HOUR, 8 * HOUR) == []
+    assert index.overlapping(-HOUR, 24 * HOUR) == [1, 0, 2]
+
+    assert index.containing(0) == 1
+    assert index.containing(3 * HOUR) == 0
+    assert index.containing(7 * HOUR) is None
+    assert index.containing(12 * HOUR) is None
+    assert IntervalIndex([]).overlapping(0, HOUR) == []
+
+    print("✓ Lookups answered")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Running Interval Tests")
+    print("=" * 60)
+    print()
+
+    test_parsing()
+    test_index()
+
+    print("=" * 60)
+    print("✅ ALL INTERVAL TESTS PASSED")
+    print("=" * 60)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Unit tests for streaming JSON parsing.
+Checks the projector against json.loads and the opt-in streaming fetch.
+"""
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest import mock
+
+# Set required environment variables before importing
+os.environ["app_id"] = "amzn1.ask.skill.test"
+os.environ["here_api_key"] = "test"
+os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import httpx  # noqa: E402
+
+from storage.local_handlers import LocalJsonCacheHandler  # noqa: E402
+from utils import metrics  # noqa: E402
+from utils.config import Config  # noqa: E402
+from utils.deadline import Deadline, reset_deadline, set_deadline  # noqa: E402
+from utils.json_stream import project  # noqa: E402
+from weather.base import WeatherBase  # noqa: E402
+
+DOCUMENT = {
+    "@context": ["https://geojson.org/geojson-ld/geojson-context.jsonld", {"wx": "]}\"{"}],
+    "geometry": "POLYGON((-93.2 44.9, -93.2 45.0))",
+    "updateTime": "2024-01-01T06:00:00+00:00",
+    "elevation": {"unitCode": "wmoUnit:m", "value": 256.9},
+    "temperature": {"values": [{"validTime": "2024-01-01T06:00:00+00:00/PT1H", "value": i / 3} for i in range(200)]},
+    "hainesIndex": {"values": [{"validTime": "x", "value": "\\\"]}{["}] * 300},
+    "weather": {"values": [{"value": [{"weather": "snow", "note": "ünïcödé"}]}, {"value": []}]},
+    "forecastOffice": None,
+    "count": 12345,
+}
+
+KEYS = ["updateTime", "temperature", "weather", "count", "forecastOffice", "missing"]
+
+
+def chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def test_projection():
+    """Test that projected members match json.loads for any chunking"""
+    print("Testing ObjectProjector...")
+
+    expected = {key: DOCUMENT[key] for key in KEYS if key in DOCUMENT}
+    for indent in (None, 2):
+        body = json.dumps(DOCUMENT, indent=indent, ensure_ascii=False).encode("utf-8")
+        for size in (1, 3, 7, 100, 4096, len(body)):
+            assert project(chunked(body, size), KEYS) == expected
+
+    assert project([b"{}"], KEYS) == {}
+    assert project([b' { "a" : [1, {"b": 2}] } '], ["a"]) == {"a": [1, {"b": 2}]}
+
+    for body in (b"", b"[1, 2]", b'{"a": 1', b'{"a" 1}', b'{"a": 1} {}', b'{"a": [1}'):
+        try:
+            project(chunked(body, 2), ["a"])
+            assert False, "ValueError not raised for %r" % body
+        except ValueError:
+            pass
+
+    print("✓ Members projected")
+    print()
+
+
+def test_split_numbers():
+    """Test that numbers split across chunks at any offset parse whole"""
+    print("Testing split numbers...")
+
+    body = (
+        b'{"a": 12.5, "b": -0.25e-3, "c": 1E+10, "d": [3.5e2, -7], '
+        b'"e": 42, "f": true, "g": 6.02e23}'
+    )
+    document = json.loads(body)
+    for keys in (["a", "c", "e", "g"], ["b", "d", "f"], list(document)):
+        expected = {key: document[key] for key in keys}
+        for offset in range(len(body) + 1):
+            assert project([body[:offset], body[offset:]], keys) == expected, offset
+        assert project(chunked(body, 1), keys) == expected
+
+    print("✓ Split numbers parsed")
+    print()
+
+
+def handler(request):
+    if request.url.path == "/gone":
+        return httpx.Response(404, text="Not here")
+    body = json.dumps(DOCUMENT).encode("utf-8")
+    return httpx.Response(200, content=iter(chunked(body, 512)))
+
+
+def test_streaming_fetch():
+    """Test that https() streams only when asked to and enabled"""
+    print("Testing streaming https...")
+
+    cache_dir = tempfile.mkdtemp()
+    try:
+        base = WeatherBase({}, LocalJsonCacheHandler(cache_dir))
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with mock.patch("weather.base.get_https_client", return_value=client):
+            # Off by default
+            assert base.https("alerts/active/zone/MNZ060", fields=["updateTime"]) == DOCUMENT
+
+            with mock.patch.object(Config, "JSON_STREAMING", True):
+                url = "products/types/AFD/locations/MPX"
+                assert base.https(url, fields=KEYS) == {
+                    key: DOCUMENT[key] for key in KEYS if key in DOCUMENT
+                }
+                assert base.https("alerts/active/zone/MNZ061") == DOCUMENT
+                assert base.https("gone", fields=KEYS) is None
+
+                # The response cache keeps the projection, not the body
+                entry = base.response_cache.lookup(base.make_url(url))
+                assert json.loads(entry["body"]) == {
+                    key: DOCUMENT[key] for key in KEYS if key in DOCUMENT
+                }
+
+        async_body = json.dumps(DOCUMENT).encode("utf-8")
+        async_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=async_body))
+        )
+        with mock.patch("weather.base.get_async_https_client", return_value=async_client), \
+                mock.patch.object(Config, "JSON_STREAMING", True):
+            data = asyncio.run(base.https_async("gridpoints/MPX/107,71", fields=["weather"]))
+            assert data == {"weather": DOCUMENT["weather"]}
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print("✓ Streaming fetch projects members")
+    print()
+
+
+def test_slow_stream():
+    """Test that a slowly arriving body is cut off at the request budget"""
+    print("Testing slow streamed body...")
+
+    def trickle():
+        body = json.dumps(DOCUMENT).encode("utf-8")
+        for offset in range(0, len(body), 16):
+            time.sleep(0.05)
+            yield body[offset:offset + 16]
+
+    metrics.reset()
+    base = WeatherBase({}, None)
+    client = httpx.Client(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, content=trickle()))
+    )
+    with mock.patch("weather.base.get_https_client", return_value=client), \
+            mock.patch.object(Config, "JSON_STREAMING", True):
+        token = set_deadline(Deadline(0.3))
+        try:
+            start = time.monotonic()
+            assert base.https("gridpoints/MPX/107,71", fields=KEYS) is None
+            assert time.monotonic() - start < 0.5
+        finally:
+            reset_deadline(token)
+        assert metrics.get("deadline.exceeded") == 1
+
+        # Without a deadline, the body is still limited to HTTP_TIMEOUT
+        with mock.patch.object(Config, "HTTP_TIMEOUT", 0.3):
+            try:
+                base.https("gridpoints/MPX/107,72", fields=KEYS)
+                assert False, "ReadTimeout not raised"
+            except httpx.ReadTimeout:
+                pass
+
+    print("✓ Slow bodies cut off")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Running JSON Streaming Tests")
+    print("=" * 60)
+    print()
+
+    test_projection()
+    test_split_numbers()
+    test_streaming_fetch()
+    test_slow_stream()
+
+    print("=" * 60)
+    print("✅ ALL JSON STREAMING TESTS PASSED")
+    print("=" * 60)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Unit tests for Location class.
+Replaces the NWS and geocoder calls with fakes so no network is required.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+# Set required environment variables before importing
+os.environ["app_id"] = "amzn1.ask.skill.test"
+os.environ["here_api_key"] = "test"
+os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from storage.local_handlers import LocalJsonCacheHandler  # noqa: E402
+from utils import metrics  # noqa: E402
+from weather.location import Location  # noqa: E402
+
+POINT = {
+    "relativeLocation": {"city": "Minneapolis", "state": "MN"},
+    "cwa": "MPX",
+    "gridX": 107,
+    "gridY": 71,
+    "timeZone": "America/Chicago",
+    "forecastZone": "https://api.weather.gov/zones/forecast/MNZ060",
+    "county": "https://api.weather.gov/zones/county/MNC053",
+    "observationStations": "https://api.weather.gov/gridpoints/MPX/107,71/stations",
+}
+
+
+class FakeLocation(Location):
+    """Location with canned geocoder and NWS responses"""
+
+    def __init__(self, barrier=None, cache_handler=None):
+        super().__init__({}, cache_handler)
+        self.barrier = barrier
+        self.calls = []
+
+    def wait(self):
+        # Only passes when all dependent lookups are running at the same time
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+
+    def mapquest(self, search):
+        self.calls.append(search)
+        if search == "minneapolis+minnesota":
+            self.wait()
+            return (44.98, -93.27), {"County": "Hennepin County"}
+        return (44.9778, -93.265), {"County": "Hennepin County"}
+
+    def https(self, path, loc="api.weather.gov"):
+        self.calls.append(path)
+        if path.startswith("points/"):
+            return POINT
+        self.wait()
+        if path == "zones/forecast/MNZ060":
+            return {"id": "MNZ060", "type": "public", "name": "Hennepin"}
+        if path == "zones/county/MNC053":
+            return {"id": "MNC053", "type": "county", "name": "Hennepin"}
+        if path.endswith("/stations?limit=5"):
+            return {"@graph": [{"stationIdentifier": "KMSP"}]}
+        return None
+
+
+def test_location_set():
+    """Test that Location.set assembles the location from all lookups"""
+    print("Testing Location.set...")
+
+    loc = FakeLocation()
+    assert loc.set("Minneapolis MN") is None
+
+    assert loc.city == "minneapolis"
+    assert loc.state == "minnesota"
+    assert loc.grid_point == "107,71"
+    assert loc.coords == "44.98,-93.27"
+    assert loc.forecastZoneId == "MNZ060"
+    assert loc.countyZoneName == "Hennepin"
+    assert loc.observationStations == {"@graph": [{"stationIdentifier": "KMSP"}]}
+    assert loc.name == "minneapolis mn"
+
+    print("✓ Location.set resolved all fields")
+    print()
+
+
+def test_location_set_concurrent():
+    """Test that the lookups after the points call run concurrently"""
+    print("Testing Location.set concurrency...")
+
+    # Reverse geocode, forecast zone, county zone and stations
+    loc = FakeLocation(threading.Barrier(4))
+    assert loc.set("Minneapolis MN") is None
+    assert loc.countyZoneId == "MNC053"
+
+    print("✓ Dependent lookups overlap")
+    print()
+
+
+def test_location_cache_first():
+    """Test that a cached city/state location needs no network I/O"""
+    print("Testing Location.set cache-first lookup...")
+
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cache_handler = LocalJsonCacheHandler(cache_dir)
+        metrics.reset()
+
+        loc = FakeLocation(cache_handler=cache_handler)
+        assert loc.set("Minneapolis MN") is None
+        assert len(loc.calls) > 0
+        assert metrics.get("location_cache.miss") == 1
+
+        cached = FakeLocation(cache_handler=cache_handler)
+        assert cached.set("minneapolis   mn") is None
+        assert cached.calls == []
+        assert cached.loc == loc.loc
+        assert metrics.get("location_cache.hit") == 1
+        assert metrics.hit_rate("location_cache") == 0.5
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print("✓ Cached location returned without network calls")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Running Location Tests")
+    print("=" * 60)
+    print()
+
+    test_location_set()
+    test_location_set_concurrent()
+    test_location_cache_first()
+
+    print("=" * 60)
+    print("✅ ALL LOCATION TESTS PASSED")
+    print("=" * 60)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared station observation cache.
+Uses the local JSON cache handler and an httpx mock transport.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from unittest import mock
+
+# Set required environment variables before importing
+os.environ["app_id"] = "amzn1.ask.skill.test"
+os.environ["here_api_key"] = "test"
+os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import httpx  # noqa: E402
+
+from storage import observation_cache  # noqa: E402
+from storage.local_handlers import LocalJsonCacheHandler  # noqa: E402
+from storage.observation_cache import ObservationCache  # noqa: E402
+from utils import metrics  # noqa: E402
+from utils.config import Config  # noqa: E402
+from weather.observations import Observations  # noqa: E402
+
+STATIONS = {"@graph": [{"stationIdentifier": "KMSP", "name": "Minneapolis, MN"}]}
+
+
+def make_observation(reported):
+    """Latest observation with the given report time"""
+    return {
+        "timestamp": datetime.fromtimestamp(reported, timezone.utc).isoformat(),
+        "textDescription": "Cloudy",
+        "temperature": {"unitCode": "wmoUnit:degC", "value": 5.0},
+    }
+
+
+def test_expiry():
+    """Test that entries expire when the station's next report is due"""
+    print("Testing observation expiry...")
+
+    metrics.reset()
+    observation_cache.forget()
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cache_handler = LocalJsonCacheHandler(cache_dir)
+        cache = ObservationCache(cache_handler)
+        now = int(time.time())
+        delay = Config.OBSERVATION_REPORT_DELAY_SECONDS
+
+        # Until a second report is seen, reports are assumed hourly
+        reported = now - 20 * 60
+        cache.put("KMSP", httpx.Response(200), make_observation(reported))
+        entry = cache_handler.get_observation("KMSP")
+        assert entry["expires"] == reported + Config.OBSERVATION_REPORT_SECONDS + delay
+        assert cache.load(cache.lookup("KMSP")) == make_observation(reported)
+
+        # The interval is learned from consecutive reports
+        cache.put("KMSP", httpx.Response(200), make_observation(reported + 20 * 60))
+        entry = cache_handler.get_observation("KMSP")
+        assert entry["interval"] == 20 * 60
+        assert entry["expires"] == reported + 40 * 60 + delay
+
+        # A late station is checked again soon
+        assert cache.expires_at(now - 3 * 60 * 60, 60 * 60, now) == now + 60
+
+        # Expired entries are kept in storage for revalidation, and served
+        # only within the grace window
+        cache.put("KSTP", httpx.Response(200), make_observation(now - 3 * 60 * 60))
+        observation_cache.forget()
+        grace = Config.RESPONSE_CACHE_STALE_GRACE["observations"]
+        with mock.patch("storage.http_cache.time", return_value=now + 120):
+            entry = cache.lookup("KSTP")
+            assert not cache.is_fresh(entry) and cache.is_servable_stale("KSTP", entry)
+        with mock.patch("storage.http_cache.time", return_value=now + 60 + grace):
+            assert not cache.is_servable_stale("KSTP", cache.lookup("KSTP"))
+        assert metrics.get("observation_cache.stale") == 2
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print("✓ Observations expire at the next report")
+    print()
+
+
+def test_shared_station():
+    """Test that users near the same station share one fetch"""
+    print("Testing shared observations...")
+
+    metrics.reset()
+    observation_cache.forget()
+    cache_dir = tempfile.mkdtemp()
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        reported = time.time() - 10 * 60
+        return httpx.Response(200, text=json.dumps(make_observation(reported)))
+
+    try:
+        cache_handler = LocalJsonCacheHandler(cache_dir)
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with mock.patch("weather.base.get_https_client", return_value=client):
+            first = Observations({}, STATIONS, cache_handler)
+            second = Observations({}, STATIONS, cache_handler)
+            assert len(requests) == 1
+            assert second.data == first.data and second.is_good
+            assert metrics.get("observation_cache.memory_hit") == 1
+
+            # Another container reads it from the cache handler
+            observation_cache.forget()
+            Observations({}, STATIONS, cache_handler)
+            assert len(requests) == 1
+            assert metrics.get("observation_cache.hit") == 1
+
+            # Not also kept in the response cache
+            assert os.listdir(os.path.join(cache_dir, "response")) == []
+
+            # Expired observations are fetched again
+            observation_cache.forget()
+            entry = cache_handler.get_observation("KMSP")
+            entry["expires"] = int(time.time()) - 2 * 60 * 60
+            cache_handler.put_observation("KMSP", entry, int(time.time()) + 60)
+            Observations({}, STATIONS, cache_handler)
+            assert len(requests) == 2
+    finally:
+        shutil.rmtree(cache_dir)
+        observation_cache.forget()
+
+    print("✓ Observations shared per station")
+    print()
+
+
+class RevalidatingHandler(object):
+    """Fake latest observation endpoint that honors If-None-Match"""
+
+    def __init__(self, reported):
+        self.requests = []
+        self.reported = reported
+        self.etag = '"v1"'
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            text=json.dumps(make_observation(self.reported)),
+            headers={"ETag": self.etag},
+        )
+
+
+def test_revalidation():
+    """Test that expired observations are revalidated or served stale"""
+    print("Testing observation revalidation...")
+
+    metrics.reset()
+    observation_cache.forget()
+    cache_dir = tempfile.mkdtemp()
+    now = int(time.time())
+    handler = RevalidatingHandler(now - 70 * 60)
+
+    try:
+        cache_handler = LocalJsonCacheHandler(cache_dir)
+        cache = ObservationCache(cache_handler)
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with mock.patch("weather.base.get_https_client", return_value=client):
+            first = Observations({}, STATIONS, cache_handler)
+            assert cache_handler.get_observation("KMSP")["etag"] == handler.etag
+
+            # Long expired: the refetch is conditional, and as the station
+            # is late, the 304 renews it only briefly
+            observation_cache.forget()
+            entry = cache_handler.get_observation("KMSP")
+            entry["expires"] = now - 2 * 60 * 60
+            cache.store("KMSP", dict(entry, data=json.loads(entry["body"])))
+            second = Observations({}, STATIONS, cache_handler)
+            assert len(handler.requests) == 2
+            assert handler.requests[1].headers["If-None-Match"] == handler.etag
+            assert second.data == first.data
+            entry = cache_handler.get_observation("KMSP")
+            assert cache.is_fresh(entry) and entry["expires"] <= time.time() + 60
+            assert metrics.get("observation_cache.revalidated") == 1
+
+            # Just expired: served from cache, refreshed in the background
+            handler.etag = '"v2"'
+            handler.reported = now - 5 * 60
+            entry["expires"] = int(time.time()) - 5
+            cache.store("KMSP", dict(entry, data=json.loads(entry["body"])))
+            stale = Observations({}, STATIONS, cache_handler)
+            assert stale.data == first.data
+            assert metrics.get("observation_cache.stale_served") == 1
+
+            deadline = time.time() + 5
+            while (
+                cache_handler.get_observation("KMSP")["etag"] != handler.etag
+                and time.time() < deadline
+            ):
+                time.sleep(0.01)
+            assert len(handler.requests) == 3
+            assert handler.requests[2].headers["If-None-Match"] == '"v1"'
+            fresh = Observations({}, STATIONS, cache_handler)
+            assert fresh.data["timestamp"] == make_observation(handler.reported)["timestamp"]
+            assert len(handler.requests) == 3
+    finally:
+        shutil.rmtree(cache_dir)
+        observation_cache.forget()
+
+    print("✓ Observations revalidated")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Running Observation Cache Tests")
+    print("=" * 60)
+    print()
+
+    test_expiry()
+    test_shared_station()
+    test_revalidation()
+
+    print("=" * 60)
+    print("✅ ALL OBSERVATION CACHE TESTS PASSED")
+    print("=" * 60)
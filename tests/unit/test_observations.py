@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Unit tests for current observations from the nearest stations.
+Uses an httpx mock transport so no network access is required.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+# Set required environment variables before importing
+os.environ["app_id"] = "amzn1.ask.skill.test"
+os.environ["here_api_key"] = "test"
+os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import httpx  # noqa: E402
+
+from lambda_function import Skill  # noqa: E402
+from utils import metrics  # noqa: E402
+from utils.config import Config  # noqa: E402
+from weather.observations import FIELDS, GROUPS, Observations  # noqa: E402
+
+
+def make_stations(*ids):
+    """Observation stations collection, nearest first"""
+    return {"@graph": [
+        {"stationIdentifier": stationId, "name": "%s, MN" % stationId} for stationId in ids
+    ]}
+
+
+def make_observation(age=timedelta(minutes=20), temperature=5.0, **values):
+    """Latest observation reported the given time ago, missing most fields"""
+    data = {
+        "timestamp": (datetime.now(timezone.utc) - age).isoformat(),
+        "textDescription": "Cloudy",
+        "temperature": {"unitCode": "wmoUnit:degC", "value": temperature},
+    }
+    for field, value in values.items():
+        data[field] = {"value": value}
+    return data
+
+
+def make_complete(**values):
+    """Latest observation with every spoken field and a wind chill"""
+    fields = {field: 1.0 for field in FIELDS if field not in ("textDescription", "temperature")}
+    fields["windChill"] = 1.0
+    fields.update(values)
+    return make_observation(**fields)
+
+
+class LatestHandler(object):
+    """Fake api.weather.gov latest observation endpoint"""
+
+    def __init__(self, observations, delays=None):
+        self.observations = observations
+        self.delays = delays or {}
+        self.requested = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        stationId = request.url.path.split("/")[2]
+        with self.lock:
+            self.requested.append(stationId)
+        time.sleep(self.delays.get(stationId, 0))
+        if stationId not in self.observations:
+            return httpx.Response(500, text="")
+        return httpx.Response(200, text=json.dumps(self.observations[stationId]))
+
+
+def probe(handler, stations):
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with mock.patch("weather.base.get_https_client", return_value=client):
+        return Observations({}, stations, None)
+
+
+def test_nearest_usable():
+    """Test that the nearest station with a recent, complete report wins"""
+    print("Testing station probing...")
+
+    metrics.reset()
+    handler = LatestHandler({
+        "KSTALE": make_observation(age=timedelta(hours=5)),
+        "KNULL": make_observation(temperature=None),
+        "KMSP": make_observation(),
+        "KSTP": make_observation(),
+    })
+    with mock.patch("weather.base.notify"):
+        obs = probe(handler, make_stations("KDOWN", "KNULL", "KMSP", "KSTP"))
+        assert obs.is_good
+        assert obs.station == {"id": "KMSP", "name": "MN"}
+        assert obs.temp == "41"
+        assert metrics.get("observations.fallback") == 1
+
+        # Only the nearest few are asked
+        with mock.patch.object(Config, "OBSERVATION_PROBE_STATIONS", 2):
+            handler.requested = []
+            obs = probe(handler, make_stations("KSTALE", "KNULL", "KMSP"))
+            assert not obs.is_good
+            assert sorted(handler.requested) == ["KNULL", "KSTALE"]
+
+    print("✓ Nearest usable station wins")
+    print()
+
+
+def test_slow_station():
+    """Test that a slow nearest station doesn't hold up the answer"""
+    print("Testing slow station...")
+
+    metrics.reset()
+    handler = LatestHandler(
+        {"KSLOW": make_observation(), "KMSP": make_observation()},
+        delays={"KSLOW": 1.0},
+    )
+    with mock.patch.object(Config, "OBSERVATION_PROBE_TIMEOUT", 0.2):
+        start = time.monotonic()
+        obs = probe(handler, make_stations("KSLOW", "KMSP"))
+        assert time.monotonic() - start < 0.8
+    assert obs.is_good and obs.station["id"] == "KMSP"
+    assert metrics.get("observations.probe_timeout") == 1
+
+    # A complete report from the nearest station doesn't wait for the others,
+    # though it has no heat index
+    handler = LatestHandler(
+        {"KMSP": make_complete(), "KSLOW": make_complete(heatIndex=30.0)},
+        delays={"KSLOW": 1.0},
+    )
+    start = time.monotonic()
+    obs = probe(handler, make_stations("KMSP", "KSLOW"))
+    assert time.monotonic() - start < 0.8
+    assert obs.station["id"] == "KMSP" and obs.heat_index is None
+
+    # When every station is slow, the first usable report is still taken
+    metrics.reset()
+    handler = LatestHandler(
+        {"KSLOW": make_observation(), "KMSP": make_observation()},
+        delays={"KSLOW": 0.6, "KMSP": 0.3},
+    )
+    with mock.patch.object(Config, "OBSERVATION_PROBE_TIMEOUT", 0.1):
+        start = time.monotonic()
+        obs = probe(handler, make_stations("KSLOW", "KMSP"))
+        assert time.monotonic() - start < 0.55
+    assert obs.is_good and obs.station["id"] == "KMSP"
+    assert metrics.get("observations.late") == 1
+
+    print("✓ Slow stations are passed over")
+    print()
+
+
+def test_composite():
+    """Test that missing fields come from the nearest station that has them"""
+    print("Testing composite observations...")
+
+    metrics.reset()
+    handler = LatestHandler({
+        "KNOTEMP": make_observation(temperature=None, barometricPressure=101000),
+        "KMSP": make_observation(windSpeed=10, windGust=None),
+        "KSTP": make_complete(windGust=30, barometricPressure=99000),
+        "KOLD": make_complete(age=timedelta(hours=5)),
+    })
+    with mock.patch.object(Config, "OBSERVATION_PROBE_STATIONS", 4):
+        obs = probe(handler, make_stations("KNOTEMP", "KMSP", "KSTP", "KOLD"))
+    assert obs.station["id"] == "KMSP"
+    assert obs.temp == "41" and obs.wind_speed == "6"
+    assert obs.data["barometricPressure"]["value"] == 101000
+    assert obs.source("barometricPressure") == "KNOTEMP"
+    assert obs.source("dewpoint") == "KSTP"
+    assert obs.source("temperature") == "KMSP"
+    assert obs.missing == []
+    assert metrics.get("observations.filled_fields") == 3
+
+    # Wind comes from a single station, so KMSP's calm gust isn't replaced
+    assert obs.wind_gust is None and obs.source("windGust") == "KMSP"
+
+    # Wind chill goes with the station's own temperature and wind
+    assert obs.wind_chill is None and "windChill" not in obs.data
+
+    # Wind missing from the nearest station is taken whole from another
+    handler = LatestHandler({
+        "KMSP": make_observation(windDirection=90),
+        "KSTP": make_complete(windSpeed=20, windDirection=270, windGust=None),
+    })
+    obs = probe(handler, make_stations("KMSP", "KSTP"))
+    assert obs.wind_speed == "12" and obs.wind_direction == "west"
+    assert obs.wind_gust is None
+    assert {obs.source(field) for field in GROUPS["windSpeed"]} == {"KSTP"}
+    assert obs.reported_by("windSpeed") == "MN"
+    assert obs.reported_by("temperature") is None
+
+    # Fields nobody reports stay missing
+    handler = LatestHandler({"KMSP": make_observation()})
+    obs = probe(handler, make_stations("KMSP"))
+    assert obs.is_good and obs.source("windGust") is None
+    assert obs.data.get("windGust") is None and "windGust" in obs.missing
+
+    print("✓ Observations filled from nearby stations")
+    print()
+
+
+def test_spoken_sources():
+    """Test that filled fields are credited to the station they came from"""
+    print("Testing spoken observation sources...")
+
+    handler = LatestHandler({
+        "KMSP": make_observation(),
+        "KSTP": make_complete(dewpoint=0.0),
+    })
+    skill = object.__new__(Skill)
+    skill.event = {}
+    skill.cache_handler = None
+    skill.normalize = lambda text: text
+    skill.loc = SimpleNamespace(
+        tz=timezone.utc, observationStations=make_stations("KMSP", "KSTP")
+    )
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with mock.patch("weather.base.get_https_client", return_value=client):
+        text = skill.get_current(["temperature", "dewpoint"])
+    assert "the temperature is 41 degrees. " in text.lower(), text
+    assert "the dewpoint is 32 degrees, as reported by mn. " in text.lower(), text
+
+    print("✓ Filled fields credited to their station")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Running Observations Tests")
+    print("=" * 60)
+    print()
+
+    test_nearest_usable()
+    test_slow_station()
+    test_composite()
+    test_spoken_sources()
+
+    print("=" * 60)
+    print("✅ ALL OBSERVATIONS TESTS PASSED")
+    print("=" * 60)
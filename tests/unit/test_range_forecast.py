@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Unit tests for multi-day range forecasts.
+Covers parsing "this weekend" and "the next N days" and the spoken text.
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from dateutil import tz
+
+# Set required environment variables before importing
+os.environ["app_id"] = "amzn1.ask.skill.test"
+os.environ["here_api_key"] = "test"
+os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from lambda_function import Skill  # noqa: E402
+from weather.grid_points import GridPoints  # noqa: E402
+
+CHICAGO = tz.gettz("America/Chicago")
+
+# Monday, January 1st 2024
+MONDAY = datetime(2024, 1, 1, 9, tzinfo=CHICAGO)
+
+
+def make_skill(when, now):
+    """Skill with just enough state to parse a when slot at a given time"""
+    skill = object.__new__(Skill)
+    skill.event = {}
+    skill.cache_handler = None
+    skill.days = None
+    skill.slots = SimpleNamespace(
+        when_abs=None, when_any=when, when_pos=None, day=None, month=None
+    )
+    skill.loc = SimpleNamespace(
+        tz=CHICAGO, city="minneapolis", cwa="MPX", grid_point="107,71"
+    )
+    with mock.patch("lambda_function.datetime") as clock:
+        clock.now.side_effect = lambda tz=None: now.astimezone(tz)
+        skill.get_when()
+    return skill
+
+
+def make_data(start, days):
+    """Gridpoint data with a daily temperature cycle starting at start"""
+    values = []
+    for hour in range(0, days * 24, 6):
+        when = start + timedelta(hours=hour)
+        values.append({
+            "validTime": "%s/PT6H" % when.isoformat(),
+            "value": 10.0 if when.hour in (12, 18) else 0.0,
+        })
+    return {
+        "validTimes": "%s/P%dD" % (start.isoformat(), days),
+        "temperature": {"values": values},
+    }
+
+
+def serve(data):
+    """Patch GridPoints to build its grid from data instead of fetching it"""
+    return mock.patch.object(
+        GridPoints, "https", side_effect=lambda *args, build, **kwargs: build(data)
+    )
+
+
+def test_weekend():
+    """Test that "this weekend" covers the coming Saturday and Sunday"""
+    print("Testing weekend ranges...")
+
+    for offset in range(7):
+        now = MONDAY + timedelta(days=offset)
+        skill = make_skill("this weekend", now)
+        assert skill.sname == "this weekend"
+        assert skill.days[-1][1] == datetime(2024, 1, 8, 6, tzinfo=CHICAGO)
+        if offset < 5:
+            assert skill.days[0] == (
+                datetime(2024, 1, 6, 6, tzinfo=CHICAGO),
+                datetime(2024, 1, 7, 6, tzinfo=CHICAGO),
+            )
+            assert len(skill.days) == 2 and skill.quarters == 8
+        else:
+            # Asked at 9am on the weekend, so it starts with the current quarter
+            assert skill.stime == now.replace(hour=6)
+            assert len(skill.days) == 7 - offset
+
+    for when in ("weekend", "the weekend", "over the weekend", "for the weekend"):
+        assert make_skill(when, MONDAY).days[0][0].weekday() == 5
+
+    print("✓ Weekend ranges parsed")
+    print()
+
+
+def test_next_days():
+    """Test "the next N days" with word and digit slot values"""
+    print("Testing next N days ranges...")
+
+    for when, count, sname in [
+        ("next 3 days", 3, "the next 3 days"),
+        ("the next three days", 3, "the next 3 days"),
+        ("over the next 5 days", 5, "the next 5 days"),
+        ("for the next two days", 2, "the next 2 days"),
+        ("the next few days", 3, "the next few days"),
+        ("the next 10 days", 7, "the next 7 days"),
+        ("next ten days", 7, "the next 7 days"),
+        ("the next couple days", 3, "the next few days"),
+        ("over the next several days", 3, "the next few days"),
+    ]:
+        skill = make_skill(when, MONDAY)
+        assert skill.sname == sname, when
+        assert len(skill.days) == count, when
+        assert skill.days[0][0] == MONDAY.replace(hour=6)
+        for start, end in skill.days:
+            assert end == start + timedelta(days=1)
+
+    # Late in the day, the range starts with the current quarter
+    skill = make_skill("next 2 days", MONDAY.replace(hour=20))
+    assert skill.days[0] == (
+        MONDAY.replace(hour=18),
+        datetime(2024, 1, 2, 6, tzinfo=CHICAGO),
+    )
+    assert skill.quarters == 6
+
+    # Other phrases aren't ranges
+    assert make_skill("tomorrow", MONDAY).days is None
+
+    print("✓ Next N days ranges parsed")
+    print()
+
+
+def test_range_text():
+    """Test the spoken text for each day of a range"""
+    print("Testing range forecast text...")
+
+    data = make_data(MONDAY.replace(hour=0), 4)
+    with serve(data):
+        skill = make_skill("the next 2 days", MONDAY)
+        text = skill.get_forecast(["temperature"])
+        assert text == (
+            "the next 2 days in minneapolis. "
+            "monday, the high temperature will be 50 degrees and the low 32. "
+            "tuesday, the high temperature will be 50 degrees and the low 32. "
+        ), text
+
+        skill = make_skill("the next 2 days", MONDAY.replace(hour=20))
+        text = skill.get_forecast(["temperature"])
+        assert text.startswith(
+            "the next 2 days in minneapolis. "
+            "tonight, the low temperature will be 32 degrees. "
+            "tuesday, "
+        ), text
+
+        # Days past the end of the data are left out
+        skill = make_skill("the next 7 days", MONDAY)
+        text = skill.get_forecast(["temperature"])
+        assert "thursday" in text and "friday" not in text
+
+    skill = make_skill("this weekend", MONDAY)
+    with serve(data):
+        text = skill.get_forecast(["temperature"])
+    assert text == "Forecast information is unavailable for this weekend in minneapolis"
+
+    print("✓ Range forecasts spoken")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Running Range Forecast Tests")
+    print("=" * 60)
+    print()
+
+    test_weekend()
+    test_next_days()
+    test_range_text()
+
+    print("=" * 60)
+    print("✅ ALL RANGE FORECAST TESTS PASSED")
+    print("=" * 60)
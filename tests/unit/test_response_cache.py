@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the NWS response cache.
+Uses the local JSON cache handler and an httpx mock transport.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest import mock
+
+# Set required environment variables before importing
+os.environ["app_id"] = "amzn1.ask.skill.test"
+os.environ["here_api_key"] = "test"
+os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import httpx  # noqa: E402
+
+from storage.local_handlers import LocalJsonCacheHandler  # noqa: E402
+from storage.response_cache import (  # noqa: E402
+    ResponseCache,
+    endpoint_class,
+    normalize_url,
+)
+from weather.base import WeatherBase  # noqa: E402
+
+GRIDPOINT = {"updateTime": "2024-01-01T00:00:00+00:00", "temperature": {}}
+
+
+class CountingHandler(object):
+    """Fake api.weather.gov that counts requests per path"""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        return httpx.Response(200, text=json.dumps(GRIDPOINT))
+
+
+class RevalidatingHandler(object):
+    """Fake api.weather.gov that honors If-None-Match/If-Modified-Since"""
+
+    ETAG = '"abc123"'
+    LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if (
+            request.headers.get("If-None-Match") == self.ETAG
+            and request.headers.get("If-Modified-Since") == self.LAST_MODIFIED
+        ):
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            text=json.dumps(GRIDPOINT),
+            headers={"ETag": self.ETAG, "Last-Modified": self.LAST_MODIFIED},
+        )
+
+
+def test_endpoint_classes():
+    """Test URL normalization and endpoint classification"""
+    print("Testing endpoint classes...")
+
+    assert (
+        normalize_url("HTTPS://API.Weather.gov/stations/KMSP/observations/?limit=10&a=1")
+        == "https://api.weather.gov/stations/KMSP/observations?a=1&limit=10"
+    )
+    base = "https://api.weather.gov/"
+    assert endpoint_class(base + "gridpoints/MPX/107,71") == "gridpoint"
+    assert endpoint_class(base + "gridpoints/MPX/107,71/forecast") == "forecast"
+    assert endpoint_class(base + "alerts/active/zone/MNC053") == "alerts"
+    assert endpoint_class(base + "products/types/AFD/locations/MPX") == "product_list"
+    assert endpoint_class(base + "products/abc-123") == "product"
+    assert endpoint_class(base + "stations/KMSP/observations?limit=10") == "observations"
+    assert endpoint_class(base + "points/44.98,-93.27") is None
+
+    print("✓ Endpoint classes recognized")
+    print()
+
+
+def test_response_cache():
+    """Test that WeatherBase.https serves repeated requests from the cache"""
+    print("Testing response cache...")
+
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cache_handler = LocalJsonCacheHandler(cache_dir)
+        handler = CountingHandler()
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with mock.patch("weather.base.get_https_client", return_value=client):
+            base = WeatherBase({}, cache_handler)
+            assert base.https("gridpoints/MPX/107,71/forecast") == GRIDPOINT
+            assert base.https("gridpoints/MPX/107,71/forecast/") == GRIDPOINT
+            assert len(handler.requests) == 1
+
+            # Uncached endpoint classes always go to the network
+            base.https("points/44.98,-93.27")
+            base.https("points/44.98,-93.27")
+            assert len(handler.requests) == 3
+
+            # Expired entries are refetched
+            url = "https://api.weather.gov/gridpoints/MPX/107,71/forecast"
+            entry = cache_handler.get_response(url)
+            entry["expires"] = 1
+            cache_handler.put_response(url, entry)
+            assert base.https("gridpoints/MPX/107,71/forecast") == GRIDPOINT
+            assert len(handler.requests) == 4
+
+            # Immutable entries never expire
+            base.https("products/abc-123")
+            base.https("products/abc-123")
+            assert len(handler.requests) == 5
+            entry = cache_handler.get_response("https://api.weather.gov/products/abc-123")
+            assert entry["expires"] == 0
+            assert ResponseCache(cache_handler).is_fresh(entry)
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print("✓ Responses cached per endpoint class")
+    print()
+
+
+def test_revalidation():
+    """Test that expired entries are revalidated with conditional requests"""
+    print("Testing conditional revalidation...")
+
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cache_handler = LocalJsonCacheHandler(cache_dir)
+        handler = RevalidatingHandler()
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        url = "https://api.weather.gov/gridpoints/MPX/107,71/forecast"
+        with mock.patch("weather.base.get_https_client", return_value=client):
+            base = WeatherBase({}, cache_handler)
+            assert base.https("gridpoints/MPX/107,71/forecast") == GRIDPOINT
+            assert "If-None-Match" not in handler.requests[0].headers
+            assert cache_handler.get_response(url)["etag"] == handler.ETAG
+
+            # Expire the entry; the refetch must be conditional and get a 304
+            entry = cache_handler.get_response(url)
+            entry["expires"] = 1
+            cache_handler.put_response(url, entry)
+            assert base.https("gridpoints/MPX/107,71/forecast") == GRIDPOINT
+            assert len(handler.requests) == 2
+            assert handler.requests[1].headers["If-None-Match"] == handler.ETAG
+
+            # The 304 renewed the entry, so it is served from cache again
+            assert ResponseCache(cache_handler).is_fresh(cache_handler.get_response(url))
+            assert base.https("gridpoints/MPX/107,71/forecast") == GRIDPOINT
+            assert len(handler.requests) == 2
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print("✓ 304 responses served from the stored body")
+    print()
+
+
+def test_stale_while_revalidate():
+    """Test that recently expired entries are served while refreshing"""
+    print("Testing stale-while-revalidate...")
+
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cache_handler = LocalJsonCacheHandler(cache_dir)
+        handler = CountingHandler()
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        url = "https://api.weather.gov/gridpoints/MPX/107,71/forecast"
+        with mock.patch("weather.base.get_https_client", return_value=client):
+            base = WeatherBase({}, cache_handler)
+            base.https("gridpoints/MPX/107,71/forecast")
+
+            # Just expired: served from cache, refreshed in the background
+            stale = cache_handler.get_response(url)
+            stale["expires"] = int(time.time()) - 5
+            stale["body"] = json.dumps({"stale": True})
+            cache_handler.put_response(url, stale)
+            assert base.https("gridpoints/MPX/107,71/forecast") == {"stale": True}
+
+            deadline = time.time() + 5
+            while (
+                cache_handler.get_response(url)["body"] == stale["body"]
+                and time.time() < deadline
+            ):
+                time.sleep(0.01)
+            assert base.https("gridpoints/MPX/107,71/forecast") == GRIDPOINT
+            assert len(handler.requests) == 2
+
+            # Long expired: beyond the grace window, so fetched inline
+            stale["expires"] = 1
+            cache_handler.put_response(url, stale)
+            assert base.https("gridpoints/MPX/107,71/forecast") == GRIDPOINT
+            assert len(handler.requests) == 3
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print("✓ Stale entries served within the grace window")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Running Response Cache Tests")
+    print("=" * 60)
+    print()
+
+    test_endpoint_classes()
+    test_response_cache()
+    test_revalidation()
+    test_stale_while_revalidate()
+
+    print("=" * 60)
+    print("✅ ALL RESPONSE CACHE TESTS PASSED")
+    print("=" * 60)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Unit tests for single-flight request coalescing.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from utils import metrics  # noqa: E402
+from utils.singleflight import SingleFlight  # noqa: E402
+
+
+def test_sync_coalescing():
+    """Test that concurrent threads share a single call"""
+    print("Testing sync coalescing...")
+
+    metrics.reset()
+    group = SingleFlight("test_sf")
+    release = threading.Event()
+    calls = []
+
+    def fetch(url):
+        calls.append(url)
+        release.wait(timeout=5)
+        return {"url": url}
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [executor.submit(group.do, "k", fetch, "u") for _ in range(5)]
+        # Let all callers join before the leader finishes
+        deadline = time.time() + 5
+        while metrics.get("test_sf.coalesced") < 4 and time.time() < deadline:
+            time.sleep(0.001)
+        release.set()
+        results = [future.result(timeout=5) for future in futures]
+
+    assert calls == ["u"]
+    assert all(result is results[0] for result in results)
+    assert metrics.get("test_sf.leader") == 1
+
+    # Once finished, the next call runs again
+    group.do("k", fetch, "u")
+    assert len(calls) == 2
+
+    print("✓ Concurrent calls coalesced")
+    print()
+
+
+def test_sync_exception():
+    """Test that a failure is raised to every waiting caller"""
+    print("Testing sync exception sharing...")
+
+    group = SingleFlight("test_sf")
+
+    def fail():
+        raise ValueError("boom")
+
+    try:
+        group.do("k", fail)
+        assert False, "exception not raised"
+    except ValueError:
+        pass
+
+    print("✓ Exceptions propagated")
+    print()
+
+
+def test_async_coalescing():
+    """Test that concurrent coroutines share a single call"""
+    print("Testing async coalescing...")
+
+    metrics.reset()
+    group = SingleFlight("test_sf")
+    calls = []
+
+    async def fetch(url):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return {"url": url}
+
+    async def run():
+        return await asyncio.gather(*[group.do_async("k", fetch, "u") for _ in range(5)])
+
+    results = asyncio.run(run())
+    assert calls == ["u"]
+    assert all(result is results[0] for result in results)
+    assert metrics.get("test_sf.coalesced") == 4
+
+    print("✓ Concurrent coroutines coalesced")
+    print()
+
+
+def test_background_dedup():
+    """Test that background calls for the same key are deduplicated"""
+    print("Testing background deduplication...")
+
+    group = SingleFlight("test_sf")
+    release = threading.Event()
+
+    def refresh():
+        release.wait(timeout=5)
+        return "refreshed"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        future = group.do_background(executor, "k", refresh)
+        assert group.do_background(executor, "k", refresh) is None
+        release.set()
+        assert future.result(timeout=5) == "refreshed"
+
+        # Finished, so a new refresh may start
+        assert group.do_background(executor, "k", refresh).result(timeout=5)
+
+    print("✓ Background calls deduplicated")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Running Single-Flight Tests")
+    print("=" * 60)
+    print()
+
+    test_sync_coalescing()
+    test_sync_exception()
+    test_async_coalescing()
+    test_background_dedup()
+
+    print("=" * 60)
+    print("✅ ALL SINGLE-FLIGHT TESTS PASSED")
+    print("=" * 60)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Unit tests for WeatherBase NWS API communication.
+Uses httpx mock transports so no network access is required.
+"""
+import asyncio
+import json
+import os
+import sys
+from unittest import mock
+
+# Set required environment variables before importing
+os.environ["app_id"] = "amzn1.ask.skill.test"
+os.environ["here_api_key"] = "test"
+os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import httpx  # noqa: E402
+
+from weather.base import WeatherBase  # noqa: E402
+
+ZONE = {"id": "MNZ060", "type": "public", "name": "Hennepin"}
+STATION = {"stationIdentifier": "KMSP", "name": "Minneapolis, MN"}
+PRODUCTS = {"@graph": [{"id": "abc-123"}]}
+PRODUCT = {"productText": "AREA FORECAST DISCUSSION"}
+
+
+def nws_handler(request):
+    """Fake api.weather.gov responses keyed by path"""
+    path = request.url.path
+    assert request.headers["Accept"] == "application/ld+json"
+    assert request.headers["User-Agent"].startswith("ClimacastAlexaSkill")
+    if path == "/zones/forecast/MNZ060":
+        return httpx.Response(200, text=json.dumps(ZONE))
+    if path == "/stations/KMSP":
+        return httpx.Response(200, text=json.dumps(STATION))
+    if path == "/gridpoints/44.9,-93.2/stations":
+        return httpx.Response(200, text=json.dumps({"observationStations": [
+            "https://api.weather.gov/stations/KMSP",
+            "https://api.weather.gov/stations/KSTP",
+        ]}))
+    if path == "/products/types/AFD/locations/MPX":
+        return httpx.Response(200, text=json.dumps(PRODUCTS))
+    if path == "/products/abc-123":
+        return httpx.Response(200, text=json.dumps(PRODUCT))
+    return httpx.Response(404, text="")
+
+
+def make_base():
+    base = WeatherBase({}, None)
+    base.loc = {"cwa": "MPX"}
+    return base
+
+
+def test_sync_https():
+    """Test that the sync client parses JSON and returns None on errors"""
+    print("Testing WeatherBase.https...")
+
+    client = httpx.Client(transport=httpx.MockTransport(nws_handler))
+    with mock.patch("weather.base.get_https_client", return_value=client):
+        base = make_base()
+        assert base.https("zones/forecast/MNZ060") == ZONE
+        assert base.https("does/not/exist") is None
+        assert base.get_zone("MNZ060", "forecast") == ZONE
+
+    print("✓ https returns parsed JSON or None")
+    print()
+
+
+def test_async_https():
+    """Test that the async helpers honor the same contract as the sync ones"""
+    print("Testing WeatherBase async helpers...")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(nws_handler))
+
+    async def run():
+        base = make_base()
+        return await asyncio.gather(
+            base.get_zone_async("https://api.weather.gov/zones/forecast/MNZ060", "forecast"),
+            base.get_station_async("KMSP"),
+            base.get_stations_async("44.9,-93.2"),
+            base.get_product_async("AFD"),
+            base.https_async("does/not/exist"),
+        )
+
+    with mock.patch("weather.base.get_async_https_client", return_value=client):
+        zone, station, stations, product, missing = asyncio.run(run())
+
+    assert zone == ZONE
+    assert station == {"id": "KMSP", "name": "MN"}
+    assert stations == ["KMSP", "KSTP"]
+    assert product == "AREA FORECAST DISCUSSION"
+    assert missing is None
+
+    print("✓ async helpers can be gathered")
+    print()
+
+
+def test_async_client_per_loop():
+    """Test that each event loop gets its own async client"""
+    print("Testing get_async_https_client...")
+
+    from utils.factories import get_async_https_client
+
+    async def get_client():
+        first = get_async_https_client()
+        assert get_async_https_client() is first
+        return first
+
+    first = asyncio.run(get_client())
+    assert first is not asyncio.run(get_client())
+
+    # Closed when their loop shuts down
+    assert first.is_closed
+
+    print("✓ async clients are bound to their event loop")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Running WeatherBase Tests")
+    print("=" * 60)
+    print()
+
+    test_sync_https()
+    test_async_https()
+    test_async_client_per_loop()
+
+    print("=" * 60)
+    print("✅ ALL WEATHERBASE TESTS PASSED")
+    print("=" * 60)
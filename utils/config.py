@@ -9,7 +9,7 @@
 
 import logging
 import os
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -57,11 +57,108 @@ class Config:
     # Cache settings
     DEFAULT_CACHE_TTL_DAYS: int = 35
 
+    # NWS response cache freshness in seconds by endpoint class (0 = immutable).
+    # Endpoint classes not listed here are never cached.  Gridpoint data is
+    # cached per grid cell by GridCache, and observations per station by
+    # ObservationCache, instead.
+    RESPONSE_CACHE_TTLS: Dict[str, int] = {
+        "forecast": int(os.environ.get("RESPONSE_TTL_FORECAST", "3600")),
+        "alerts": int(os.environ.get("RESPONSE_TTL_ALERTS", "60")),
+        "product_list": int(os.environ.get("RESPONSE_TTL_PRODUCT_LIST", "600")),
+        "product": 0,
+    }
+    RESPONSE_CACHE_RETAIN_DAYS: int = 1
+
+    # Seconds past expiry during which a stale response is served while it
+    # is refreshed in the background, by endpoint class (0 = never stale).
+    # The gridpoint and observations graces apply to GridCache and
+    # ObservationCache.
+    RESPONSE_CACHE_STALE_GRACE: Dict[str, int] = {
+        "forecast": int(os.environ.get("RESPONSE_GRACE_FORECAST", "1800")),
+        "gridpoint": int(os.environ.get("RESPONSE_GRACE_GRIDPOINT", "1800")),
+        "alerts": int(os.environ.get("RESPONSE_GRACE_ALERTS", "60")),
+        "product_list": int(os.environ.get("RESPONSE_GRACE_PRODUCT_LIST", "300")),
+        "observations": int(os.environ.get("RESPONSE_GRACE_OBSERVATIONS", "600")),
+    }
+
+    # Expiry bounds in seconds (minimum, maximum or None) by cache prefix,
+    # applied to lifetimes derived from Cache-Control/Expires/updateTime
+    CACHE_EXPIRY_BOUNDS: Dict[str, Tuple[int, Optional[int]]] = {
+        "response#": (30, 24 * 60 * 60),
+        "gridpoint#": (5 * 60, 6 * 60 * 60),
+        "observation#": (60, 2 * 60 * 60),
+    }
+
+    # Approximate interval between NWS gridpoint updates
+    GRIDPOINT_UPDATE_SECONDS: int = 60 * 60
+    # Expired grid cells are kept this long so they can be revalidated
+    GRIDPOINT_CACHE_RETAIN_DAYS: int = 1
+
+    # Current conditions: how many of the nearest stations to ask at once,
+    # how long to wait for each, and the oldest report worth speaking
+    OBSERVATION_PROBE_STATIONS: int = int(
+        os.environ.get("OBSERVATION_PROBE_STATIONS", "3")
+    )
+    OBSERVATION_PROBE_TIMEOUT: float = float(
+        os.environ.get("OBSERVATION_PROBE_TIMEOUT", "1.5")
+    )
+    OBSERVATION_MAX_AGE_SECONDS: int = int(
+        os.environ.get("OBSERVATION_MAX_AGE_SECONDS", str(2 * 60 * 60))
+    )
+
+    # Usual interval between a station's reports, until its own is seen, and
+    # how long after its timestamp a report shows up in the API
+    OBSERVATION_REPORT_SECONDS: int = 60 * 60
+    OBSERVATION_REPORT_DELAY_SECONDS: int = 5 * 60
+    # Expired observations are kept this long so they can be revalidated and
+    # the report interval can be learned from consecutive reports
+    OBSERVATION_CACHE_RETAIN_DAYS: int = 1
+    # Observations kept in memory by a warm container
+    OBSERVATION_MEMORY_ENTRIES: int = 256
+
     # HTTP retry settings
     HTTP_RETRY_TOTAL: int = 3
     HTTP_RETRY_STATUS_CODES: List[int] = [429, 500, 502, 503, 504]
     HTTP_TIMEOUT: int = 30
 
+    # HTTP connection pool sizing, shared by NWS and geocoding requests
+    HTTP_MAX_CONNECTIONS: int = int(os.environ.get("HTTP_MAX_CONNECTIONS", "20"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(
+        os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10")
+    )
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", "60"))
+
+    # Parse large NWS responses as they stream in, keeping only the members
+    # the caller asked for, instead of loading the whole body
+    JSON_STREAMING: bool = os.environ.get("JSON_STREAMING", "false").lower() == "true"
+
+    # Hosts to open connections to before the first request
+    WARM_UP_HOSTS: List[str] = [
+        "https://api.weather.gov",
+        "https://geocode.search.hereapi.com",
+    ]
+    WARM_UP_TIMEOUT: float = 2.0
+    # Warm up during Lambda init (on by default when running in Lambda)
+    WARM_UP_ON_INIT: bool = (
+        os.environ.get(
+            "WARM_UP_ON_INIT",
+            "true" if os.environ.get("AWS_LAMBDA_FUNCTION_NAME") else "false",
+        ).lower()
+        == "true"
+    )
+
+    # Per-request time budget; Alexa waits about 8 seconds for a response
+    REQUEST_BUDGET_SECONDS: float = float(os.environ.get("REQUEST_BUDGET_SECONDS", "7"))
+    # Time held back from the Lambda's remaining time to build the response
+    REQUEST_BUDGET_RESERVE_SECONDS: float = 0.5
+
+    # DynamoDB client timeouts in seconds
+    DYNAMODB_CONNECT_TIMEOUT: float = 1.0
+    DYNAMODB_READ_TIMEOUT: float = 2.0
+
+    # Worker threads shared by concurrent I/O (e.g. Location.set)
+    THREAD_POOL_WORKERS: int = int(os.environ.get("THREAD_POOL_WORKERS", "8"))
+
     @classmethod
     def validate(cls) -> None:
         """
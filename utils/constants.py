@@ -30,6 +30,23 @@ QUARTERS = ["morning", "afternoon", "evening", "overnight", "tonight", "night"]
 # Day names
 DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
 
+# Multi-day ranges like "this weekend" or "the next three days"
+RANGE_WHEN = r"^(?:(?:for|over|this)\s+)?(?:the\s+)?(?:weekend|next (\w+) days)$"
+
+# Number of days in "the next ... days"; NWS forecasts cover about a week
+RANGE_DAYS = {
+    "few": 3,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+}
+
 # Translation from ordinal numbers to words
 MONTH_DAYS_XLATE = {
     "1st": "first",
@@ -119,6 +136,16 @@ MONTH_NAMES = [
     "december",
 ]
 
+# Observation member behind each current conditions metric, for naming the
+# station it came from
+OBSERVATION_FIELDS = {
+    "wind": "windSpeed",
+    "temperature": "temperature",
+    "dewpoint": "dewpoint",
+    "barometric pressure": "barometricPressure",
+    "relative humidity": "relativeHumidity",
+}
+
 # Weather metrics mapping
 # Format: {"user_term": ["canonical_name", priority]}
 METRICS = {
@@ -157,6 +184,30 @@ METRICS = {
     "snow": ["precipitation", 0],
 }
 
+# Numeric gridpoint layers read for each canonical forecast metric
+# ("summary" uses the non-numeric "weather" layer)
+FORECAST_LAYERS = {
+    "temperature": ["temperature", "windChill", "heatIndex"],
+    "precipitation": [
+        "probabilityOfPrecipitation",
+        "quantitativePrecipitation",
+        "snowfallAmount",
+    ],
+    "skys": ["skyCover"],
+    "wind": ["windSpeed", "windDirection", "windGust"],
+    "barometric pressure": ["pressure"],
+    "relative humidity": ["relativeHumidity"],
+    "dewpoint": ["dewpoint"],
+}
+
+# Gridpoint layers kept when caching a grid cell
+GRIDPOINT_LAYERS = list(
+    dict.fromkeys(
+        [layer for layers in FORECAST_LAYERS.values() for layer in layers]
+        + ["weather"]
+    )
+)
+
 # Wind direction angles
 # Format: ["name", "abbreviation", max_angle]
 ANGLES = [
@@ -0,0 +1,170 @@
+#!/usr/bin/python3
+
+# =============================================================================
+#
+# Copyright 2017 by Leland Lucius
+#
+# Released under the GNU Affero GPL
+# See: https://github.com/lllucius/climacast/blob/master/LICENSE
+#
+# =============================================================================
+
+"""
+Request deadline budget for Clima Cast.
+
+A Deadline is created when a request arrives and made current through a
+context variable, so every HTTP, geocoding and cache call made on behalf
+of the request can size its timeout to the remaining budget.
+"""
+
+import contextvars
+from time import monotonic
+from typing import Any, Callable, Optional
+
+from utils.config import Config
+
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar(
+    "deadline", default=None
+)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request has used up its time budget."""
+
+
+class Deadline(object):
+    """
+    Tracks the time remaining for a single request.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        """
+        Initialize the deadline.
+
+        Args:
+            seconds: Time budget in seconds from now
+        """
+        self.expires = monotonic() + seconds
+
+    @classmethod
+    def for_invocation(cls, context: Optional[Any] = None) -> "Deadline":
+        """
+        Create the deadline for a Lambda invocation.
+
+        The budget is Config.REQUEST_BUDGET_SECONDS, further limited by the
+        Lambda context's remaining time less Config.REQUEST_BUDGET_RESERVE_SECONDS.
+
+        Args:
+            context: Lambda context object, if any
+
+        Returns:
+            Deadline for the invocation
+        """
+        budget = Config.REQUEST_BUDGET_SECONDS
+        if context is not None and hasattr(context, "get_remaining_time_in_millis"):
+            remaining = context.get_remaining_time_in_millis() / 1000.0
+            budget = min(budget, remaining - Config.REQUEST_BUDGET_RESERVE_SECONDS)
+        return cls(budget)
+
+    def remaining(self) -> float:
+        """Seconds left in the budget, never negative."""
+        return max(0.0, self.expires - monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """True once the budget is used up."""
+        return monotonic() >= self.expires
+
+    def timeout(self, limit: Optional[float] = None) -> float:
+        """
+        Return the timeout to use for a call.
+
+        Args:
+            limit: Upper bound for the call's timeout, if any
+
+        Returns:
+            Remaining budget, capped at limit
+        """
+        remaining = self.remaining()
+        return remaining if limit is None else min(remaining, limit)
+
+    def check(self) -> None:
+        """
+        Raise DeadlineExceeded if the budget is used up.
+
+        Raises:
+            DeadlineExceeded: If the deadline has passed
+        """
+        if self.expired:
+            raise DeadlineExceeded("Request deadline exceeded")
+
+
+def get_deadline() -> Optional[Deadline]:
+    """Return the deadline for the current request, if any."""
+    return _current_deadline.get()
+
+
+def set_deadline(deadline: Optional[Deadline]) -> contextvars.Token:
+    """
+    Make the given deadline current.
+
+    Args:
+        deadline: Deadline to use, or None for no deadline
+
+    Returns:
+        Token to pass to reset_deadline()
+    """
+    return _current_deadline.set(deadline)
+
+
+def reset_deadline(token: contextvars.Token) -> None:
+    """
+    Restore the deadline that was current before set_deadline().
+
+    Args:
+        token: Token returned by set_deadline()
+    """
+    _current_deadline.reset(token)
+
+
+def get_timeout(limit: float) -> float:
+    """
+    Return the timeout for a call made on behalf of the current request.
+
+    Args:
+        limit: Timeout to use when there is no deadline
+
+    Returns:
+        Remaining budget capped at limit, or limit if there's no deadline
+    """
+    deadline = get_deadline()
+    return limit if deadline is None else deadline.timeout(limit)
+
+
+def is_expired() -> bool:
+    """Return True if the current request has used up its budget."""
+    deadline = get_deadline()
+    return deadline is not None and deadline.expired
+
+
+def detached(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a function so it runs without the current request's deadline.
+
+    Used for background work that may outlive the request.
+
+    Args:
+        fn: Function to wrap
+
+    Returns:
+        Wrapped function
+    """
+
+    def run(*args: Any, **kwargs: Any) -> Any:
+        token = set_deadline(None)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            reset_deadline(token)
+
+    return run
@@ -0,0 +1,197 @@
+#!/usr/bin/python3
+
+# =============================================================================
+#
+# Copyright 2017 by Leland Lucius
+#
+# Released under the GNU Affero GPL
+# See: https://github.com/lllucius/climacast/blob/master/LICENSE
+#
+# =============================================================================
+
+"""
+Cache expiry policy for Clima Cast.
+
+This module derives an exact expiration time for cached items from the
+upstream Cache-Control/Expires headers and the gridpoint updateTime and
+validTimes fields, clamped to per-prefix bounds from Config.
+"""
+
+import re
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from time import time
+from typing import Any, Mapping, Optional
+
+from aniso8601.duration import parse_duration
+
+from utils.config import Config
+
+MAX_AGE_RE = re.compile(r"(?:^|,)\s*max-age\s*=\s*\"?(\d+)\"?", re.IGNORECASE)
+NO_CACHE_RE = re.compile(r"(?:^|,)\s*(no-cache|no-store)\b", re.IGNORECASE)
+
+
+def parse_time(value: str) -> Optional[float]:
+    """
+    Convert an ISO 8601 timestamp to epoch seconds.
+
+    Args:
+        value: Timestamp such as "2024-01-01T12:00:00+00:00"
+
+    Returns:
+        Epoch seconds or None if the value can't be parsed
+    """
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except (AttributeError, ValueError):
+        return None
+
+
+class ExpiryPolicy(object):
+    """
+    Computes second-granular expiration times for one cache prefix.
+
+    Sources are considered in order: Cache-Control max-age, Expires,
+    gridpoint updateTime/validTimes, then the caller's default lifetime.
+    The result is clamped to Config.CACHE_EXPIRY_BOUNDS for the prefix.
+    """
+
+    def __init__(self, prefix: str) -> None:
+        """
+        Initialize the policy for a cache prefix.
+
+        Args:
+            prefix: Cache type prefix (e.g., "response#")
+        """
+        self.prefix = prefix
+        self.bounds = Config.CACHE_EXPIRY_BOUNDS.get(prefix, (0, None))
+
+    def expires_at(
+        self,
+        headers: Optional[Mapping[str, str]] = None,
+        data: Optional[Any] = None,
+        default: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> int:
+        """
+        Compute the expiration time for an item.
+
+        Args:
+            headers: Upstream response headers, if any
+            data: Parsed response body, if any
+            default: Lifetime in seconds to use when nothing else applies
+            now: Current epoch time (defaults to time())
+
+        Returns:
+            Expiration time in epoch seconds
+        """
+        now = time() if now is None else now
+
+        expires = self.from_headers(headers, now) if headers else None
+        if expires is None and isinstance(data, dict):
+            expires = self.from_gridpoint(data)
+        if expires is None:
+            if default is None:
+                default = Config.DEFAULT_CACHE_TTL_DAYS * 24 * 60 * 60
+            expires = now + default
+
+        return int(self.clamp(expires, now))
+
+    def clamp(self, expires: float, now: float) -> float:
+        """
+        Clamp an expiration time to the bounds for this prefix.
+
+        Args:
+            expires: Proposed expiration time in epoch seconds
+            now: Current epoch time
+
+        Returns:
+            Bounded expiration time in epoch seconds
+        """
+        low, high = self.bounds
+        expires = max(expires, now + low)
+        if high is not None:
+            expires = min(expires, now + high)
+        return expires
+
+    def from_headers(self, headers: Mapping[str, str], now: float) -> Optional[float]:
+        """
+        Derive an expiration time from HTTP caching headers.
+
+        Args:
+            headers: Response headers
+            now: Current epoch time
+
+        Returns:
+            Expiration time in epoch seconds or None
+        """
+        cache_control = headers.get("Cache-Control", "")
+        if NO_CACHE_RE.search(cache_control):
+            return now
+
+        match = MAX_AGE_RE.search(cache_control)
+        if match:
+            age = headers.get("Age", "0")
+            return now + int(match.group(1)) - (int(age) if age.isdigit() else 0)
+
+        if headers.get("Expires"):
+            try:
+                expires = parsedate_to_datetime(headers["Expires"]).timestamp()
+            except (TypeError, ValueError):
+                # Invalid Expires values (e.g. "0") mean already expired
+                return now
+            date = headers.get("Date")
+            if date:
+                # Compensate for clock skew between NWS and us
+                try:
+                    expires += now - parsedate_to_datetime(date).timestamp()
+                except (TypeError, ValueError):
+                    pass
+            return expires
+
+        return None
+
+    def from_gridpoint(self, data: Mapping[str, Any]) -> Optional[float]:
+        """
+        Derive an expiration time from gridpoint updateTime and validTimes.
+
+        NWS refreshes grids about every Config.GRIDPOINT_UPDATE_SECONDS, so
+        the next update is expected that long after updateTime.  The data
+        is never considered good past the end of validTimes.
+
+        Args:
+            data: Gridpoint data
+
+        Returns:
+            Expiration time in epoch seconds or None
+        """
+        updated = parse_time(data.get("updateTime"))
+        if updated is None:
+            return None
+
+        expires = updated + Config.GRIDPOINT_UPDATE_SECONDS
+        valid_end = self.valid_end(data.get("validTimes"))
+        if valid_end is not None:
+            expires = min(expires, valid_end)
+
+        return expires
+
+    def valid_end(self, valid_times: Optional[str]) -> Optional[float]:
+        """
+        Return the end of an ISO 8601 "start/duration" interval.
+
+        Args:
+            valid_times: Interval string
+
+        Returns:
+            End of the interval in epoch seconds or None
+        """
+        start, _, duration = (valid_times or "").partition("/")
+        start = parse_time(start)
+        if start is None or not duration:
+            return None
+        try:
+            return start + parse_duration(duration).total_seconds()
+        except ValueError:
+            return None
+
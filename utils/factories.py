@@ -9,13 +9,23 @@
 #
 # =============================================================================
 
+import asyncio
+import contextvars
+import importlib.util
 import logging
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import monotonic
+from typing import Any, AsyncGenerator, Callable, List, Optional
 
 import httpx
 
 from storage.cache_handler import CacheHandler
+from utils import metrics
 from utils.config import Config
 from utils.geolocator import Geolocator
+from utils.singleflight import SingleFlight
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -25,6 +35,24 @@ logger.setLevel(logging.INFO)
 # Factory Functions for Singleton Instances
 # =============================================================================
 
+# HTTP/2 needs the optional "h2" package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def get_http_limits() -> httpx.Limits:
+    """
+    Build the connection pool limits from Config.
+
+    Returns:
+        httpx.Limits: Pool sizing and keep-alive settings
+    """
+    return httpx.Limits(
+        max_connections=Config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
 _https_client = None
 
 
@@ -37,10 +65,74 @@ def get_https_client() -> httpx.Client:
     """
     global _https_client
     if _https_client is None:
-        _https_client = httpx.Client(timeout=Config.HTTP_TIMEOUT, follow_redirects=True)
+        _https_client = httpx.Client(
+            timeout=Config.HTTP_TIMEOUT,
+            follow_redirects=True,
+            limits=get_http_limits(),
+            http2=HTTP2_AVAILABLE,
+        )
     return _https_client
 
 
+_async_https_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_https_client() -> httpx.AsyncClient:
+    """
+    Get or create the asynchronous HTTPS client for the running event loop.
+
+    An httpx.AsyncClient's connection pool is bound to the event loop that
+    opened it, so one client is kept per loop instead of a single global.
+    The client is closed when the loop shuts down.  Must be called from
+    within a coroutine.
+
+    Returns:
+        httpx.AsyncClient: Configured async HTTP client for API calls
+    """
+    loop = asyncio.get_running_loop()
+    entry = _async_https_clients.get(loop)
+    if entry is None:
+        client = httpx.AsyncClient(
+            timeout=Config.HTTP_TIMEOUT,
+            follow_redirects=True,
+            limits=get_http_limits(),
+            http2=HTTP2_AVAILABLE,
+        )
+        entry = _async_https_clients[loop] = (client, close_on_shutdown(client))
+    return entry[0]
+
+
+def close_on_shutdown(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    """
+    Arrange for an async client to be closed when the running loop shuts down.
+
+    The running loop tracks every async generator started on it, and
+    asyncio.run() (or loop.shutdown_asyncgens()) finalizes them before the
+    loop is closed.  Starting a generator that closes the client in its
+    finally block ties the client's lifetime to the loop's.
+
+    Args:
+        client: Client to close
+
+    Returns:
+        The started generator, which the caller must keep a reference to
+    """
+
+    async def closer() -> AsyncGenerator[None, None]:
+        try:
+            yield
+        finally:
+            await client.aclose()
+
+    generator = closer()
+    try:
+        # Runs up to the first yield without suspending
+        generator.asend(None).send(None)
+    except StopIteration:
+        pass
+    return generator
+
+
 _geolocator_instance = None
 
 
@@ -75,3 +167,104 @@ def get_cache_handler() -> CacheHandler:
             table_name=Config.DYNAMODB_TABLE_NAME, region=Config.DYNAMODB_REGION
         )
     return _cache_handler_instance
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    Thread pool that runs each task in a copy of the submitter's context,
+    so request-scoped context variables (e.g. the deadline) follow the work.
+    """
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+_executor_instance = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Get or create the global bounded thread pool for concurrent I/O.
+
+    Returns:
+        ThreadPoolExecutor: Shared executor sized by Config.THREAD_POOL_WORKERS
+    """
+    global _executor_instance
+    if _executor_instance is None:
+        _executor_instance = ContextThreadPoolExecutor(
+            max_workers=Config.THREAD_POOL_WORKERS, thread_name_prefix="climacast"
+        )
+    return _executor_instance
+
+
+_single_flight_instance = None
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    Get or create the global single-flight group for NWS requests.
+
+    Returns:
+        SingleFlight: Coalesces concurrent requests for the same URL
+    """
+    global _single_flight_instance
+    if _single_flight_instance is None:
+        _single_flight_instance = SingleFlight("single_flight")
+    return _single_flight_instance
+
+
+_warm_up_lock = threading.Lock()
+_warmed_up = False
+_first_request_recorded = False
+
+
+def warm_up(hosts: Optional[List[str]] = None) -> None:
+    """
+    Open pooled keep-alive connections before the first real request.
+
+    Resolves DNS and completes the TCP and TLS handshakes for each host so
+    the first user request doesn't pay for them, and creates the cache
+    handler's DynamoDB resource.  Meant to run during Lambda init or on a
+    warm-up ping.  Failures are logged and otherwise ignored.
+
+    Args:
+        hosts: Base URLs to connect to (default: Config.WARM_UP_HOSTS)
+    """
+    global _warmed_up
+
+    def connect(host: str) -> None:
+        try:
+            get_https_client().head(host, timeout=Config.WARM_UP_TIMEOUT)
+        except httpx.HTTPError as e:
+            logger.warning(f"Warm-up of {host} failed: {e}")
+
+    start = monotonic()
+    list(get_executor().map(connect, hosts or Config.WARM_UP_HOSTS))
+    try:
+        get_cache_handler()
+    except Exception as e:
+        logger.warning(f"Warm-up of cache handler failed: {e}")
+
+    with _warm_up_lock:
+        _warmed_up = True
+    metrics.incr("warm_up.count")
+    logger.info("Warm-up finished in %.0f ms", (monotonic() - start) * 1000)
+
+
+def record_first_request(seconds: float) -> None:
+    """
+    Record the latency of the container's first NWS request.
+
+    Stored as "http.first_request_ms.warm" or "http.first_request_ms.cold"
+    depending on whether warm_up() ran first, so the two can be compared.
+
+    Args:
+        seconds: Duration of the request
+    """
+    global _first_request_recorded
+    with _warm_up_lock:
+        if _first_request_recorded:
+            return
+        _first_request_recorded = True
+        state = "warm" if _warmed_up else "cold"
+    metrics.incr("http.first_request_ms." + state, int(seconds * 1000))
@@ -21,9 +21,12 @@ from tenacity import (
     retry,
     retry_if_exception_type,
     stop_after_attempt,
+    stop_any,
     wait_exponential,
 )
 
+from utils.deadline import get_timeout, is_expired
+
 
 class Geolocator:
     """
@@ -44,7 +47,7 @@ class Geolocator:
         self.base_url = "https://geocode.search.hereapi.com/v1"
 
     @retry(
-        stop=stop_after_attempt(3),
+        stop=stop_any(stop_after_attempt(3), lambda retry_state: is_expired()),
         retry=retry_if_exception_type((httpx.RequestError, httpx.HTTPStatusError)),
         wait=wait_exponential(multiplier=1, min=1, max=10),
     )
@@ -60,7 +63,7 @@ class Geolocator:
                 - coordinates is (latitude, longitude) or None if not found
                 - properties is a dict with administrative area info (County, State, etc.) or None
         """
-        if not self.api_key:
+        if not self.api_key or is_expired():
             return None, None
 
         # Clean up the search query - replace + with spaces for HERE API
@@ -75,7 +78,9 @@ class Geolocator:
         }
 
         try:
-            response = self.session.get(f"{self.base_url}/geocode", params=params)
+            response = self.session.get(
+                f"{self.base_url}/geocode", params=params, timeout=get_timeout(30.0)
+            )
 
             if response.status_code != 200:
                 return None, None
@@ -0,0 +1,239 @@
+#!/usr/bin/python3
+
+# =============================================================================
+#
+# Copyright 2017 by Leland Lucius
+#
+# Released under the GNU Affero GPL
+# See: https://github.com/lllucius/climacast/blob/master/LICENSE
+#
+# =============================================================================
+
+"""
+Incremental parsing of large JSON objects.
+
+NWS responses are JSON objects whose few interesting members sit next to
+large ones the skill never reads.  ObjectProjector is fed the response
+body a chunk at a time and keeps only the requested top-level members.
+Members that weren't requested are skipped by scanning for their closing
+bracket, so they're never decoded.  At most one member's text is held at
+once, rather than the whole body, its decoded text and the full object
+tree.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Dict, Iterable, Optional
+
+# Parser states
+START, KEY, COLON, VALUE, NEXT, END = range(6)
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Characters that matter while skipping a container
+STRUCTURE = re.compile(r'[\[\]{}"]')
+
+# The rest of a string, from just after its opening quote
+STRING_END = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+
+# Characters that can continue a number
+NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+class ObjectProjector(object):
+    """
+    Parses a JSON object fed in chunks, keeping some of its members.
+    """
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        """
+        Initialize the projector.
+
+        Args:
+            keys: Names of the top-level members to keep
+        """
+        self.keys = set(keys)
+        self.result: Dict[str, Any] = {}
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json = json.JSONDecoder()
+        self.buffer = ""
+        self.state = START
+        self.key: Optional[str] = None
+
+        # Bracket depth within a member being skipped
+        self.depth = 0
+
+        # Buffer length to wait for before trying to decode a member again
+        self.wanted = 0
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Parse the next part of the body.
+
+        Args:
+            chunk: Raw bytes of the body
+
+        Raises:
+            ValueError: If the body isn't a JSON object
+        """
+        self.buffer += self.decoder.decode(chunk)
+        self.parse(final=False)
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Finish parsing.
+
+        Returns:
+            Dict of the requested members that were present
+
+        Raises:
+            ValueError: If the body isn't a complete JSON object
+        """
+        self.buffer += self.decoder.decode(b"", final=True)
+        self.parse(final=True)
+        if self.state != END:
+            raise ValueError("Incomplete JSON object")
+
+        return self.result
+
+    def parse(self, final: bool) -> None:
+        """Consume as much of the buffer as can be parsed."""
+        pos = 0
+        buffer = self.buffer
+        while True:
+            pos = WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+
+            char = buffer[pos]
+            if self.state == START:
+                if char != "{":
+                    raise ValueError("Expected a JSON object")
+                self.state = KEY
+                pos += 1
+            elif self.state == KEY:
+                if char == "}" and self.key is None:
+                    self.state = END
+                    pos += 1
+                    continue
+                if char != '"':
+                    raise ValueError("Expected a member name at %d" % pos)
+                match = STRING_END.match(buffer, pos + 1)
+                if match is None:
+                    break
+                self.key = json.loads(buffer[pos:match.end()])
+                self.state = COLON
+                pos = match.end()
+            elif self.state == COLON:
+                if char != ":":
+                    raise ValueError("Expected ':' after %r" % self.key)
+                self.state = VALUE
+                pos += 1
+            elif self.state == VALUE:
+                if self.depth or (self.key not in self.keys and char in "[{"):
+                    pos = self.skip(buffer, pos)
+                    if self.depth:
+                        break
+                else:
+                    end = self.decode(buffer, pos, final)
+                    if end is None:
+                        break
+                    pos = end
+                self.state = NEXT
+            elif self.state == NEXT:
+                if char == ",":
+                    self.state = KEY
+                elif char == "}":
+                    self.state = END
+                else:
+                    raise ValueError("Expected ',' or '}' after %r" % self.key)
+                pos += 1
+            else:
+                raise ValueError("Extra data after the JSON object")
+
+        self.buffer = buffer[pos:]
+
+    def decode(self, buffer: str, pos: int, final: bool) -> Optional[int]:
+        """
+        Decode a whole member value, keeping it if it was requested.
+
+        Returns:
+            Position after the value, or None if more of it is needed
+        """
+        if not final and len(buffer) < self.wanted:
+            return None
+
+        try:
+            value, end = self.json.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            # Not all here yet; wait for the buffer to double before trying
+            # again, so a large value is decoded a bounded number of times
+            self.wanted = 2 * len(buffer)
+            return None
+
+        # A number could continue in the next chunk, either right at the end
+        # of the buffer or after a "." or exponent the decoder stopped at
+        if (
+            not final
+            and isinstance(value, (int, float))
+            and not isinstance(value, bool)
+            and (end == len(buffer) or buffer[end] in NUMBER_CHARS)
+        ):
+            return None
+
+        self.wanted = 0
+        if self.key in self.keys:
+            self.result[self.key] = value
+        return end
+
+    def skip(self, buffer: str, pos: int) -> int:
+        """
+        Scan an unwanted object or array without decoding it.
+
+        The scanned text can be dropped, so a skipped member is never held
+        in full.  The member is complete once depth is back to 0.
+
+        Returns:
+            Position scanned up to
+        """
+        while True:
+            match = STRUCTURE.search(buffer, pos)
+            if match is None:
+                return len(buffer)
+
+            char = match.group()
+            if char == '"':
+                string = STRING_END.match(buffer, match.end())
+                if string is None:
+                    return match.start()
+                pos = string.end()
+                continue
+
+            pos = match.end()
+            self.depth += 1 if char in "[{" else -1
+            if self.depth == 0:
+                return pos
+
+
+def project(chunks: Iterable[bytes], keys: Iterable[str]) -> Dict[str, Any]:
+    """
+    Parse a JSON object from chunks of bytes, keeping some of its members.
+
+    Args:
+        chunks: The body, in order
+        keys: Names of the top-level members to keep
+
+    Returns:
+        Dict of the requested members that were present
+
+    Raises:
+        ValueError: If the body isn't a JSON object
+    """
+    projector = ObjectProjector(keys)
+    for chunk in chunks:
+        projector.feed(chunk)
+
+    return projector.close()
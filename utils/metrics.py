@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+
+# =============================================================================
+#
+# Copyright 2017 by Leland Lucius
+#
+# Released under the GNU Affero GPL
+# See: https://github.com/lllucius/climacast/blob/master/LICENSE
+#
+# =============================================================================
+
+"""
+In-process metrics for Clima Cast.
+
+Counters persist for the life of the Lambda container and are written to
+the log after each response, so cache hit rates and similar figures can
+be read back from CloudWatch.
+"""
+
+import logging
+import threading
+from typing import Dict, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+_lock = threading.Lock()
+_counters: Dict[str, int] = {}
+
+
+def incr(name: str, amount: int = 1) -> None:
+    """
+    Increment the named counter.
+
+    Args:
+        name: Counter name (e.g., "location_cache.hit")
+        amount: Amount to add
+    """
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def get(name: str) -> int:
+    """
+    Return the current value of the named counter.
+
+    Args:
+        name: Counter name
+
+    Returns:
+        Counter value, 0 if never incremented
+    """
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def hit_rate(name: str) -> Optional[float]:
+    """
+    Return the hit rate for a "<name>.hit" / "<name>.miss" counter pair.
+
+    Args:
+        name: Counter name prefix (e.g., "location_cache")
+
+    Returns:
+        Fraction of lookups that were hits, or None if there were none
+    """
+    with _lock:
+        hits = _counters.get(name + ".hit", 0)
+        total = hits + _counters.get(name + ".miss", 0)
+    return hits / total if total else None
+
+
+def snapshot() -> Dict[str, int]:
+    """Return a copy of all counters."""
+    with _lock:
+        return dict(_counters)
+
+
+def reset() -> None:
+    """Clear all counters."""
+    with _lock:
+        _counters.clear()
+
+
+def log() -> None:
+    """Write all counters to the log."""
+    counters = snapshot()
+    if counters:
+        logger.info(
+            "METRICS: %s",
+            ", ".join("%s=%s" % (name, counters[name]) for name in sorted(counters)),
+        )
@@ -0,0 +1,226 @@
+#!/usr/bin/python3
+
+# =============================================================================
+#
+# Copyright 2017 by Leland Lucius
+#
+# Released under the GNU Affero GPL
+# See: https://github.com/lllucius/climacast/blob/master/LICENSE
+#
+# =============================================================================
+
+"""
+Single-flight request coalescing for Clima Cast.
+
+Concurrent calls for the same key share one execution: the first caller
+runs the function while the others wait for and receive its result.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor, Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from utils import metrics
+from utils.deadline import Deadline, DeadlineExceeded, get_deadline
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight(object):
+    """
+    Coalesces identical in-flight calls, keyed by an arbitrary hashable.
+
+    Works from threads via do() and from coroutines via do_async().  An
+    async caller will also join a call already running in another thread.
+    do_background() starts a call on an executor without waiting for it.
+    Results are shared, so callers must not modify them.  A waiting caller
+    gives up with DeadlineExceeded when its own request deadline passes;
+    if instead the leader's call runs out of the leader's deadline, a
+    caller with time left makes the call again.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialize the single-flight group.
+
+        Args:
+            name: Name used for the "<name>.leader"/"<name>.coalesced" counters
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._tasks: Dict[
+            Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task
+        ] = {}
+
+    def do(
+        self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Call fn(*args, **kwargs) unless a call for key is already in flight.
+
+        Args:
+            key: Identity of the call (e.g., normalized URL)
+            fn: Function to call
+
+        Returns:
+            Result of fn, possibly from another caller's execution
+
+        Raises:
+            DeadlineExceeded: If the deadline passes while waiting
+        """
+        while True:
+            with self._lock:
+                future = self._calls.get(key)
+                leader = future is None
+                if leader:
+                    future = Future()
+                    self._calls[key] = future
+
+            if leader:
+                break
+
+            metrics.incr(self.name + ".coalesced")
+            deadline = get_deadline()
+            try:
+                return future.result(
+                    timeout=deadline.remaining() if deadline else None
+                )
+            except FutureTimeoutError:
+                raise DeadlineExceeded(f"Deadline exceeded waiting for {key}")
+            except DeadlineExceeded:
+                # The leader ran out of its own budget, not necessarily ours
+                if not self.can_retry(deadline):
+                    raise
+
+        metrics.incr(self.name + ".leader")
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+        return result
+
+    def do_background(
+        self,
+        executor: Executor,
+        key: Hashable,
+        fn: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Optional[Future]:
+        """
+        Run fn(*args, **kwargs) on an executor unless a call for key is
+        already in flight, in which case nothing new is started.
+
+        Args:
+            executor: Executor to run the call on
+            key: Identity of the call (e.g., normalized URL)
+            fn: Function to call
+
+        Returns:
+            Future for the call, or None if it was deduplicated
+        """
+        with self._lock:
+            if key in self._calls:
+                metrics.incr(self.name + ".deduplicated")
+                return None
+            future = Future()
+            self._calls[key] = future
+
+        def run() -> None:
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                logger.error(f"Background call for {key} failed: {e}")
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._calls[key]
+
+        metrics.incr(self.name + ".background")
+        executor.submit(run)
+        return future
+
+    async def do_async(
+        self,
+        key: Hashable,
+        fn: Callable[..., Awaitable[Any]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Await fn(*args, **kwargs) unless a call for key is already in flight.
+
+        Args:
+            key: Identity of the call (e.g., normalized URL)
+            fn: Coroutine function to call
+
+        Returns:
+            Result of fn, possibly from another caller's execution
+
+        Raises:
+            DeadlineExceeded: If the deadline passes while waiting
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                future = self._calls.get(key)
+                task = self._tasks.get((loop, key))
+                if future is None and task is None:
+                    task = loop.create_task(fn(*args, **kwargs))
+                    self._tasks[(loop, key)] = task
+                    task.add_done_callback(lambda _: self._forget(loop, key))
+                    leader = True
+                    metrics.incr(self.name + ".leader")
+                else:
+                    leader = False
+                    metrics.incr(self.name + ".coalesced")
+
+            # Shield so a cancelled waiter doesn't cancel the shared call
+            waiter = asyncio.shield(
+                asyncio.wrap_future(future) if future is not None else task
+            )
+            deadline = get_deadline()
+            try:
+                if deadline is None:
+                    return await waiter
+                return await asyncio.wait_for(waiter, deadline.remaining())
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(f"Deadline exceeded waiting for {key}")
+            except DeadlineExceeded:
+                # The leader ran out of its own budget, not necessarily ours
+                if leader or not self.can_retry(deadline):
+                    raise
+
+    def can_retry(self, deadline: Optional[Deadline]) -> bool:
+        """
+        Determine whether a follower should retry after the leader's call
+        ran out of the leader's time budget.
+
+        Args:
+            deadline: The follower's own deadline, if any
+
+        Returns:
+            True if the follower still has time to make the call itself
+        """
+        if deadline is not None and deadline.expired:
+            return False
+
+        metrics.incr(self.name + ".retried")
+        return True
+
+    def _forget(self, loop: asyncio.AbstractEventLoop, key: Hashable) -> None:
+        """Remove a finished async call."""
+        with self._lock:
+            self._tasks.pop((loop, key), None)
@@ -9,5 +9,14 @@ from weather.base import WeatherBase
 from weather.grid_points import GridPoints
 from weather.location import Location
 from weather.observations import Observations
+from weather.series import Series
 
-__all__ = ["WeatherBase", "GridPoints", "Observations", "Alerts", "Alert", "Location"]
+__all__ = [
+    "WeatherBase",
+    "GridPoints",
+    "Observations",
+    "Alerts",
+    "Alert",
+    "Location",
+    "Series",
+]
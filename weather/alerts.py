@@ -39,7 +39,7 @@ class Alerts(WeatherBase):
             cache_handler: Optional cache handler
         """
         super().__init__(event, cache_handler)
-        data = self.https("alerts/active/zone/%s" % zone)
+        data = self.https("alerts/active/zone/%s" % zone, fields=["features"])
         self.data = data.get("features", []) if data else []
 
 
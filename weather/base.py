@@ -18,17 +18,37 @@ HTTP communication, and text normalization.
 """
 
 import json
-from typing import Any, Dict, List, Optional, Union
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-from utils import converters
+import httpx
+
+from storage.http_cache import HttpCache, conditional_headers
+from storage.response_cache import ResponseCache, normalize_url
+from utils import converters, metrics
+from utils.config import Config
 from utils.constants import ANGLES
-from utils.factories import get_https_client
+from utils.deadline import DeadlineExceeded, detached, get_deadline, get_timeout
+from utils.factories import (
+    get_async_https_client,
+    get_executor,
+    get_https_client,
+    get_single_flight,
+    record_first_request,
+)
+from utils.json_stream import ObjectProjector
 from utils.notify import notify
 from utils.text_normalizer import TextNormalizer
 
 # These will be lazily imported to avoid circular imports
 # No module-level globals needed - use lazy imports in methods
 
+# Headers sent with every NWS API request
+HTTPS_HEADERS = {
+    "User-Agent": "ClimacastAlexaSkill/1.0 (climacast@homerow.net)",
+    "Accept": "application/ld+json",
+}
+
 
 class WeatherBase(object):
     """
@@ -76,6 +96,28 @@ class WeatherBase(object):
 
         return zone
 
+    async def get_zone_async(self, zoneId: str, zoneType: str) -> Dict[str, Any]:
+        """
+        Asynchronous version of get_zone().
+
+        Args:
+            zoneId: Zone identifier
+            zoneType: Type of zone (forecast, county, fire)
+
+        Returns:
+            Dict containing zone information
+        """
+        zoneId = zoneId.rsplit("/")[-1]
+        zone = self.cache_handler.get_zone(zoneId) if self.cache_handler else None
+        if zone is None:
+            data = await self.https_async("zones/%s/%s" % (zoneType, zoneId))
+            if data is None or data.get("status", 0) != 0:
+                notify(self.event, "Unable to get zone info for %s" % zoneId, data)
+                return {}
+            zone = self.put_zone(data)
+
+        return zone
+
     def put_zone(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Writes the zone information to the cache.
@@ -125,6 +167,23 @@ class WeatherBase(object):
 
         return [station.rsplit("/")[-1] for station in data["observationStations"]]
 
+    async def get_stations_async(self, coords: str) -> List[str]:
+        """
+        Asynchronous version of get_stations().
+
+        Args:
+            coords: Coordinates in "lat,lon" format
+
+        Returns:
+            List of station IDs
+        """
+        data = await self.https_async("gridpoints/%s/stations" % coords)
+        if data is None or data.get("status", 0) != 0:
+            notify(self.event, "Unable to get stations for %s" % coords, data)
+            return []
+
+        return [station.rsplit("/")[-1] for station in data["observationStations"]]
+
     def get_station(self, stationId: str) -> Optional[Dict[str, Any]]:
         """
         Returns the station information for the given station ID.
@@ -148,6 +207,29 @@ class WeatherBase(object):
 
         return station
 
+    async def get_station_async(self, stationId: str) -> Optional[Dict[str, Any]]:
+        """
+        Asynchronous version of get_station().
+
+        Args:
+            stationId: Station identifier
+
+        Returns:
+            Dict containing station information or None
+        """
+        stationId = stationId.rsplit("/")[-1]
+        station = (
+            self.cache_handler.get_station(stationId) if self.cache_handler else None
+        )
+        if station is None:
+            data = await self.https_async("stations/%s" % stationId)
+            if data is None or data.get("status", 0) != 0:
+                notify(self.event, "Unable to get station %s" % stationId, data)
+                return None
+            station = self.put_station(data)
+
+        return station
+
     def put_station(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Save station information to the cache.
@@ -184,7 +266,10 @@ class WeatherBase(object):
         text = ""
 
         # Retrieve list of features provided by the given CWA
-        data = self.https("products/types/%s/locations/%s" % (product, self.loc["cwa"]))
+        data = self.https(
+            "products/types/%s/locations/%s" % (product, self.loc["cwa"]),
+            fields=["@graph"],
+        )
         if data is None or data.get("status", 0) != 0:
             notify(self.event, "Unable to get %s product list" % product, data)
             return None
@@ -199,36 +284,489 @@ class WeatherBase(object):
 
         return text
 
+    async def get_product_async(self, product: str) -> Optional[str]:
+        """
+        Asynchronous version of get_product().
+
+        Args:
+            product: Product type code
+
+        Returns:
+            Product text or None
+        """
+        text = ""
+
+        # Retrieve list of features provided by the given CWA
+        data = await self.https_async(
+            "products/types/%s/locations/%s" % (product, self.loc["cwa"]),
+            fields=["@graph"],
+        )
+        if data is None or data.get("status", 0) != 0:
+            notify(self.event, "Unable to get %s product list" % product, data)
+            return None
+
+        # Retrieve the most current feature
+        if len(data["@graph"]) > 0:
+            data = await self.https_async("products/%s" % (data["@graph"][0]["id"]))
+            if data is None or data.get("status", 0) != 0:
+                notify(self.event, "Unable to get product %s" % product, data)
+                return None
+            text = data["productText"]
+
+        return text
+
     # @retry(
     #    stop=stop_after_attempt(3),
     #    retry=retry_if_exception_type((httpx.RequestError, httpx.HTTPStatusError)),
     #    wait=wait_exponential(multiplier=1, min=1, max=10)
     # )
     def https(
-        self, path: str, loc: str = "api.weather.gov"
-    ) -> Optional[Dict[str, Any]]:
+        self,
+        path: str,
+        loc: str = "api.weather.gov",
+        fields: Optional[List[str]] = None,
+        cache: Optional[HttpCache] = None,
+        key: Optional[str] = None,
+        build: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> Optional[Any]:
         """
         Retrieve the JSON data from the given path and location.
 
+        Fresh cache entries are served as they are, entries within their
+        stale grace window are served while they are refreshed in the
+        background, and expired entries are revalidated with a conditional
+        request.
+
         Args:
             path: API path
             loc: API location (default: api.weather.gov)
+            fields: Top-level members the caller reads; with JSON_STREAMING
+                on, only these are parsed from the response
+            cache: Cache to use instead of the response cache
+            key: Identifier of the data in cache (default: the URL)
+            build: Converts the JSON response to the data to return and
+                cache (default: the JSON response itself)
 
         Returns:
-            Dict containing JSON response or None
+            Dict containing JSON response (or the built data) or None
         """
         print("HTTPS:", path, loc)
+        url = self.make_url(path, loc)
+        cache, key = self.cache_for(url, cache, key)
+        value, entry = self.get_cached(url, cache, key, build, fields)
+        if value is not None:
+            return value
+
+        try:
+            return get_single_flight().do(
+                normalize_url(url), self.fetch, url, cache, key, build, entry, fields
+            )
+        except DeadlineExceeded:
+            self.deadline_exceeded(url)
+            return None
+
+    def fetch(
+        self,
+        url: str,
+        cache: Optional[HttpCache],
+        key: str,
+        build: Optional[Callable[[Dict[str, Any]], Any]],
+        entry: Optional[Dict[str, Any]],
+        fields: Optional[List[str]] = None,
+    ) -> Optional[Any]:
+        """
+        Perform the network request for https().
+
+        Args:
+            url: Full request URL
+            cache: Cache to maintain, if any
+            key: Identifier of the data in cache
+            build: Converts the JSON response to the data to return, if any
+            entry: Cache entry to revalidate, if any
+            fields: Top-level members to keep when streaming
+
+        Returns:
+            Dict containing JSON response (or the built data) or None
+
+        Raises:
+            DeadlineExceeded: If the request is out of time
+        """
+        self.check_deadline()
         client = get_https_client()
-        headers = {
-            "User-Agent": "ClimacastAlexaSkill/1.0 (climacast@homerow.net)",
-            "Accept": "application/ld+json",
-        }
-        url = (
+        start = monotonic()
+        try:
+            if self.streaming(fields):
+                timeout = get_timeout(Config.HTTP_TIMEOUT)
+                with client.stream(
+                    "GET",
+                    url,
+                    headers=self.request_headers(entry),
+                    timeout=timeout,
+                ) as r:
+                    record_first_request(monotonic() - start)
+                    if r.status_code != 200:
+                        r.read()
+                        return self.handle_response(url, r, cache, key, build, entry)
+                    projector = ObjectProjector(fields)
+                    for chunk in r.iter_bytes():
+                        # The read timeout applies to each chunk, not the body
+                        self.check_elapsed(url, start, timeout)
+                        projector.feed(chunk)
+                    return self.handle_response(
+                        url, r, cache, key, build, entry, projector.close()
+                    )
+
+            r = client.get(
+                url,
+                headers=self.request_headers(entry),
+                timeout=get_timeout(Config.HTTP_TIMEOUT),
+            )
+        except httpx.TimeoutException:
+            self.check_deadline()
+            raise
+        record_first_request(monotonic() - start)
+
+        return self.handle_response(url, r, cache, key, build, entry)
+
+    async def https_async(
+        self,
+        path: str,
+        loc: str = "api.weather.gov",
+        fields: Optional[List[str]] = None,
+        cache: Optional[HttpCache] = None,
+        key: Optional[str] = None,
+        build: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> Optional[Any]:
+        """
+        Asynchronous version of https() for use with asyncio.gather().
+
+        Args:
+            path: API path
+            loc: API location (default: api.weather.gov)
+            fields: Top-level members the caller reads; with JSON_STREAMING
+                on, only these are parsed from the response
+            cache: Cache to use instead of the response cache
+            key: Identifier of the data in cache (default: the URL)
+            build: Converts the JSON response to the data to return and
+                cache (default: the JSON response itself)
+
+        Returns:
+            Dict containing JSON response (or the built data) or None
+        """
+        url = self.make_url(path, loc)
+        cache, key = self.cache_for(url, cache, key)
+        value, entry = self.get_cached(url, cache, key, build, fields)
+        if value is not None:
+            return value
+
+        try:
+            return await get_single_flight().do_async(
+                normalize_url(url), self.fetch_async, url, cache, key, build, entry, fields
+            )
+        except DeadlineExceeded:
+            self.deadline_exceeded(url)
+            return None
+
+    async def fetch_async(
+        self,
+        url: str,
+        cache: Optional[HttpCache],
+        key: str,
+        build: Optional[Callable[[Dict[str, Any]], Any]],
+        entry: Optional[Dict[str, Any]],
+        fields: Optional[List[str]] = None,
+    ) -> Optional[Any]:
+        """
+        Perform the network request for https_async().
+
+        Args:
+            url: Full request URL
+            cache: Cache to maintain, if any
+            key: Identifier of the data in cache
+            build: Converts the JSON response to the data to return, if any
+            entry: Cache entry to revalidate, if any
+            fields: Top-level members to keep when streaming
+
+        Returns:
+            Dict containing JSON response (or the built data) or None
+
+        Raises:
+            DeadlineExceeded: If the request is out of time
+        """
+        self.check_deadline()
+        client = get_async_https_client()
+        start = monotonic()
+        try:
+            if self.streaming(fields):
+                timeout = get_timeout(Config.HTTP_TIMEOUT)
+                async with client.stream(
+                    "GET",
+                    url,
+                    headers=self.request_headers(entry),
+                    timeout=timeout,
+                ) as r:
+                    record_first_request(monotonic() - start)
+                    if r.status_code != 200:
+                        await r.aread()
+                        return self.handle_response(url, r, cache, key, build, entry)
+                    projector = ObjectProjector(fields)
+                    async for chunk in r.aiter_bytes():
+                        # The read timeout applies to each chunk, not the body
+                        self.check_elapsed(url, start, timeout)
+                        projector.feed(chunk)
+                    return self.handle_response(
+                        url, r, cache, key, build, entry, projector.close()
+                    )
+
+            r = await client.get(
+                url,
+                headers=self.request_headers(entry),
+                timeout=get_timeout(Config.HTTP_TIMEOUT),
+            )
+        except httpx.TimeoutException:
+            self.check_deadline()
+            raise
+        record_first_request(monotonic() - start)
+
+        return self.handle_response(url, r, cache, key, build, entry)
+
+    def streaming(self, fields: Optional[List[str]]) -> bool:
+        """
+        Decide whether to stream a response rather than load it whole.
+
+        Args:
+            fields: Top-level members the caller reads, if it said
+
+        Returns:
+            True if only the given fields should be parsed
+        """
+        return fields is not None and Config.JSON_STREAMING
+
+    def check_elapsed(self, url: str, start: float, timeout: float) -> None:
+        """
+        Stop a streamed response that is taking longer than its timeout.
+
+        Args:
+            url: Full request URL
+            start: Monotonic time the request was sent
+            timeout: Timeout the request was sent with
+
+        Raises:
+            httpx.ReadTimeout: If the timeout has passed
+        """
+        if monotonic() - start > timeout:
+            raise httpx.ReadTimeout(f"Timed out reading {url}")
+
+    def check_deadline(self) -> None:
+        """
+        Stop if the current request has used up its time budget.
+
+        Raises:
+            DeadlineExceeded: If the deadline has passed
+        """
+        deadline = get_deadline()
+        if deadline is not None:
+            deadline.check()
+
+    def deadline_exceeded(self, url: str) -> None:
+        """
+        Record a request abandoned because the time budget ran out.
+
+        Args:
+            url: Full request URL
+        """
+        metrics.incr("deadline.exceeded")
+        notify(self.event, "DEADLINE: exceeded", "URL: %s" % url)
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """NWS response cache backed by the cache handler, if any."""
+        return ResponseCache(self.cache_handler) if self.cache_handler else None
+
+    def cache_for(
+        self, url: str, cache: Optional[HttpCache], key: Optional[str]
+    ) -> Tuple[Optional[HttpCache], str]:
+        """
+        Choose the cache and key for a request.
+
+        Args:
+            url: Full request URL
+            cache: Cache the caller asked for, if any
+            key: Identifier the caller asked for, if any
+
+        Returns:
+            Tuple of (cache, key), the response cache and URL by default
+        """
+        if cache is None:
+            return self.response_cache, url
+
+        return cache, key if key is not None else url
+
+    def get_cached(
+        self,
+        url: str,
+        cache: Optional[HttpCache],
+        key: str,
+        build: Optional[Callable[[Dict[str, Any]], Any]],
+        fields: Optional[List[str]] = None,
+    ) -> Tuple[Optional[Any], Optional[Dict[str, Any]]]:
+        """
+        Look up a request in its cache.
+
+        Args:
+            url: Full request URL
+            cache: Cache to look in, if any
+            key: Identifier of the data in cache
+            build: Converts the JSON response to the data to cache, if the
+                entry is refreshed
+            fields: Top-level members to keep if the entry is refreshed
+
+        Returns:
+            Tuple of (data, entry) where data is the cached data if the
+            entry is fresh (or stale but within its grace window) and entry
+            is the cache entry to revalidate, if any
+        """
+        entry = cache.lookup(key) if cache else None
+        if entry is None:
+            return None, None
+
+        fresh = cache.is_fresh(entry)
+        servable = fresh or cache.is_servable_stale(key, entry)
+        value = cache.load(entry)
+
+        # Unreadable, so fetch it again without validators
+        if value is None:
+            return None, None
+
+        if not servable:
+            return None, entry
+
+        # Recently expired, so serve it now and refresh it for next time
+        if not fresh:
+            metrics.incr(cache.name + ".stale_served")
+            self.refresh(url, cache, key, build, entry, fields)
+
+        return value, entry
+
+    def refresh(
+        self,
+        url: str,
+        cache: HttpCache,
+        key: str,
+        build: Optional[Callable[[Dict[str, Any]], Any]],
+        entry: Optional[Dict[str, Any]],
+        fields: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Refetch a request in the background, at most once at a time per URL.
+
+        In Lambda, a refresh still running when the response is returned
+        resumes on the container's next invocation, so it runs without the
+        request's deadline.
+
+        Args:
+            url: Full request URL
+            cache: Cache to update
+            key: Identifier of the data in cache
+            build: Converts the JSON response to the data to cache, if any
+            entry: Cache entry to revalidate, if any
+            fields: Top-level members to keep when streaming
+        """
+        get_single_flight().do_background(
+            get_executor(),
+            normalize_url(url),
+            detached(self.fetch),
+            url,
+            cache,
+            key,
+            build,
+            entry,
+            fields,
+        )
+
+    def request_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Build the request headers, adding validators from a stale cache entry.
+
+        Args:
+            entry: Cache entry, if any
+
+        Returns:
+            Dict of request headers
+        """
+        headers = dict(HTTPS_HEADERS)
+        headers.update(conditional_headers(entry))
+
+        return headers
+
+    def handle_response(
+        self,
+        url: str,
+        r: httpx.Response,
+        cache: Optional[HttpCache],
+        key: str,
+        build: Optional[Callable[[Dict[str, Any]], Any]],
+        entry: Optional[Dict[str, Any]],
+        projected: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Any]:
+        """
+        Convert a response to JSON data (or the built data), maintaining the
+        cache.
+
+        Args:
+            url: Full request URL
+            r: Response returned by the sync or async client
+            cache: Cache to maintain, if any
+            key: Identifier of the data in cache
+            build: Converts the JSON response to the data to return, if any
+            entry: Cache entry the request was made with, if any
+            projected: Members already parsed from a streamed body, if any
+
+        Returns:
+            Dict containing JSON response (or the built data) or None
+        """
+        # Not modified, so the cached data is still current
+        if r.status_code == 304 and entry is not None and cache:
+            cache.revalidate(key, entry, r)
+            return cache.load(entry)
+
+        data = self.parse_response(r) if projected is None else projected
+        if data is None:
+            return None
+
+        value = build(data) if build else data
+        if cache:
+            cache.put(key, r, value, projected=projected is not None)
+
+        return value
+
+    def make_url(self, path: str, loc: str = "api.weather.gov") -> str:
+        """
+        Build the full URL for the given path and location.
+
+        Args:
+            path: API path or full URL
+            loc: API location (default: api.weather.gov)
+
+        Returns:
+            Full URL string
+        """
+        return (
             path
             if path.startswith("https")
             else f"https://{loc}/{path.replace(' ', '+')}"
         )
-        r = client.get(url, headers=headers)
+
+    def parse_response(self, r: httpx.Response) -> Optional[Dict[str, Any]]:
+        """
+        Convert an HTTP response to JSON data, notifying on failure.
+
+        Args:
+            r: Response returned by the sync or async client
+
+        Returns:
+            Dict containing JSON response or None
+        """
         if r.status_code != 200 or r.text is None or r.text == "":
             notify(
                 self.event,
@@ -236,7 +774,6 @@ class WeatherBase(object):
                 "URL: %s\n\n%s" % (r.url, r.content),
             )
             return None
-        print("rESPNMSE", r.text)
 
         return json.loads(r.text)
 
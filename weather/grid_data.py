@@ -0,0 +1,373 @@
+#!/usr/bin/python3
+
+# =============================================================================
+#
+# Copyright 2017 by Leland Lucius
+#
+# Released under the GNU Affero GPL
+# See: https://github.com/lllucius/climacast/blob/master/LICENSE
+#
+# =============================================================================
+
+"""
+Gridpoint data in query-ready form, with a compact binary encoding.
+
+GridData holds the numeric layers the skill reads as Series and the
+weather layer as intervals plus a table of distinct values.  pack()
+writes typed arrays for times and values, base64 encoded so the result
+can be stored as a DynamoDB or JSON string; unpack() reads them straight
+back into arrays without parsing any JSON but the small weather value
+table.  The per-quarter summaries from weather.summaries are stored
+alongside, so they're computed once per fetch.
+
+Each layer, and the summaries, is a separately compressed block listed
+in a small directory.  unpack() only reads the directory; a block is
+decompressed and decoded the first time it's used, so a question about
+one metric doesn't pay for the other fifteen.
+"""
+
+import base64
+import json
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.constants import GRIDPOINT_LAYERS
+from weather.intervals import IntervalIndex, parse_interval
+from weather.series import Series
+from weather.summaries import COLUMNS, Summaries
+
+# Identifies the packed format and its version
+MAGIC = b"GPK3"
+
+# Layers whose values aren't numbers
+TABLE_LAYERS = ["weather"]
+
+# Members of the gridpoint payload from_json() reads
+FIELDS = ["updateTime", "validTimes"] + GRIDPOINT_LAYERS
+
+# Kinds of packed blocks, named "<kind>/<layer>" in the directory
+SERIES = "series"
+TABLE = "table"
+SUMMARIES = "summaries"
+
+# zlib level for packed blocks
+COMPRESSION_LEVEL = 6
+
+
+class GridData(object):
+    """
+    The parts of a gridpoint payload the skill uses.
+    """
+
+    def __init__(
+        self,
+        update_time: Optional[str],
+        valid_times: Optional[str],
+        series: Dict[str, Series],
+        tables: Dict[str, Tuple[np.ndarray, np.ndarray, List[Any]]],
+        summaries: Optional[Summaries] = None,
+        blocks: Optional[Dict[str, bytes]] = None,
+    ) -> None:
+        """
+        Initialize the grid data.
+
+        Args:
+            update_time: ISO 8601 time NWS last updated the data
+            valid_times: ISO 8601 interval the data covers
+            series: Numeric layers by name
+            tables: Other layers by name as (starts, ends, values) where
+                values holds one entry per interval
+            summaries: Per-quarter summaries, if computed
+            blocks: Packed blocks not decoded yet, by directory name
+        """
+        self.update_time = update_time
+        self.valid_times = valid_times
+        self.series = series
+        self.tables = tables
+        self._summaries = summaries
+        self.blocks = blocks or {}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "GridData":
+        """
+        Build grid data from a gridpoint payload, keeping GRIDPOINT_LAYERS.
+
+        Args:
+            data: Gridpoint data as returned by NWS
+
+        Returns:
+            GridData for the payload
+        """
+        series = {}
+        tables = {}
+        for layer in GRIDPOINT_LAYERS:
+            if layer not in data:
+                continue
+            if layer in TABLE_LAYERS:
+                entries = data[layer].get("values") or []
+                intervals = [parse_interval(entry["validTime"]) for entry in entries]
+                tables[layer] = (
+                    np.array([start for start, _ in intervals], dtype=np.float64),
+                    np.array([end for _, end in intervals], dtype=np.float64),
+                    [entry.get("value") for entry in entries],
+                )
+            else:
+                series[layer] = Series.from_layer(data[layer])
+
+        return cls(data.get("updateTime"), data.get("validTimes"), series, tables)
+
+    @property
+    def meta(self) -> Dict[str, Optional[str]]:
+        """The updateTime and validTimes fields, as used by ExpiryPolicy."""
+        return {"updateTime": self.update_time, "validTimes": self.valid_times}
+
+    @property
+    def layers(self) -> List[str]:
+        """Names of the numeric layers, decoded or not."""
+        names = list(self.series)
+        for name in self.blocks:
+            kind, _, layer = name.partition("/")
+            if kind == SERIES and layer not in self.series:
+                names.append(layer)
+        return names
+
+    def get_series(self, layer: str) -> Series:
+        """
+        Return a numeric layer, decoding it on first use.
+
+        Args:
+            layer: Layer name
+
+        Returns:
+            Series for the layer (empty if there's no data)
+        """
+        series = self.series.get(layer)
+        if series is None:
+            block = self.blocks.pop("%s/%s" % (SERIES, layer), None)
+            if block is None:
+                return Series.from_layer(None)
+            series = self.series[layer] = read_series(block)
+        return series
+
+    def get_table(self, layer: str) -> Tuple[IntervalIndex, List[Any]]:
+        """
+        Return a non-numeric layer, decoding it on first use.
+
+        Args:
+            layer: Layer name (e.g., 'weather')
+
+        Returns:
+            Tuple of (interval index, values)
+        """
+        if layer not in self.tables:
+            block = self.blocks.pop("%s/%s" % (TABLE, layer), None)
+            if block is None:
+                return IntervalIndex([]), []
+            self.tables[layer] = read_table(block)
+
+        starts, ends, values = self.tables[layer]
+        return IntervalIndex(zip(starts.tolist(), ends.tolist())), values
+
+    @property
+    def summaries(self) -> Optional[Summaries]:
+        """The per-quarter summaries, decoded on first use."""
+        if self._summaries is None:
+            block = self.blocks.pop(SUMMARIES, None)
+            if block is not None:
+                self._summaries = read_summaries(block)
+        return self._summaries
+
+    def summarize(self, tz: Any) -> None:
+        """
+        Compute the per-quarter summaries.
+
+        Args:
+            tz: Timezone of the grid cell, which sets the quarter boundaries
+        """
+        self._summaries = Summaries.build(self, tz)
+
+    def pack(self) -> str:
+        """
+        Encode the grid data compactly.
+
+        Blocks that were never decoded are copied through as they are.
+
+        Returns:
+            Base64 text of the binary encoding
+        """
+        blocks = dict(self.blocks)
+        for layer, series in self.series.items():
+            blocks["%s/%s" % (SERIES, layer)] = write_series(series)
+        for layer, table in self.tables.items():
+            blocks["%s/%s" % (TABLE, layer)] = write_table(*table)
+        if self._summaries is not None:
+            blocks[SUMMARIES] = write_summaries(self._summaries)
+
+        parts = [MAGIC]
+        write_text(parts, self.update_time or "")
+        write_text(parts, self.valid_times or "")
+        parts.append(struct.pack("<H", len(blocks)))
+        for name, block in blocks.items():
+            write_text(parts, name)
+            parts.append(struct.pack("<I", len(block)))
+        parts.extend(blocks.values())
+
+        return base64.b64encode(b"".join(parts)).decode("ascii")
+
+    @classmethod
+    def unpack(cls, text: str) -> "GridData":
+        """
+        Read the directory of grid data written by pack().
+
+        Args:
+            text: Output of pack()
+
+        Returns:
+            GridData whose layers decode on first use
+
+        Raises:
+            ValueError: If the text isn't in the packed format
+        """
+        try:
+            buffer = memoryview(base64.b64decode(text))
+        except ValueError as e:
+            raise ValueError("Invalid packed grid data: %s" % e)
+        if buffer[:4] != MAGIC:
+            raise ValueError("Unknown packed grid data format")
+
+        try:
+            reader = Reader(buffer, 4)
+            update_time = reader.text() or None
+            valid_times = reader.text() or None
+            directory = [
+                (reader.text(), reader.unpack("<I"))
+                for _ in range(reader.unpack("<H"))
+            ]
+        except (struct.error, UnicodeDecodeError) as e:
+            raise ValueError("Invalid packed grid data: %s" % e)
+
+        blocks = {}
+        offset = reader.offset
+        for name, length in directory:
+            blocks[name] = buffer[offset:offset + length]
+            offset += length
+        if offset != len(buffer):
+            raise ValueError("Truncated packed grid data")
+
+        return cls(update_time, valid_times, {}, {}, blocks=blocks)
+
+
+def write_series(series: Series) -> bytes:
+    """Encode a numeric layer as a compressed block."""
+    parts = []
+    write_times(parts, series.starts, series.ends)
+    parts.append(series.values.astype("<f8").tobytes())
+    return zlib.compress(b"".join(parts), COMPRESSION_LEVEL)
+
+
+def read_series(block: bytes) -> Series:
+    """Decode a block written by write_series()."""
+    reader = Reader(zlib.decompress(block))
+    starts, ends = reader.times()
+    return Series(starts, ends, reader.array("<f8", len(starts)))
+
+
+def write_table(starts: np.ndarray, ends: np.ndarray, values: List[Any]) -> bytes:
+    """Encode a non-numeric layer as a compressed block."""
+    parts = []
+    write_times(parts, starts, ends)
+
+    # Values repeat a lot, so store each distinct one once
+    table = {}
+    codes = [
+        table.setdefault(json.dumps(value, sort_keys=True), len(table))
+        for value in values
+    ]
+    parts.append(np.array(codes, dtype="<u2").tobytes())
+    parts.append(struct.pack("<H", len(table)))
+    for text in table:
+        write_text(parts, text)
+
+    return zlib.compress(b"".join(parts), COMPRESSION_LEVEL)
+
+
+def read_table(block: bytes) -> Tuple[np.ndarray, np.ndarray, List[Any]]:
+    """Decode a block written by write_table()."""
+    reader = Reader(zlib.decompress(block))
+    starts, ends = reader.times()
+    codes = reader.array("<u2", len(starts))
+    table = [json.loads(reader.text()) for _ in range(reader.unpack("<H"))]
+    return starts, ends, [table[code] for code in codes.tolist()]
+
+
+def write_summaries(summaries: Summaries) -> bytes:
+    """Encode per-quarter summaries as a compressed block."""
+    parts = []
+    write_times(parts, summaries.starts, summaries.ends)
+    parts.append(struct.pack("<H", len(summaries.layers)))
+    for layer, rows in summaries.layers.items():
+        write_text(parts, layer)
+        parts.append(rows.astype("<f8").tobytes())
+    write_text(parts, json.dumps(summaries.phrases))
+    return zlib.compress(b"".join(parts), COMPRESSION_LEVEL)
+
+
+def read_summaries(block: bytes) -> Summaries:
+    """Decode a block written by write_summaries()."""
+    reader = Reader(zlib.decompress(block))
+    starts, ends = reader.times()
+    layers = {}
+    for _ in range(reader.unpack("<H")):
+        layer = reader.text()
+        rows = reader.array("<f8", len(starts) * len(COLUMNS))
+        layers[layer] = rows.reshape(len(starts), len(COLUMNS))
+    return Summaries(starts, ends, layers, json.loads(reader.text()))
+
+
+def write_text(parts: List[bytes], text: str) -> None:
+    """Append a length-prefixed UTF-8 string."""
+    data = text.encode("utf-8")
+    parts.append(struct.pack("<I", len(data)))
+    parts.append(data)
+
+
+def write_times(parts: List[bytes], starts: np.ndarray, ends: np.ndarray) -> None:
+    """Append interval starts (epoch seconds) and durations (seconds)."""
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    parts.append(struct.pack("<I", len(starts)))
+    parts.append(starts.astype("<i8").tobytes())
+    parts.append((ends - starts).astype("<u4").tobytes())
+
+
+class Reader(object):
+    """Sequential reader over a packed buffer."""
+
+    def __init__(self, buffer: bytes, offset: int = 0) -> None:
+        self.buffer = buffer
+        self.offset = offset
+
+    def unpack(self, fmt: str) -> int:
+        value = struct.unpack_from(fmt, self.buffer, self.offset)[0]
+        self.offset += struct.calcsize(fmt)
+        return value
+
+    def text(self) -> str:
+        length = self.unpack("<I")
+        value = bytes(self.buffer[self.offset:self.offset + length]).decode("utf-8")
+        self.offset += length
+        return value
+
+    def array(self, dtype: str, count: int) -> np.ndarray:
+        array = np.frombuffer(self.buffer, dtype=dtype, count=count, offset=self.offset)
+        self.offset += array.nbytes
+        return array
+
+    def times(self) -> Tuple[np.ndarray, np.ndarray]:
+        count = self.unpack("<I")
+        starts = self.array("<i8", count).astype(np.float64)
+        ends = starts + self.array("<u4", count)
+        return starts, ends
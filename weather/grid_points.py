@@ -16,19 +16,19 @@ This module provides the GridPoints class for processing weather forecast
 data from the National Weather Service gridpoints endpoint.
 """
 
+from datetime import datetime, timedelta
+from time import time
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-from aniso8601.duration import parse_duration
-from dateutil import parser
-from dateutil.relativedelta import relativedelta
+import numpy as np
 
-from utils.constants import (
-    WEATHER_ATTRIBUTES,
-    WEATHER_COVERAGE,
-    WEATHER_INTENSITY,
-    WEATHER_WEATHER,
-)
+from storage.grid_cache import GridCache
+from weather import series
 from weather.base import WeatherBase
+from weather.grid_data import FIELDS, GridData
+from weather.intervals import IntervalIndex, parse_interval
+from weather.phrases import weather_phrases
+from weather.series import Aggregate, Series, Threshold
 
 
 class GridPoints(WeatherBase):
@@ -52,11 +52,48 @@ class GridPoints(WeatherBase):
         """
         super().__init__(event, cache_handler)
         self.tz = tz
-        self.data = self.https("gridpoints/%s/%s" % (cwa, gridpoint))
+        self.data = self.get_data(cwa, gridpoint)
+        self._valid_times = None
+        self.tables = {}
+        self.aggregates = {}
+        self.phrases = {}
+        self.samples = {}
         self.values = {}
-        self.times = {}
-        self.highs = {}
-        self.lows = {}
+
+    def get_data(self, cwa: str, gridpoint: str) -> Optional[GridData]:
+        """
+        Get the gridpoint data, from the shared grid cell cache if possible.
+
+        Args:
+            cwa: County Warning Area
+            gridpoint: Grid point coordinates
+
+        Returns:
+            GridData or None
+        """
+        cache = GridCache(self.cache_handler) if self.cache_handler else None
+        return self.https(
+            "gridpoints/%s/%s" % (cwa, gridpoint),
+            fields=FIELDS,
+            cache=cache,
+            key=GridCache.cell_id(cwa, gridpoint),
+            build=self.build,
+        )
+
+    def build(self, data: Dict[str, Any]) -> GridData:
+        """
+        Convert a gridpoint response to summarized grid data.
+
+        Args:
+            data: Gridpoint data from NWS API
+
+        Returns:
+            GridData with its daily summaries
+        """
+        grid = GridData.from_json(data)
+        grid.summarize(self.tz)
+
+        return grid
 
     def set_interval(self, stime: Any, etime: Any) -> bool:
         """
@@ -69,19 +106,29 @@ class GridPoints(WeatherBase):
         Returns:
             True if valid data exists in range, False otherwise
         """
+        self.samples = {}
         self.values = {}
-        self.highs = {}
-        self.lows = {}
         self.stime = stime
         self.etime = etime
+        self.window = (stime.timestamp(), etime.timestamp())
+        self.current = self.get_summary(self.window)
 
-        if self.data:
-            dts, dte = self.in_range(self.data["validTimes"], stime, etime)
-            if dts and dte:
+        if self.data and self.data.valid_times:
+            dts, dte = self.valid_times
+            start, end = self.window
+            if dts <= start < dte or dts <= end < dte:
                 return True
 
         return False
 
+    @property
+    def valid_times(self) -> Tuple[float, float]:
+        """Start and end of the forecast's validTimes in epoch seconds."""
+        if self._valid_times is None:
+            self._valid_times = parse_interval(self.data.valid_times)
+
+        return self._valid_times
+
     def in_range(self, time: str, stime: Any, etime: Any) -> Tuple[Optional[Any], Optional[Any]]:
         """
         Check if a time period overlaps with the given range.
@@ -94,15 +141,64 @@ class GridPoints(WeatherBase):
         Returns:
             Tuple of (start_datetime, end_datetime) or (None, None)
         """
-        dt, _, dur = time.partition("/")
-        dts = parser.parse(dt).astimezone(self.tz)
-        dte = dts + parse_duration(dur)  # , relative=True)
+        dts, dte = parse_interval(time)
+        start, end = stime.timestamp(), etime.timestamp()
 
-        if stime >= dts and stime < dte or etime >= dts and etime < dte:
-            return dts, dte
+        if dts <= start < dte or dts <= end < dte:
+            return (
+                datetime.fromtimestamp(dts, self.tz),
+                datetime.fromtimestamp(dte, self.tz),
+            )
 
         return None, None
 
+    def get_table(self, metric: str) -> Tuple[IntervalIndex, List[Any]]:
+        """
+        Get a non-numeric metric's interval index and values.
+
+        Args:
+            metric: Metric name (e.g., 'weather')
+
+        Returns:
+            Tuple of (IntervalIndex, values)
+        """
+        if metric not in self.tables:
+            self.tables[metric] = (
+                self.data.get_table(metric) if self.data else (IntervalIndex([]), [])
+            )
+
+        return self.tables[metric]
+
+    def get_series(self, metric: str) -> Series:
+        """
+        Get the columnar series for a metric.
+
+        Args:
+            metric: Metric name (e.g., 'temperature', 'precipitation')
+
+        Returns:
+            Series for the metric
+        """
+        return self.data.get_series(metric) if self.data else Series.from_layer(None)
+
+    def get_samples(self, metric: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the hourly samples of a metric within the current interval.
+
+        Only get_values() and get_times() need these; the aggregates are
+        computed directly from the runs.
+
+        Args:
+            metric: Metric name (e.g., 'temperature', 'precipitation')
+
+        Returns:
+            Tuple of (times, values) arrays, times in epoch seconds
+        """
+        if metric not in self.samples:
+            self.samples[metric] = self.get_series(metric).sample(*self.window)
+
+        return self.samples[metric]
+
     def get_values(self, metric: str) -> List[Optional[float]]:
         """
         Get hourly values for a specific metric.
@@ -114,188 +210,374 @@ class GridPoints(WeatherBase):
             List of values
         """
         if metric not in self.values:
-            vals = []
-            times = []
-            stime = self.stime
-            for value in self.data.get(metric, {}).get("values", {}):
-                dts, dte = self.in_range(value["validTime"], stime, self.etime)
-                if dts and dte:
-                    v = value["value"]
-                    while stime < self.etime and stime < dte:
-                        vals.append(v)
-                        times.append(stime)
-                        stime += relativedelta(hours=+1)
-                if stime >= self.etime:
-                    break
-            self.values[metric] = vals
-            self.times[metric] = times
+            self.values[metric] = series.to_list(self.get_samples(metric)[1])
 
         return self.values[metric]
 
-    def get_low(self, metric: str) -> Optional[float]:
-        """Get the low value for a metric."""
-        if metric not in self.lows:
-            values = [value for value in self.get_values(metric) if value is not None]
-            if len(values) == 0:
-                self.lows[metric] = None
+    def get_summary(self, window: Tuple[float, float]) -> Dict[str, Aggregate]:
+        """
+        Get the aggregates kept for a window.
+
+        They start out as the merged quarter summaries computed when the
+        data was fetched, if the window is made of whole quarters, so
+        forecasts for the usual periods need no series processing.
+
+        Args:
+            window: (start, end) in epoch seconds
+
+        Returns:
+            Dict of metric name to Aggregate, added to as metrics are read
+        """
+        if window not in self.aggregates:
+            summaries = self.data.summaries if self.data else None
+            summary = summaries.get(*window) if summaries else None
+            if summary is None:
+                self.aggregates[window] = {}
             else:
-                self.lows[metric] = min(values)
+                self.aggregates[window], self.phrases[window] = summary
+
+        return self.aggregates[window]
+
+    def get_aggregate(self, metric: str) -> Aggregate:
+        """
+        Get the summary of a metric over the current interval.
+
+        Args:
+            metric: Metric name (e.g., 'temperature', 'precipitation')
+
+        Returns:
+            Aggregate for the metric
+        """
+        if metric not in self.current:
+            self.current[metric] = self.get_series(metric).aggregate(
+                [self.window[0]], [self.window[1]]
+            )[0]
 
-        return self.lows[metric]
+        return self.current[metric]
+
+    def query(
+        self, windows: List[Tuple[Any, Any]], metrics: List[str]
+    ) -> List[Dict[str, Aggregate]]:
+        """
+        Summarize several metrics over several windows in one pass.
+
+        Windows made of whole quarters come from the quarter summaries, and
+        each metric's series is searched once for all of the others.  The
+        results are kept, so a later set_interval() for one of the windows
+        answers the low/high/initial/final/total getters without further
+        work.
+
+        Args:
+            windows: (start, end) times for each window
+            metrics: Numeric metric names (e.g., 'temperature')
+
+        Returns:
+            Dict of metric name to Aggregate for each window
+        """
+        bounds = [(stime.timestamp(), etime.timestamp()) for stime, etime in windows]
+        results = [self.get_summary(window) for window in bounds]
+        for metric in metrics:
+            pending = [i for i, result in enumerate(results) if metric not in result]
+            if not pending:
+                continue
+            aggregates = self.get_series(metric).aggregate(
+                [bounds[i][0] for i in pending], [bounds[i][1] for i in pending]
+            )
+            for i, aggregate in zip(pending, aggregates):
+                results[i][metric] = aggregate
+
+        return [dict(result) for result in results]
+
+    def get_low(self, metric: str) -> Optional[float]:
+        """Get the low value for a metric."""
+        return self.get_aggregate(metric).low
 
     def get_high(self, metric: str) -> Optional[float]:
         """Get the high value for a metric."""
-        if metric not in self.highs:
-            values = [value for value in self.get_values(metric) if value is not None]
-            if len(values) == 0:
-                self.highs[metric] = None
-            else:
-                self.highs[metric] = max(values)
-
-        return self.highs[metric]
+        return self.get_aggregate(metric).high
 
     def get_initial(self, metric: str) -> Optional[float]:
         """Get the initial value for a metric."""
-        values = self.get_values(metric)
-        return values[0] if len(values) > 0 else None
+        return self.get_aggregate(metric).initial
 
     def get_final(self, metric: str) -> Optional[float]:
         """Get the final value for a metric."""
-        values = self.get_values(metric)
-        return values[-1] if len(values) > 0 else None
+        return self.get_aggregate(metric).final
+
+    def get_total(self, metric: str) -> Optional[float]:
+        """Get the amount of a metric accumulated over the interval."""
+        return self.get_aggregate(metric).total
 
     def get_times(self, metric: str) -> List[Any]:
         """Get the times associated with a metric."""
-        self.get_values(metric)
-        return self.times.get(metric, [])
+        return [
+            datetime.fromtimestamp(t, self.tz)
+            for t in self.get_samples(metric)[0].tolist()
+        ]
+
+    def get_threshold(self, metric: str, op: str, value: float) -> Threshold:
+        """
+        Get the index of a metric's runs meeting a threshold.
+
+        Args:
+            metric: Metric name (e.g., 'temperature')
+            op: Comparison, one of ">", ">=", "<" or "<="
+            value: Threshold in the layer's units (e.g., degrees C, km/h)
+
+        Returns:
+            Threshold index, built once per metric and threshold
+        """
+        return self.get_series(metric).threshold(op, value)
+
+    def get_horizon(
+        self, stime: Optional[Any] = None, etime: Optional[Any] = None
+    ) -> Tuple[float, float]:
+        """
+        Get the span a threshold query searches.
+
+        Args:
+            stime: Start time (default: now)
+            etime: End time (default: end of the forecast's validTimes)
+
+        Returns:
+            (start, end) in epoch seconds
+        """
+        start = time() if stime is None else stime.timestamp()
+        if etime is not None:
+            end = etime.timestamp()
+        elif self.data and self.data.valid_times:
+            end = self.valid_times[1]
+        else:
+            end = start
+
+        return start, end
+
+    def first_time(
+        self,
+        metric: str,
+        op: str,
+        value: float,
+        stime: Optional[Any] = None,
+        etime: Optional[Any] = None,
+    ) -> Optional[datetime]:
+        """
+        Find when a metric first meets a threshold, e.g. "will it rain?".
+
+        Args:
+            metric: Metric name (e.g., 'probabilityOfPrecipitation')
+            op: Comparison, one of ">", ">=", "<" or "<="
+            value: Threshold in the layer's units
+            stime: Start of the search (default: now)
+            etime: End of the search (default: end of the forecast)
+
+        Returns:
+            Time the threshold is met (stime if it already is) or None
+        """
+        found = self.get_threshold(metric, op, value).first(
+            *self.get_horizon(stime, etime)
+        )
+        return None if found is None else datetime.fromtimestamp(found, self.tz)
+
+    def next_crossing(
+        self,
+        metric: str,
+        op: str,
+        value: float,
+        stime: Optional[Any] = None,
+        etime: Optional[Any] = None,
+    ) -> Optional[datetime]:
+        """
+        Find when a metric next crosses a threshold, e.g. "when will it
+        drop below freezing?" or "when does the wind pick up?".
+
+        Args:
+            metric: Metric name (e.g., 'temperature')
+            op: Comparison, one of ">", ">=", "<" or "<="
+            value: Threshold in the layer's units
+            stime: Start of the search (default: now)
+            etime: End of the search (default: end of the forecast)
+
+        Returns:
+            Time the threshold starts being met after stime, or None
+        """
+        found = self.get_threshold(metric, op, value).next_crossing(
+            *self.get_horizon(stime, etime)
+        )
+        return None if found is None else datetime.fromtimestamp(found, self.tz)
+
+    def get_spans(
+        self,
+        metric: str,
+        op: str,
+        value: float,
+        stime: Optional[Any] = None,
+        etime: Optional[Any] = None,
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        Find the stretches of time a metric meets a threshold.
+
+        Args:
+            metric: Metric name (e.g., 'windSpeed')
+            op: Comparison, one of ">", ">=", "<" or "<="
+            value: Threshold in the layer's units
+            stime: Start of the search (default: now)
+            etime: End of the search (default: end of the forecast)
+
+        Returns:
+            (start, end) times of each stretch
+        """
+        spans = self.get_threshold(metric, op, value).spans(
+            *self.get_horizon(stime, etime)
+        )
+        return [
+            (datetime.fromtimestamp(start, self.tz), datetime.fromtimestamp(end, self.tz))
+            for start, end in spans
+        ]
+
+    def get_duration(
+        self,
+        metric: str,
+        op: str,
+        value: float,
+        stime: Optional[Any] = None,
+        etime: Optional[Any] = None,
+    ) -> timedelta:
+        """
+        Measure how long a metric meets a threshold.
+
+        Args:
+            metric: Metric name (e.g., 'temperature')
+            op: Comparison, one of ">", ">=", "<" or "<="
+            value: Threshold in the layer's units
+            stime: Start of the search (default: now)
+            etime: End of the search (default: end of the forecast)
+
+        Returns:
+            Time spent meeting the threshold
+        """
+        seconds = self.get_threshold(metric, op, value).duration(
+            *self.get_horizon(stime, etime)
+        )
+        return timedelta(seconds=seconds)
 
     # Temperature properties
     @property
-    def temp_low(self): -> Optional[str]:
+    def temp_low(self) -> Optional[str]:
         return self.c_to_f(self.get_low("temperature"))
 
     @property
-    def temp_high(self): -> Optional[str]:
+    def temp_high(self) -> Optional[str]:
         return self.c_to_f(self.get_high("temperature"))
 
     @property
-    def temp_initial(self): -> Optional[str]:
+    def temp_initial(self) -> Optional[str]:
         return self.c_to_f(self.get_initial("temperature"))
 
     @property
-    def temp_final(self): -> Optional[str]:
+    def temp_final(self) -> Optional[str]:
         return self.c_to_f(self.get_final("temperature"))
 
     # Humidity properties
     @property
-    def humidity_low(self): -> Optional[int]:
+    def humidity_low(self) -> Optional[int]:
         return self.to_percent(self.get_low("relativeHumidity"))
 
     @property
-    def humidity_high(self): -> Optional[int]:
+    def humidity_high(self) -> Optional[int]:
         return self.to_percent(self.get_high("relativeHumidity"))
 
     @property
-    def humidity_initial(self): -> Optional[int]:
+    def humidity_initial(self) -> Optional[int]:
         return self.to_percent(self.get_initial("relativeHumidity"))
 
     @property
-    def humidity_final(self): -> Optional[int]:
+    def humidity_final(self) -> Optional[int]:
         return self.to_percent(self.get_final("relativeHumidity"))
 
     # Dewpoint properties
     @property
-    def dewpoint_low(self): -> Optional[str]:
+    def dewpoint_low(self) -> Optional[str]:
         return self.c_to_f(self.get_low("dewpoint"))
 
     @property
-    def dewpoint_high(self): -> Optional[str]:
+    def dewpoint_high(self) -> Optional[str]:
         return self.c_to_f(self.get_high("dewpoint"))
 
     @property
-    def dewpoint_initial(self): -> Optional[str]:
+    def dewpoint_initial(self) -> Optional[str]:
         return self.c_to_f(self.get_initial("dewpoint"))
 
     @property
-    def dewpoint_final(self): -> Optional[str]:
+    def dewpoint_final(self) -> Optional[str]:
         return self.c_to_f(self.get_final("dewpoint"))
 
     # Barometric pressure properties
     @property
-    def pressure_low(self): -> Optional[str]:
+    def pressure_low(self) -> Optional[str]:
         return self.pa_to_in(self.get_low("pressure"))
 
     @property
-    def pressure_high(self): -> Optional[str]:
+    def pressure_high(self) -> Optional[str]:
         return self.pa_to_in(self.get_high("pressure"))
 
     @property
-    def pressure_initial(self): -> Optional[str]:
+    def pressure_initial(self) -> Optional[str]:
         return self.pa_to_in(self.get_initial("pressure"))
 
     @property
-    def pressure_final(self): -> Optional[str]:
+    def pressure_final(self) -> Optional[str]:
         return self.pa_to_in(self.get_final("pressure"))
 
     # Precipitation properties
     @property
-    def precip_chance_low(self): -> Optional[int]:
+    def precip_chance_low(self) -> Optional[int]:
         return self.to_percent(self.get_low("probabilityOfPrecipitation"))
 
     @property
-    def precip_chance_high(self): -> Optional[int]:
+    def precip_chance_high(self) -> Optional[int]:
         return self.to_percent(self.get_high("probabilityOfPrecipitation"))
 
     @property
-    def precip_chance_initial(self): -> Optional[int]:
+    def precip_chance_initial(self) -> Optional[int]:
         return self.to_percent(self.get_initial("probabilityOfPrecipitation"))
 
     @property
-    def precip_chance_final(self): -> Optional[int]:
+    def precip_chance_final(self) -> Optional[int]:
         return self.to_percent(self.get_final("probabilityOfPrecipitation"))
 
     @property
-    def precip_amount_low(self): -> Optional[Union[str, Tuple[float, str, str]]]:
+    def precip_amount_low(self) -> Optional[Union[str, Tuple[float, str, str]]]:
         return self.mm_to_in(self.get_low("quantitativePrecipitation"), as_text=True)
 
     @property
-    def precip_amount_high(self): -> Optional[Union[str, Tuple[float, str, str]]]:
+    def precip_amount_high(self) -> Optional[Union[str, Tuple[float, str, str]]]:
         return self.mm_to_in(self.get_high("quantitativePrecipitation"), as_text=True)
 
     @property
-    def precip_amount_initial(self): -> Optional[Union[str, Tuple[float, str, str]]]:
+    def precip_amount_initial(self) -> Optional[Union[str, Tuple[float, str, str]]]:
         return self.mm_to_in(
             self.get_initial("quantitativePrecipitation"), as_text=True
         )
 
     @property
-    def precip_amount_final(self): -> Optional[Union[str, Tuple[float, str, str]]]:
+    def precip_amount_final(self) -> Optional[Union[str, Tuple[float, str, str]]]:
         return self.mm_to_in(self.get_final("quantitativePrecipitation"), as_text=True)
 
     @property
-    def precip_total(self): -> Optional[Union[str, Tuple[float, str, str]]]:
-        values = [
-            value
-            for value in self.get_values("quantitativePrecipitation")
-            if value is not None
-        ]
-        if len(values) == 0:
+    def precip_total(self) -> Optional[Union[str, Tuple[float, str, str]]]:
+        total = self.get_total("quantitativePrecipitation")
+        if total is None:
             return None
-        return self.mm_to_in(sum(values))
+        return self.mm_to_in(total)
 
     @property
-    def precip_probability(self): -> Optional[str]:
+    def precip_probability(self) -> Optional[str]:
         return self.to_percent(self.get_high("probabilityOfPrecipitation"))
 
     @property
-    def precip_text(self): -> str:
+    def precip_text(self) -> str:
         inches, amt, whole = self.mm_to_in(
-            sum(
-                [
-                    value if value else 0
-                    for value in self.get_values("quantitativePrecipitation")
-                ]
-            ),
+            self.get_total("quantitativePrecipitation") or 0,
             True,
         )
         if inches == "0.00":
@@ -314,34 +596,32 @@ class GridPoints(WeatherBase):
 
     # Snow properties
     @property
-    def snow_amount_low(self): -> Optional[Union[str, Tuple[float, str, str]]]:
+    def snow_amount_low(self) -> Optional[Union[str, Tuple[float, str, str]]]:
         return self.mm_to_in(self.get_low("snowfallAmount"), as_text=True)
 
     @property
-    def snow_amount_high(self): -> Optional[Union[str, Tuple[float, str, str]]]:
+    def snow_amount_high(self) -> Optional[Union[str, Tuple[float, str, str]]]:
         return self.mm_to_in(self.get_high("snowfallAmount"), as_text=True)
 
     @property
-    def snow_amount_initial(self): -> Optional[Union[str, Tuple[float, str, str]]]:
+    def snow_amount_initial(self) -> Optional[Union[str, Tuple[float, str, str]]]:
         return self.mm_to_in(self.get_initial("snowfallAmount"), as_text=True)
 
     @property
-    def snow_amount_final(self): -> Optional[Union[str, Tuple[float, str, str]]]:
+    def snow_amount_final(self) -> Optional[Union[str, Tuple[float, str, str]]]:
         return self.mm_to_in(self.get_final("snowfallAmount"), as_text=True)
 
     @property
-    def snow_total(self): -> Optional[Union[str, Tuple[float, str, str]]]:
-        values = [
-            value for value in self.get_values("snowfallAmount") if value is not None
-        ]
-        if len(values) == 0:
+    def snow_total(self) -> Optional[Union[str, Tuple[float, str, str]]]:
+        total = self.get_total("snowfallAmount")
+        if total is None:
             return None
-        return self.mm_to_in(sum(values))
+        return self.mm_to_in(total)
 
     @property
-    def snow_text(self): -> str:
+    def snow_text(self) -> str:
         inches, amt, whole = self.mm_to_in(
-            sum([value if value else 0 for value in self.get_values("snowfallAmount")]),
+            self.get_total("snowfallAmount") or 0,
             True,
         )
         if inches == "0.00":
@@ -360,125 +640,97 @@ class GridPoints(WeatherBase):
 
     # Wind properties
     @property
-    def wind_speed_low(self): -> Optional[str]:
+    def wind_speed_low(self) -> Optional[str]:
         return self.kph_to_mph(self.get_low("windSpeed"))
 
     @property
-    def wind_speed_high(self): -> Optional[str]:
+    def wind_speed_high(self) -> Optional[str]:
         return self.kph_to_mph(self.get_high("windSpeed"))
 
     @property
-    def wind_speed_initial(self): -> Optional[str]:
+    def wind_speed_initial(self) -> Optional[str]:
         return self.kph_to_mph(self.get_initial("windSpeed"))
 
     @property
-    def wind_speed_final(self): -> Optional[str]:
+    def wind_speed_final(self) -> Optional[str]:
         return self.kph_to_mph(self.get_final("windSpeed"))
 
     @property
-    def wind_direction_initial(self): -> Optional[str]:
+    def wind_direction_initial(self) -> Optional[str]:
         return self.da_to_dir(self.get_initial("windDirection"))
 
     @property
-    def wind_direction_final(self): -> Optional[str]:
+    def wind_direction_final(self) -> Optional[str]:
         return self.da_to_dir(self.get_final("windDirection"))
 
     @property
-    def wind_gust_low(self): -> Optional[str]:
+    def wind_gust_low(self) -> Optional[str]:
         return self.kph_to_mph(self.get_low("windGust"))
 
     @property
-    def wind_gust_high(self): -> Optional[str]:
+    def wind_gust_high(self) -> Optional[str]:
         return self.kph_to_mph(self.get_high("windGust"))
 
     @property
-    def wind_gust_initial(self): -> Optional[str]:
+    def wind_gust_initial(self) -> Optional[str]:
         return self.kph_to_mph(self.get_initial("windGust"))
 
     @property
-    def wind_gust_final(self): -> Optional[str]:
+    def wind_gust_final(self) -> Optional[str]:
         return self.kph_to_mph(self.get_final("windGust"))
 
     # Heat index and wind chill
     @property
-    def heat_index_low(self): -> Optional[str]:
+    def heat_index_low(self) -> Optional[str]:
         return self.c_to_f(self.get_low("heatIndex"))
 
     @property
-    def heat_index_high(self): -> Optional[str]:
+    def heat_index_high(self) -> Optional[str]:
         return self.c_to_f(self.get_high("heatIndex"))
 
     @property
-    def heat_index_initial(self): -> Optional[str]:
+    def heat_index_initial(self) -> Optional[str]:
         return self.c_to_f(self.get_initial("heatIndex"))
 
     @property
-    def heat_index_final(self): -> Optional[str]:
+    def heat_index_final(self) -> Optional[str]:
         return self.c_to_f(self.get_final("heatIndex"))
 
     @property
-    def wind_chill_low(self): -> Optional[str]:
+    def wind_chill_low(self) -> Optional[str]:
         return self.c_to_f(self.get_low("windChill"))
 
     @property
-    def wind_chill_high(self): -> Optional[str]:
+    def wind_chill_high(self) -> Optional[str]:
         return self.c_to_f(self.get_high("windChill"))
 
     @property
-    def wind_chill_initial(self): -> Optional[str]:
+    def wind_chill_initial(self) -> Optional[str]:
         return self.c_to_f(self.get_initial("windChill"))
 
     @property
-    def wind_chill_final(self): -> Optional[str]:
+    def wind_chill_final(self) -> Optional[str]:
         return self.c_to_f(self.get_final("windChill"))
 
     # Sky cover
     @property
-    def skys_initial(self): -> Optional[str]:
+    def skys_initial(self) -> Optional[str]:
         return self.to_skys(self.get_initial("skyCover"), self.is_day(self.stime))
 
     @property
-    def skys_final(self): -> Optional[str]:
+    def skys_final(self) -> Optional[str]:
         return self.to_skys(self.get_final("skyCover"), self.is_day(self.stime))
 
     @property
-    def weather_text(self): -> str:
+    def weather_text(self) -> str:
         """
         Provides a description of the expected weather.
         TODO: Not at all happy with this. It needs to be redone.
         """
-        d = []
-
-        for w in self.data.get("weather", {}).get("values", []):
-            dts, dte = self.in_range(w["validTime"], self.stime, self.etime)
-            if not dts or not dte:
-                continue
+        if self.window not in self.phrases:
+            index, values = self.get_table("weather")
+            self.phrases[self.window] = weather_phrases(
+                [values[i] for i in index.overlapping(*self.window)]
+            )
 
-            for v in w["value"]:
-                cov = WEATHER_COVERAGE.get(v.get("coverage", ""), "")
-                wea = WEATHER_WEATHER.get(v.get("weather", ""), "")
-                v.get("visibility", {}).get("value", "")
-                ints = v.get("intensity", "")
-                inte = WEATHER_INTENSITY.get(ints, ["", 0])
-                atts = v.get("attributes", [])
-                att = []
-
-                if inte[1] >= 4:
-                    inte = "heavy"
-                elif inte[1] >= 3:
-                    inte = "moderate"
-                elif inte[1] >= 2:
-                    inte = "light"
-                else:
-                    inte = ""
-
-                for a in atts:
-                    t = WEATHER_ATTRIBUTES.get(a, "")
-                    if t:
-                        att.append(t)
-
-                txt = " ".join([s for s in [cov, inte, wea] + att if s])
-                if txt not in d and txt:
-                    d.append(txt)
-
-        return ", then ".join(d) if d else ""
+        return ", then ".join(self.phrases[self.window])
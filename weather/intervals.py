@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+
+# =============================================================================
+#
+# Copyright 2017 by Leland Lucius
+#
+# Released under the GNU Affero GPL
+# See: https://github.com/lllucius/climacast/blob/master/LICENSE
+#
+# =============================================================================
+
+"""
+ISO 8601 interval parsing and lookup for NWS gridpoint data.
+
+NWS intervals look like "2024-01-01T06:00:00+00:00/PT3H".  Timestamps are
+parsed with datetime.fromisoformat and durations, of which there are only
+a handful of distinct strings, are memoized.  An IntervalIndex answers
+overlap and containment queries with bisect over sorted epoch seconds.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+from aniso8601.duration import parse_duration
+
+DURATION_RE = re.compile(
+    r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?)?$"
+)
+
+
+def parse_timestamp(value: str) -> float:
+    """
+    Convert an ISO 8601 timestamp to epoch seconds.
+
+    Args:
+        value: Timestamp such as "2024-01-01T06:00:00+00:00"
+
+    Returns:
+        Epoch seconds
+    """
+    return datetime.fromisoformat(value).timestamp()
+
+
+@lru_cache(maxsize=256)
+def duration_seconds(value: str) -> float:
+    """
+    Convert an ISO 8601 duration to seconds.
+
+    Args:
+        value: Duration such as "PT3H" or "P1DT6H"
+
+    Returns:
+        Length of the duration in seconds
+    """
+    match = DURATION_RE.match(value)
+    if match and value not in ("P", "PT") and not value.endswith("T"):
+        days, hours, minutes, seconds = match.groups()
+        return (
+            int(days or 0) * 86400
+            + int(hours or 0) * 3600
+            + int(minutes or 0) * 60
+            + float(seconds or 0)
+        )
+
+    # Weeks, months, etc. are rare enough to take the slow path
+    return parse_duration(value).total_seconds()
+
+
+def parse_interval(value: str) -> Tuple[float, float]:
+    """
+    Convert an ISO 8601 "start/duration" interval to epoch seconds.
+
+    Args:
+        value: Interval such as "2024-01-01T06:00:00+00:00/PT3H"
+
+    Returns:
+        Tuple of (start, end) epoch seconds
+    """
+    start, _, duration = value.partition("/")
+    start = parse_timestamp(start)
+    return start, start + duration_seconds(duration)
+
+
+class IntervalIndex(object):
+    """
+    Sorted, non-overlapping intervals supporting bisect lookups.
+
+    Positions returned refer to the order the intervals were given in,
+    which for NWS layers is already time order.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[float, float]]) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            intervals: (start, end) epoch seconds for each interval
+        """
+        pairs = list(intervals)
+        self.order = sorted(range(len(pairs)), key=lambda i: pairs[i][0])
+        self.starts: List[float] = [pairs[i][0] for i in self.order]
+        self.ends: List[float] = [pairs[i][1] for i in self.order]
+
+    @classmethod
+    def from_values(cls, values: Iterable[dict]) -> "IntervalIndex":
+        """
+        Build the index for a gridpoint layer's "values" list.
+
+        Args:
+            values: Entries with a "validTime" interval
+
+        Returns:
+            IntervalIndex over the entries
+        """
+        return cls(parse_interval(value["validTime"]) for value in values)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlapping(self, start: float, end: float) -> List[int]:
+        """
+        Find the intervals that overlap [start, end).
+
+        Args:
+            start: Window start in epoch seconds
+            end: Window end in epoch seconds
+
+        Returns:
+            Positions of the overlapping intervals in time order
+        """
+        lo = bisect_right(self.ends, start)
+        hi = bisect_left(self.starts, end)
+        return self.order[lo:hi]
+
+    def containing(self, when: float) -> Optional[int]:
+        """
+        Find the interval that contains a time.
+
+        Args:
+            when: Time in epoch seconds
+
+        Returns:
+            Position of the interval or None
+        """
+        i = bisect_right(self.starts, when) - 1
+        if i >= 0 and when < self.ends[i]:
+            return self.order[i]
+        return None
@@ -23,8 +23,9 @@ import json
 
 from dateutil import tz
 
+from utils import metrics
 from utils.constants import LOCATION_XLATE, STATES
-from utils.factories import get_geolocator
+from utils.factories import get_executor, get_geolocator
 from utils.notify import notify
 from weather.base import WeatherBase
 
@@ -87,8 +88,10 @@ class Location(WeatherBase):
                 else None
             )
             if loc is not None:
+                metrics.incr("location_cache.hit")
                 self.loc = loc
                 return None
+            metrics.incr("location_cache.miss")
 
             # Have a new location, so retrieve the base info
             coords, props = self.mapquest("%s" % name)
@@ -123,6 +126,11 @@ class Location(WeatherBase):
                 if self.cache_handler
                 else None
             )
+            if loc is not None:
+                metrics.incr("location_cache.hit")
+                self.loc = loc
+                return None
+            metrics.incr("location_cache.miss")
 
             # Have a new location, so retrieve the base info
             coords, props = self.mapquest("%s+%s" % (city, state))
@@ -166,37 +174,95 @@ class Location(WeatherBase):
         loc["gridPoint"] = "%s,%s" % (point["gridX"], point["gridY"])
         loc["timeZone"] = point["timeZone"]
 
+        # Everything below depends only on the point, so run the remaining
+        # lookups concurrently: geocode -> points -> {coords, zones, stations}
+        executor = get_executor()
+        coords_future = executor.submit(self.get_coords, loc, coords)
+        forecast_future = executor.submit(
+            self.get_forecast_zone, point["forecastZone"]
+        )
+        county_future = executor.submit(self.get_county, point, props, loc["state"])
+        stations_future = executor.submit(
+            self.https, point["observationStations"] + "?limit=5"
+        )
+
+        loc["coords"] = coords_future.result()
+
+        # Retrieve the forecast zone name
+        data = forecast_future.result()
+        loc["forecastZoneId"] = data["id"]
+        loc["forecastZoneName"] = data["name"]
+
+        # Retrieve the county zone name
+        data = county_future.result()
+        loc["countyZoneId"] = data.get("id", "missing")
+        loc["countyZoneName"] = data.get("name", "missing")
+
+        # Retrieve the observation stations
+        loc["observationStations"] = stations_future.result()
+
+        # Put it to the cache
+        loc["location"] = "%s %s" % (city, state) if state else city
+        if self.cache_handler:
+            self.cache_handler.put_location(loc["location"], loc)
+
+        # And remember
+        self.loc = loc
+
+        return None
+
+    def get_coords(self, loc: Dict[str, Any], coords: Tuple[float, float]) -> Any:
+        """
+        Get the coordinates of the NWS city for the given location.
+
+        Args:
+            loc: Location data with the NWS city and state
+            coords: Geocoded coordinates to fall back on
+
+        Returns:
+            Coordinates of the NWS city
+        """
         # Retrieve the location data from the cache
         rloc = (
             self.cache_handler.get_location("%s %s" % (loc["city"], loc["state"]))
             if self.cache_handler
             else None
         )
-        if rloc is None:
-            # Have a new location, so retrieve the base info
-            rcoords, _ = self.mapquest("%s+%s" % (loc["city"], loc["state"]))
-            if rcoords is not None:
-                loc["coords"] = "%s,%s" % (rcoords[0], rcoords[1])
-            else:
-                loc["coords"] = coords
-        else:
-            loc["coords"] = rloc["coords"]
+        if rloc is not None:
+            return rloc["coords"]
 
-        # Retrieve the forecast zone name
-        data = self.get_forecast_zone(point["forecastZone"])
-        loc["forecastZoneId"] = data["id"]
-        loc["forecastZoneName"] = data["name"]
+        # Have a new location, so retrieve the base info
+        rcoords, _ = self.mapquest("%s+%s" % (loc["city"], loc["state"]))
+        if rcoords is not None:
+            return "%s,%s" % (rcoords[0], rcoords[1])
+
+        return coords
+
+    def get_county(
+        self, point: Dict[str, Any], props: Optional[Dict[str, str]], state: str
+    ) -> Dict[str, Any]:
+        """
+        Get the county zone for the given NWS point.
+
+        Args:
+            point: NWS points data
+            props: Geocoder properties for the location
+            state: State name
+
+        Returns:
+            Dict containing county zone information
+        """
+        county_id = point.get("county")
 
         # Some NWS locations are missing the county zone, so try to deduce it by getting
         # the county coordinates from the geolocator and asking NWS for that point.
-        if "county" not in point and "County" in props:
+        if county_id is None and props and "County" in props:
             county = props["County"].lower().split()
             if county[-1] == "county":
                 county[-1] = ""
             county = " ".join(list(county))
-            coords, props = self.mapquest("%s+county+%s" % (county, loc["state"]))
+            coords, _ = self.mapquest("%s+county+%s" % (county, state))
             if coords is not None:
-                print("PT==================================")
                 pt = self.https(
                     "points/%s,%s"
                     % (
@@ -204,29 +270,10 @@ class Location(WeatherBase):
                         ("%.4f" % coords[1]).rstrip("0").rstrip("."),
                     )
                 )
-                print("pt", pt)
-                if "county" in pt:
-                    point["county"] = pt["county"]
+                if pt and "county" in pt:
+                    county_id = pt["county"]
 
-        # Retrieve the county zone name
-        data = self.get_county_zone(point.get("county", "missing"))
-        loc["countyZoneId"] = data.get("id", "missing")
-        loc["countyZoneName"] = data.get("name", "missing")
-
-        # Retrieve the observation stations
-        loc["observationStations"] = self.https(
-            point["observationStations"] + "?limit=5"
-        )
-
-        # Put it to the cache
-        loc["location"] = "%s %s" % (city, state) if state else city
-        if self.cache_handler:
-            self.cache_handler.put_location(loc["location"], loc)
-
-        # And remember
-        self.loc = loc
-
-        return None
+        return self.get_county_zone(county_id or "missing")
 
     def mapquest(self, search: str) -> Tuple[Optional[Tuple[float, float]], Optional[Dict[str, str]]]:
         """
@@ -16,12 +16,43 @@ This module provides the Observations class for processing current weather
 conditions from National Weather Service observation stations.
 """
 
-from typing import Any, Dict, List, Optional
+from concurrent.futures import FIRST_COMPLETED, TimeoutError, wait
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Any, Dict, List, Optional, Tuple
 
-from datetime import datetime
+import httpx
 
+from storage.observation_cache import ObservationCache
+from utils import metrics
+from utils.config import Config
+from utils.deadline import get_timeout
+from utils.factories import get_executor
 from weather.base import WeatherBase
 
+# Members of an observation that are spoken, filled from other stations
+# when the nearest one doesn't report them
+FIELDS = [
+    "textDescription",
+    "temperature",
+    "dewpoint",
+    "relativeHumidity",
+    "windSpeed",
+    "windDirection",
+    "windGust",
+    "barometricPressure",
+]
+
+# Members filled together from one station, keyed by the member that
+# station must report
+GROUPS = {
+    "windSpeed": ["windSpeed", "windDirection", "windGust"],
+}
+
+# Members derived from a station's own temperature and wind, so never
+# filled from another station.  NWS reports at most one of them.
+DERIVED = ["windChill", "heatIndex"]
+
 
 class Observations(WeatherBase):
     """
@@ -37,30 +68,216 @@ class Observations(WeatherBase):
 
         Args:
             event: Event dictionary
-            stations: List of station IDs to query
+            stations: Observation stations collection, nearest first
             cache_handler: Optional cache handler
         """
         super().__init__(event, cache_handler)
         self.data = None
         self.station = None
-        import json
-
-        for station in stations["@graph"]:
-            print("STATIOPNS")
-            print(json.dumps(station, indent=4))
-            stationId = station["stationIdentifier"]
-            station = self.get_station(stationId)
-            print("STAT")
-            print(json.dumps(station, indent=4))
-            if station:
-                # data = self.https(f"stations/{stationId}/observations/latest")
-                print("ASDFASDFASDFASDFASDF")
-                data = self.https(f"stations/{stationId}/observations?limit=10")
-                if data:
-                    self.data = data
-                    self.station = station
+        self.sources: Dict[str, str] = {}
+        self.candidates: Dict[str, Dict[str, Any]] = {}
+
+        # Ask the nearest few stations at once, waiting at most
+        # OBSERVATION_PROBE_TIMEOUT in all for the nearest ones.  The nearest
+        # station reporting a temperature provides the observation, and any
+        # field it lacks comes from the nearest other station that has it.
+        # Stop early once every field is filled.
+        candidates = stations.get("@graph", [])[: Config.OBSERVATION_PROBE_STATIONS]
+        self.candidates = {station["stationIdentifier"]: station for station in candidates}
+        executor = get_executor()
+        futures = [
+            executor.submit(self.probe, station["stationIdentifier"])
+            for station in candidates
+        ]
+        ends = monotonic() + get_timeout(Config.OBSERVATION_PROBE_TIMEOUT)
+        reports = {}
+        late = []
+        for rank, future in enumerate(futures):
+            try:
+                data = future.result(timeout=max(0.0, ends - monotonic()))
+            except TimeoutError:
+                metrics.incr("observations.probe_timeout")
+                late.append(future)
+                continue
+            if data is not None:
+                reports[rank] = (candidates[rank], data)
+                if self.compose(reports) and not self.missing:
                     break
 
+        # With nothing usable yet, take the first usable report that arrives
+        # before the request runs out of time
+        ends = monotonic() + get_timeout(Config.HTTP_TIMEOUT)
+        while self.data is None and late:
+            done, _ = wait(
+                late, timeout=max(0.0, ends - monotonic()), return_when=FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for future in done:
+                late.remove(future)
+                if future.result() is not None:
+                    rank = futures.index(future)
+                    reports[rank] = (candidates[rank], future.result())
+            if self.compose(reports):
+                metrics.incr("observations.late")
+
+        # Probes still queued aren't needed; ones in flight finish in the
+        # background and leave their reports in the observation cache
+        for future in futures:
+            future.cancel()
+
+        if self.data is not None:
+            filled = [
+                field
+                for field, source in self.sources.items()
+                if source != self.station["id"]
+            ]
+            if filled:
+                metrics.incr("observations.filled_fields", len(filled))
+
+    def probe(self, stationId: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a station's latest observation, shared through the
+        observation cache.
+
+        Args:
+            stationId: Station identifier
+
+        Returns:
+            Dict containing the observation, or None if it's too old
+        """
+        cache = ObservationCache(self.cache_handler) if self.cache_handler else None
+        try:
+            data = self.https(
+                "stations/%s/observations/latest" % stationId, cache=cache, key=stationId
+            )
+        except httpx.HTTPError:
+            return None
+
+        return data if self.is_recent(data) else None
+
+    def compose(
+        self, reports: Dict[int, Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> bool:
+        """
+        Build the observation from the reports received so far.
+
+        Args:
+            reports: (station, observation) pairs by station rank, nearest
+                station first
+
+        Returns:
+            True if one of the reports has a temperature
+        """
+        ranks = sorted(reports)
+        rank = next(
+            (rank for rank in ranks if has_value(reports[rank][1].get("temperature"))),
+            None,
+        )
+        if rank is None:
+            return False
+
+        base = reports[rank]
+        station, data = base
+        if self.station is None or self.station["id"] != station["stationIdentifier"]:
+            self.station = self.get_probed_station(station)
+            if rank > 0:
+                metrics.incr("observations.fallback")
+
+        self.data = dict(data)
+        self.sources = {
+            field: station["stationIdentifier"]
+            for field in DERIVED
+            if has_value(data.get(field))
+        }
+        for field in FIELDS:
+            if field in self.sources:
+                continue
+            group = next((group for group in GROUPS.values() if field in group), [field])
+            for source, report in [base] + [reports[rank] for rank in ranks]:
+                if has_value(report.get(group[0])):
+                    for member in group:
+                        if member in report:
+                            self.data[member] = report[member]
+                        else:
+                            self.data.pop(member, None)
+                        self.sources[member] = source["stationIdentifier"]
+                    break
+
+        return True
+
+    @property
+    def missing(self) -> List[str]:
+        """Fields no station has reported yet, other than derived ones."""
+        return [field for field in FIELDS if field not in self.sources]
+
+    def is_recent(self, data: Optional[Dict[str, Any]]) -> bool:
+        """
+        Check that an observation is recent enough to speak.
+
+        Args:
+            data: Observation from NWS API, if any
+
+        Returns:
+            True if the observation can be used
+        """
+        if not data or data.get("status", 0) != 0:
+            return False
+        try:
+            reported = datetime.fromisoformat(data["timestamp"])
+        except (KeyError, TypeError, ValueError):
+            return False
+
+        age = datetime.now(timezone.utc) - reported
+        return age.total_seconds() <= Config.OBSERVATION_MAX_AGE_SECONDS
+
+    def get_probed_station(self, station: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the station information for a station from the stations list.
+
+        The list entries carry the station's name, so there's no need to
+        fetch the station itself.
+
+        Args:
+            station: Entry from the stations list
+
+        Returns:
+            Dict containing station information
+        """
+        stationId = station["stationIdentifier"]
+        cached = (
+            self.cache_handler.get_station(stationId) if self.cache_handler else None
+        )
+        return cached or self.put_station(station)
+
+    def source(self, field: str) -> Optional[str]:
+        """
+        Return the station that reported a field.
+
+        Args:
+            field: Observation member (e.g., "windGust")
+
+        Returns:
+            Station identifier, or None if no station reported it
+        """
+        return self.sources.get(field)
+
+    def reported_by(self, field: str) -> Optional[str]:
+        """
+        Return the name of the other station a field was filled from.
+
+        Args:
+            field: Observation member (e.g., "dewpoint")
+
+        Returns:
+            Station name, or None if the field came from the main station
+            or no station reported it
+        """
+        source = self.sources.get(field)
+        if source is None or source == self.station["id"]:
+            return None
+        return self.get_probed_station(self.candidates[source])["name"]
+
     @property
     def is_good(self) -> bool:
         """Current temperature in Fahrenheit."""
@@ -140,3 +357,18 @@ class Observations(WeatherBase):
     def pressure_trend(self) -> None:
         """Barometric pressure trend."""
         return None
+
+
+def has_value(value: Any) -> bool:
+    """
+    Check whether an observation member holds a value.
+
+    Args:
+        value: Member such as {"unitCode": ..., "value": 5.0} or a string
+
+    Returns:
+        True if the member isn't missing or null
+    """
+    if isinstance(value, dict):
+        return value.get("value") is not None
+    return bool(value)
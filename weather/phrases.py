@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+
+# =============================================================================
+#
+# Copyright 2017 by Leland Lucius
+#
+# Released under the GNU Affero GPL
+# See: https://github.com/lllucius/climacast/blob/master/LICENSE
+#
+# =============================================================================
+
+"""
+Spoken phrases for the NWS gridpoint "weather" layer.
+
+Each interval of the weather layer holds a list of conditions such as
+{"coverage": "chance", "weather": "rain_showers", "intensity": "light",
+"attributes": []}, and each condition is described by a short phrase like
+"a chance of light rain showers".
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.constants import (
+    WEATHER_ATTRIBUTES,
+    WEATHER_COVERAGE,
+    WEATHER_INTENSITY,
+    WEATHER_WEATHER,
+)
+
+# Words spoken for each intensity; "very light" is left unsaid
+INTENSITY_WORDS = {
+    name: (
+        "heavy" if level >= 4
+        else "moderate" if level >= 3
+        else "light" if level >= 2
+        else ""
+    )
+    for name, (_, level) in WEATHER_INTENSITY.items()
+}
+
+
+def describe(condition: Dict[str, Any]) -> str:
+    """
+    Describe one weather condition.
+
+    Args:
+        condition: Condition from a weather layer value
+
+    Returns:
+        Phrase for the condition (empty if nothing is known about it)
+    """
+    return compile_phrase(
+        condition.get("coverage", ""),
+        condition.get("weather", ""),
+        condition.get("intensity", ""),
+        tuple(condition.get("attributes") or ()),
+    )
+
+
+@lru_cache(maxsize=1024)
+def compile_phrase(
+    coverage: Optional[str],
+    weather: Optional[str],
+    intensity: Optional[str],
+    attributes: Tuple[str, ...],
+) -> str:
+    """
+    Render the phrase for one combination of condition fields.
+
+    There are only a few hundred combinations in practice, so each is
+    rendered once per container.
+
+    Args:
+        coverage: Coverage code (e.g., "chance")
+        weather: Weather code (e.g., "rain_showers")
+        intensity: Intensity code (e.g., "light")
+        attributes: Attribute codes (e.g., ("gusty_wind",))
+
+    Returns:
+        Phrase such as "a chance of light rain showers"
+    """
+    words = [
+        WEATHER_COVERAGE.get(coverage, ""),
+        INTENSITY_WORDS.get(intensity, ""),
+        WEATHER_WEATHER.get(weather, ""),
+    ]
+    words.extend(WEATHER_ATTRIBUTES.get(attribute, "") for attribute in attributes)
+
+    return " ".join(word for word in words if word)
+
+
+def weather_phrases(values: List[Optional[List[Dict[str, Any]]]]) -> List[str]:
+    """
+    Describe a run of weather layer values, without repeating phrases.
+
+    Args:
+        values: Weather layer values in time order
+
+    Returns:
+        Distinct phrases in the order they first occur
+    """
+    phrases = dict.fromkeys(
+        describe(condition) for value in values for condition in value or []
+    )
+    phrases.pop("", None)
+
+    return list(phrases)
@@ -0,0 +1,350 @@
+#!/usr/bin/python3
+
+# =============================================================================
+#
+# Copyright 2017 by Leland Lucius
+#
+# Released under the GNU Affero GPL
+# See: https://github.com/lllucius/climacast/blob/master/LICENSE
+#
+# =============================================================================
+
+"""
+Columnar time series for NWS gridpoint layers.
+
+Each layer's "values" list of {"validTime": "start/duration", "value": v}
+entries is parsed once into parallel NumPy arrays of interval start, end
+and value.  NWS layers are run-length encoded, so windows are aggregated
+directly over the runs they overlap; hourly samples are only produced
+when asked for.  Threshold questions ("when does it drop below
+freezing?") are answered from a per-threshold index of the runs that
+meet it, built once and then searched.
+"""
+
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from weather.intervals import parse_interval
+
+# Spacing of the samples returned for a window
+SAMPLE_SECONDS = 60 * 60
+
+# Comparisons a threshold can use
+COMPARISONS: Dict[str, Callable[[np.ndarray, float], np.ndarray]] = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+}
+
+
+class Aggregate(NamedTuple):
+    """Summary of one layer over one window; None where there's no data."""
+
+    low: Optional[float]
+    high: Optional[float]
+    initial: Optional[float]
+    final: Optional[float]
+    total: Optional[float]
+
+
+EMPTY = Aggregate(None, None, None, None, None)
+
+
+class Series(object):
+    """
+    One gridpoint layer as parallel arrays sorted by interval start.
+
+    Times are epoch seconds and missing values are NaN.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, values: np.ndarray) -> None:
+        """
+        Initialize the series.
+
+        Args:
+            starts: Interval start times
+            ends: Interval end times
+            values: Interval values
+        """
+        self.starts = starts
+        self.ends = ends
+        self.values = values
+        self.thresholds: Dict[Tuple[str, float], Threshold] = {}
+
+    @classmethod
+    def from_layer(cls, layer: Optional[Dict[str, Any]]) -> "Series":
+        """
+        Parse a gridpoint layer.
+
+        Args:
+            layer: Layer dict with a "values" list, if any
+
+        Returns:
+            Series for the layer (empty if there's no data)
+        """
+        entries = (layer or {}).get("values") or []
+        count = len(entries)
+        starts = np.empty(count, dtype=np.float64)
+        ends = np.empty(count, dtype=np.float64)
+        values = np.empty(count, dtype=np.float64)
+
+        for i, entry in enumerate(entries):
+            starts[i], ends[i] = parse_interval(entry["validTime"])
+            value = entry.get("value")
+            values[i] = np.nan if value is None else value
+
+        # NWS returns layers in time order, but don't depend on it
+        if count > 1 and np.any(starts[1:] < starts[:-1]):
+            order = np.argsort(starts, kind="stable")
+            starts, ends, values = starts[order], ends[order], values[order]
+
+        return cls(starts, ends, values)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def sample(
+        self, start: float, end: float, step: int = SAMPLE_SECONDS
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sample the series every step seconds from start up to end.
+
+        Samples that fall outside every interval are dropped.
+
+        Args:
+            start: Window start in epoch seconds
+            end: Window end in epoch seconds (exclusive)
+            step: Sample spacing in seconds
+
+        Returns:
+            Tuple of (times, values) arrays
+        """
+        times = np.arange(start, end, step, dtype=np.float64)
+        if len(self.starts) == 0 or len(times) == 0:
+            return times[:0], self.values[:0]
+
+        index = np.searchsorted(self.starts, times, side="right") - 1
+        clipped = np.maximum(index, 0)
+        covered = (index >= 0) & (times < self.ends[clipped])
+
+        return times[covered], self.values[clipped[covered]]
+
+    def aggregate(
+        self, starts: Sequence[float], ends: Sequence[float]
+    ) -> List[Aggregate]:
+        """
+        Summarize the series over many windows at once.
+
+        The runs overlapping every window are located in one vectorized
+        search, then each window is reduced over its own runs.
+
+        Args:
+            starts: Window starts in epoch seconds
+            ends: Window ends in epoch seconds (exclusive)
+
+        Returns:
+            Aggregate for each window
+        """
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        los = np.searchsorted(self.ends, starts, side="right")
+        his = np.searchsorted(self.starts, ends, side="left")
+
+        results = []
+        for start, end, lo, hi in zip(starts, ends, los.tolist(), his.tolist()):
+            if hi <= lo:
+                results.append(EMPTY)
+                continue
+
+            values = self.values[lo:hi]
+            first, last = to_list(values[[0, -1]])
+            present = ~np.isnan(values)
+            if not present.any():
+                results.append(Aggregate(None, None, first, last, None))
+                continue
+
+            # Amounts cover a whole run, so partial runs count in proportion
+            run_starts = self.starts[lo:hi][present]
+            run_ends = self.ends[lo:hi][present]
+            overlap = np.minimum(run_ends, end) - np.maximum(run_starts, start)
+            results.append(
+                Aggregate(
+                    float(values[present].min()),
+                    float(values[present].max()),
+                    first,
+                    last,
+                    float(np.sum(values[present] * overlap / (run_ends - run_starts))),
+                )
+            )
+
+        return results
+
+    def threshold(self, op: str, value: float) -> "Threshold":
+        """
+        Get the index of the runs meeting a threshold, building it once.
+
+        Args:
+            op: Comparison from COMPARISONS (e.g., "<")
+            value: Threshold in the layer's units
+
+        Returns:
+            Threshold index
+        """
+        key = (op, value)
+        if key not in self.thresholds:
+            self.thresholds[key] = Threshold(self, COMPARISONS[op], value)
+
+        return self.thresholds[key]
+
+
+class Threshold(object):
+    """
+    The runs of a series that meet a threshold.
+
+    Runs are located by binary search, and prefix sums of the matching
+    run lengths give the time spent meeting the threshold in any window.
+    Missing values never meet a threshold.
+    """
+
+    def __init__(
+        self,
+        series: Series,
+        compare: Callable[[np.ndarray, float], np.ndarray],
+        value: float,
+    ) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            series: Series to index
+            compare: Comparison such as np.less
+            value: Threshold in the series' units
+        """
+        self.series = series
+        with np.errstate(invalid="ignore"):
+            mask = compare(series.values, value)
+
+        # Indexes of the matching runs, and of those that begin a stretch
+        # of matching runs (the previous run didn't match or isn't adjacent)
+        self.hits = np.flatnonzero(mask)
+        follows = np.zeros(len(mask), dtype=bool)
+        follows[1:] = mask[:-1] & (series.starts[1:] == series.ends[:-1])
+        self.onsets = np.flatnonzero(mask & ~follows)
+
+        lengths = np.where(mask, series.ends - series.starts, 0.0)
+        self.elapsed = np.concatenate(([0.0], np.cumsum(lengths)))
+        self.mask = mask
+
+    def runs(self, start: float, end: float) -> Tuple[int, int]:
+        """Range of run positions overlapping a window."""
+        series = self.series
+        lo = int(np.searchsorted(series.ends, start, side="right"))
+        hi = int(np.searchsorted(series.starts, end, side="left"))
+        return lo, max(lo, hi)
+
+    def first(self, start: float, end: float) -> Optional[float]:
+        """
+        Find when the threshold is first met within a window.
+
+        Args:
+            start: Window start in epoch seconds
+            end: Window end in epoch seconds
+
+        Returns:
+            Epoch seconds, which is start if it's already met, or None
+        """
+        lo, hi = self.runs(start, end)
+        k = int(np.searchsorted(self.hits, lo))
+        if k == len(self.hits) or self.hits[k] >= hi:
+            return None
+
+        return max(float(self.series.starts[self.hits[k]]), start)
+
+    def next_crossing(self, start: float, end: float) -> Optional[float]:
+        """
+        Find when the threshold next starts being met after a time.
+
+        Unlike first(), a threshold already met at start doesn't count
+        until it stops being met and starts again.
+
+        Args:
+            start: Time to look after, in epoch seconds
+            end: End of the search in epoch seconds
+
+        Returns:
+            Epoch seconds or None
+        """
+        onset_starts = self.series.starts[self.onsets]
+        k = int(np.searchsorted(onset_starts, start, side="right"))
+        if k == len(onset_starts) or onset_starts[k] >= end:
+            return None
+
+        return float(onset_starts[k])
+
+    def spans(self, start: float, end: float) -> List[Tuple[float, float]]:
+        """
+        Find the stretches of time within a window meeting the threshold.
+
+        Args:
+            start: Window start in epoch seconds
+            end: Window end in epoch seconds
+
+        Returns:
+            (start, end) epoch seconds of each stretch, clipped to the window
+        """
+        lo, hi = self.runs(start, end)
+        hits = self.hits[np.searchsorted(self.hits, lo):np.searchsorted(self.hits, hi)]
+        if len(hits) == 0:
+            return []
+
+        starts = self.series.starts[hits]
+        ends = self.series.ends[hits]
+        breaks = np.flatnonzero(starts[1:] != ends[:-1]) + 1
+        firsts = np.concatenate(([0], breaks))
+        lasts = np.concatenate((breaks, [len(hits)])) - 1
+
+        return [
+            (max(float(starts[i]), start), min(float(ends[j]), end))
+            for i, j in zip(firsts.tolist(), lasts.tolist())
+        ]
+
+    def duration(self, start: float, end: float) -> float:
+        """
+        Measure the time within a window meeting the threshold.
+
+        Args:
+            start: Window start in epoch seconds
+            end: Window end in epoch seconds
+
+        Returns:
+            Seconds
+        """
+        lo, hi = self.runs(start, end)
+        if hi == lo:
+            return 0.0
+
+        series = self.series
+        total = self.elapsed[hi] - self.elapsed[lo]
+
+        # Leave out the parts of the edge runs outside the window
+        if self.mask[lo]:
+            total -= max(0.0, start - series.starts[lo])
+        if self.mask[hi - 1]:
+            total -= max(0.0, series.ends[hi - 1] - end)
+
+        return float(total)
+
+
+def to_list(values: np.ndarray) -> List[Optional[float]]:
+    """
+    Convert values to a list with None for missing values.
+
+    Args:
+        values: Array of values
+
+    Returns:
+        List of floats and Nones
+    """
+    return [None if value != value else value for value in values.tolist()]
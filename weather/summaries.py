@@ -0,0 +1,212 @@
+#!/usr/bin/python3
+
+# =============================================================================
+#
+# Copyright 2017 by Leland Lucius
+#
+# Released under the GNU Affero GPL
+# See: https://github.com/lllucius/climacast/blob/master/LICENSE
+#
+# =============================================================================
+
+"""
+Per-quarter summaries of gridpoint data, computed once at ingest.
+
+The skill describes forecasts for 6-hour quarters of the local day
+(overnight, morning, afternoon and evening) and for days and nights made
+of two of them.  When a gridpoint payload is fetched, every layer is
+summarized over every quarter of its validTimes, along with the weather
+phrases for each quarter.  A forecast window made of whole quarters is
+then answered by merging a few rows instead of reading the series.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from weather.intervals import parse_interval
+from weather.phrases import weather_phrases
+from weather.series import EMPTY, Aggregate
+
+# Length of a quarter in local wall clock hours
+QUARTER_HOURS = 6
+
+# Columns of a layer's summary rows
+COLUMNS = Aggregate._fields + ("runs",)
+
+
+def quarter_bounds(
+    start: float, end: float, tz: Any
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the local quarters covering a span of time.
+
+    Quarters start at local midnight, 6am, noon and 6pm, so across a
+    daylight saving change one of them is an hour shorter or longer.
+
+    Args:
+        start: Span start in epoch seconds
+        end: Span end in epoch seconds
+        tz: Local timezone
+
+    Returns:
+        Tuple of (starts, ends) arrays in epoch seconds
+    """
+    when = datetime.fromtimestamp(start, tz)
+    when = when.replace(
+        hour=when.hour - when.hour % QUARTER_HOURS, minute=0, second=0, microsecond=0
+    )
+
+    bounds = [when.timestamp()]
+    while bounds[-1] < end:
+        when += timedelta(hours=QUARTER_HOURS)
+        bounds.append(when.timestamp())
+
+    bounds = np.array(bounds, dtype=np.float64)
+    return bounds[:-1], bounds[1:]
+
+
+class Summaries(object):
+    """
+    Aggregates of every layer over consecutive quarters.
+
+    Each layer is an array with one row per quarter holding the low, high,
+    initial, final and total, with NaN where there's no data, and the
+    number of runs overlapping the quarter.
+    """
+
+    def __init__(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        layers: Dict[str, np.ndarray],
+        phrases: List[List[str]],
+    ) -> None:
+        """
+        Initialize the summaries.
+
+        Args:
+            starts: Quarter start times in epoch seconds
+            ends: Quarter end times in epoch seconds
+            layers: Per-quarter aggregates by layer name
+            phrases: Weather phrases for each quarter
+        """
+        self.starts = starts
+        self.ends = ends
+        self.layers = layers
+        self.phrases = phrases
+
+    @classmethod
+    def empty(cls) -> "Summaries":
+        """Summaries covering no quarters."""
+        empty = np.empty(0, dtype=np.float64)
+        return cls(empty, empty, {}, [])
+
+    @classmethod
+    def build(cls, grid: Any, tz: Any) -> "Summaries":
+        """
+        Summarize grid data over the quarters of its validTimes.
+
+        Args:
+            grid: GridData to summarize
+            tz: Timezone of the grid cell
+
+        Returns:
+            Summaries for the grid data
+        """
+        if not grid.valid_times:
+            return cls.empty()
+
+        starts, ends = quarter_bounds(*parse_interval(grid.valid_times), tz)
+
+        layers = {}
+        for layer in grid.layers:
+            series = grid.get_series(layer)
+            rows = np.empty((len(starts), len(COLUMNS)), dtype=np.float64)
+            rows[:, :-1] = [
+                [np.nan if value is None else value for value in aggregate]
+                for aggregate in series.aggregate(starts, ends)
+            ]
+            rows[:, -1] = np.searchsorted(series.starts, ends, side="left")
+            rows[:, -1] -= np.searchsorted(series.ends, starts, side="right")
+            layers[layer] = rows
+
+        index, values = grid.get_table("weather")
+        phrases = [
+            weather_phrases([values[i] for i in index.overlapping(start, end)])
+            for start, end in zip(starts.tolist(), ends.tolist())
+        ]
+
+        return cls(starts, ends, layers, phrases)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def get(
+        self, start: float, end: float
+    ) -> Optional[Tuple[Dict[str, Aggregate], List[str]]]:
+        """
+        Merge the quarters making up a window.
+
+        Args:
+            start: Window start in epoch seconds
+            end: Window end in epoch seconds
+
+        Returns:
+            Tuple of (aggregates by layer, weather phrases), or None if the
+            window isn't made of whole summarized quarters
+        """
+        first = int(np.searchsorted(self.starts, start))
+        last = int(np.searchsorted(self.ends, end))
+        if (
+            last >= len(self)
+            or last < first
+            or self.starts[first] != start
+            or self.ends[last] != end
+        ):
+            return None
+
+        aggregates = {
+            layer: merge(rows[first:last + 1]) for layer, rows in self.layers.items()
+        }
+        phrases = list(
+            dict.fromkeys(
+                phrase for quarter in self.phrases[first:last + 1] for phrase in quarter
+            )
+        )
+
+        return aggregates, phrases
+
+
+def merge(rows: np.ndarray) -> Aggregate:
+    """
+    Combine consecutive quarter aggregates into one.
+
+    Args:
+        rows: Per-quarter summary rows
+
+    Returns:
+        Aggregate over all of the quarters
+    """
+    rows = rows[rows[:, -1] > 0]
+    if len(rows) == 0:
+        return EMPTY
+
+    lows, highs, _, _, totals, _ = rows.T
+    present = ~np.isnan(lows)
+    if not present.any():
+        return Aggregate(None, None, to_value(rows[0, 2]), to_value(rows[-1, 3]), None)
+
+    return Aggregate(
+        float(lows[present].min()),
+        float(highs[present].max()),
+        to_value(rows[0, 2]),
+        to_value(rows[-1, 3]),
+        float(totals[present].sum()),
+    )
+
+
+def to_value(value: float) -> Optional[float]:
+    """Convert NaN to None."""
+    return None if value != value else float(value)